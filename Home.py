@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
-import joblib
+import os
 import datetime, random
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# pandas / matplotlib / seaborn / sklearn diimport di dalam halaman yang
+# membutuhkannya (show_eda, show_prediction), bukan di sini, supaya halaman
+# Home & Well-Being Tips tidak ikut menanggung biaya import-nya.
+import artifacts
+import telemetry
+from features import FEATURES, QUESTIONS, AGE_MAPPING, GENDER_NUMERIC, scale_value
 
 # Initialize session state for navigation and dynamic content
 if 'started' not in st.session_state:
@@ -18,6 +22,9 @@ st.set_page_config(
     layout="wide",
 )
 def local_css(file_name):
+    # Stylesheet opsional: tanpa file, halaman tetap jalan dengan CSS inline di bawah
+    if not os.path.exists(file_name):
+        return
     with open(file_name) as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
@@ -119,15 +126,19 @@ with st.sidebar:
     # Wrap semua konten dalam div utama biar background warna jalan
     st.markdown('<div class="main">', unsafe_allow_html=True)
     
-# ── Muat model & scaler (tampilkan peringatan bila belum ada) ─
-try:
-    model  = joblib.load("stacking_model.pkl")
-    pt     = joblib.load("power_transfromer.pkl")
-    scaler = joblib.load("scaler.pkl")
-except FileNotFoundError:
-    model = pt = scaler = None
+# ── Cek model & scaler (tampilkan peringatan bila belum ada) ─
+# Model baru dimuat (lazily, lewat artifacts) oleh halaman prediksi.
+MODEL_FILES = ["stacking_model.pkl", "power_transfromer.pkl", "scaler.pkl"]
+if not all(os.path.exists(f) for f in MODEL_FILES):
     st.sidebar.warning("⚠️ Berkas model *.pkl* tidak ditemukan. UI tetap bisa diuji.")
 
+with st.sidebar.expander("ℹ️ Model artifacts"):
+    artifact_rows = artifacts.report()
+    if artifact_rows:
+        st.dataframe(artifact_rows, hide_index=True)
+    else:
+        st.caption("Belum ada artifact yang dimuat.")
+
 # =============================================================
 # 1) HOME ─ About + EDA
 # =============================================================
@@ -283,6 +294,17 @@ def show_home():
 # 2) EDA
 # =============================================================
 def show_eda():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    import cleaning
+    import datastore
+    import distributions
+    import figcache
+    import ingest
+    import outofcore
+    import regstats
+
     st.markdown("""
         <div style='background-color: #FAF3E0; padding: 1.5rem; border-radius: 12px;'>
             <h1 style='color: #E2725B;'>Dokumentasi EDA</h1>
@@ -291,67 +313,77 @@ def show_eda():
     """, unsafe_allow_html=True)
     st.divider()
 
-    df = pd.read_csv("datasets_wellbeing.csv")
+    # Arsip besar: semua tabel dihitung per chunk dengan batas memori (outofcore.py)
+    chunked = outofcore.enabled("datasets_wellbeing.csv")
+    with telemetry.span("eda.load_dataset"):
+        if chunked:
+            eda = outofcore.summary("datasets_wellbeing.csv")
+            head, shape, dtypes = eda.head, eda.shape, eda.dtypes
+        else:
+            # Dimuat dari cache kolumnar (mmap); dibangun ulang otomatis bila CSV berubah
+            df = datastore.load_dataset("datasets_wellbeing.csv")
+            head, shape, dtypes = df.head(), df.shape, df.dtypes
     
     st.markdown("""<h2 style='color:#63533e;'>Dataset Overview</h2>""", unsafe_allow_html=True)
-    st.dataframe(df.head())
-    st.markdown(f"Total data: {df.shape[0]} baris dan {df.shape[1]} kolom.")
+    st.dataframe(head)
+    st.markdown(f"Total data: {shape[0]} baris dan {shape[1]} kolom.")
+
+    # Statistik berjalan, diperbarui per append respons baru (ingest.py)
+    with telemetry.span("eda.running_stats"):
+        running = ingest.running_stats("datasets_wellbeing.csv")
+    with st.expander("📥 Statistik berjalan (setelah dropna & drop_duplicates, sebelum filter outlier)"):
+        st.write(running.report())
+        st.dataframe(running.describe())
+        st.dataframe(running.target_correlation().sort_values(ascending=False))
     st.divider()
 
     st.markdown("""<h2 style='color:#63533e;'>Informasi Tipe Data</h2>""", unsafe_allow_html=True)
-    st.write(df.dtypes)
+    st.write(dtypes)
     st.divider()
 
     st.markdown("""<h2 style='color:#63533e;'>Data Cleaning Process</h2>""", unsafe_allow_html=True)
-    if 'Timestamp' in df.columns:
-        df.drop(columns=['Timestamp'], inplace=True)
+    # Cleaning dihitung sekali per versi dataset (lihat cleaning.py)
+    with telemetry.span("eda.cleaning"):
+        if chunked:
+            # df = sampel sistematis data bersih (≤ outofcore.SAMPLE_ROWS baris) untuk chart
+            df, report = eda.sample, eda.report
+            clean_head, clean_shape, describe = eda.clean_head, eda.clean_shape, eda.describe
+        else:
+            df, report = cleaning.cleaned_dataset("datasets_wellbeing.csv")
+            clean_head, clean_shape, describe = df.head(), df.shape, df.describe()
+    if 'Timestamp' in report["dropped_columns"]:
         st.write("✓ Kolom 'Timestamp' telah dihapus.")
         st.caption("Kolom dihapus karena tidak terlalu berhubungan dengan target")
 
-    missing = df.isnull().sum().sum()
+    missing = report["missing"]
     if missing > 0:
-        df.dropna(inplace=True)
         st.write(f"✓ {missing} missing values ditemukan dan telah dihapus.")
     else:
         st.write("✓ Tidak ada missing values.")
 
-    duplikat = df.duplicated().sum()
+    duplikat = report["duplicates"]
     if duplikat > 0:
-        df.drop_duplicates(inplace=True)
         st.write(f"✓ {duplikat} baris duplikat ditemukan dan telah dihapus.")
     else:
         st.write("✓ Tidak ada data duplikat.")
 
-    fitur_numerik = df.select_dtypes(include='number').columns.tolist()
-    total_outliers = 0
-
-    for fitur in fitur_numerik:
-        Q1 = df[fitur].quantile(0.25)
-        Q3 = df[fitur].quantile(0.75)
-        IQR = Q3 - Q1
-        lower = Q1 - 1.5 * IQR
-        upper = Q3 + 1.5 * IQR
-        before = df.shape[0]
-        df = df[(df[fitur] >= lower) & (df[fitur] <= upper)]
-        after = df.shape[0]
-        removed = before - after
-        total_outliers += removed
+    for fitur, removed in report["outliers"]:
         if removed > 0:
             st.write(f"✓ {removed} outlier dihapus pada fitur '{fitur}'.")
 
-    if total_outliers == 0:
+    if report["total_outliers"] == 0:
         st.write("✓ Tidak ada outlier yang ditemukan.")
 
     # Tampilkan data akhir
     st.markdown("---")
     st.markdown("""<h2 style='color:#63533e;'>Data Setelah Dibersihkan</h2>""", unsafe_allow_html=True)
-    st.write(df.head())
+    st.write(clean_head)
     st.divider()
-    st.write(f"Jumlah data setelah pembersihan: {df.shape[0]} baris dan {df.shape[1]} kolom")
+    st.write(f"Jumlah data setelah pembersihan: {clean_shape[0]} baris dan {clean_shape[1]} kolom")
 
     st.markdown("""<h2 style='color:#63533e;'>Statistik Deskriptif</h2>""", unsafe_allow_html=True)
     st.write("Berikut statistik ringkasan untuk fitur numerik setelah proses pembersihan data:")
-    st.dataframe(df.describe())
+    st.dataframe(describe)
 
     st.caption("Setelah Data Cleaning, Explore distribusi data, hubungan, dan korelasi sebelum membangun model.")
     st.divider()
@@ -361,82 +393,116 @@ def show_eda():
         </div>
     """, unsafe_allow_html=True)
 
+    # Chart dirender sekali per (chart, fitur, versi dataset) lalu diambil dari cache
+    # Histogram & KDE dari distribusi terhitung-di-muka (tidak bergantung jumlah baris)
+    with telemetry.span("eda.precompute"):
+        if chunked:
+            data_version, dists, reg_stats = eda.version, eda.distributions, eda.regression
+            correlation = eda.target_correlation.to_frame()
+        else:
+            data_version = datastore.dataset_version("datasets_wellbeing.csv")
+            dists = distributions.cleaned_distributions("datasets_wellbeing.csv")
+            reg_stats = regstats.cleaned_regression_stats("datasets_wellbeing.csv")
+            correlation = None
+
     tab1, tab2, tab3 = st.tabs(["📈 Distribusi Data", "🔗 Fitur vs Target", "🧩 Korelasi"])
 
-    with tab1:
+    with tab1, telemetry.span("eda.tab.distribusi"):
         st.markdown("""<h1 style='color:#63533e;'>Distribusi Data Fitur – Target</h1>""", unsafe_allow_html=True)
         st.write("Histogram untuk melihat distribusi data target dan fitur (Numerik dan Kategori).")
         st.divider()
         st.markdown("""<h2 style='color:#63533e;'>Distribusi Data Target</h2>""", unsafe_allow_html=True)
-        fig, ax = plt.subplots(figsize=(8,4))
-        sns.histplot(df["WORK_LIFE_BALANCE_SCORE"], kde=True, ax=ax, color = 'Teal')
-        ax.set_title("Distribusi Work-Life Balance Score")
-        st.pyplot(fig)
+        def render_target_hist():
+            fig, ax = plt.subplots(figsize=(8,4))
+            distributions.draw(ax, dists["WORK_LIFE_BALANCE_SCORE"], color = 'Teal')
+            ax.set_title("Distribusi Work-Life Balance Score")
+            return fig
+        st.image(figcache.chart("target_hist", None, data_version, render_target_hist), width="stretch")
 
         st.markdown("---")
         st.subheader("Distribusi Fitur Numerik")
-        fitur_numerik = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        fitur_numerik = df.select_dtypes(include='number').columns.tolist()
         fitur_numerik = [col for col in fitur_numerik if col != 'WORK_LIFE_BALANCE_SCORE']
         feat_scatter = st.selectbox("Pilih fitur numerik:", fitur_numerik, key="selectbox_numerik")
-        fig, ax = plt.subplots(figsize=(8, 4))
-        sns.histplot(df[feat_scatter], kde=True, ax=ax, color='salmon')
-        ax.set_xlabel(fitur)
-        ax.set_ylabel("Frequency")
-        st.pyplot(fig)
+        def render_feature_hist():
+            fig, ax = plt.subplots(figsize=(8, 4))
+            distributions.draw(ax, dists[feat_scatter], color='salmon')
+            ax.set_xlabel(fitur)
+            ax.set_ylabel("Frequency")
+            return fig
+        st.image(figcache.chart("feature_hist", feat_scatter, data_version, render_feature_hist), width="stretch")
 
         st.markdown("---")
         st.subheader("Distribusi Fitur Kategorik")
-        fitur_kategorikal = df.select_dtypes(include='object').columns.tolist()
+        fitur_kategorikal = df.select_dtypes(include=['object', 'category']).columns.tolist()
         selected_cat = st.selectbox("Pilih fitur kategorik:", fitur_kategorikal, key="selectbox_kategori")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.countplot(data=df, x=selected_cat, order=df[selected_cat].value_counts().index, ax=ax, color = 'lightblue')
-        ax.set_title(f"Distribusi kategori pada fitur {selected_cat}")
-        st.pyplot(fig)
-
-
-    with tab2:
+        def render_countplot():
+            fig, ax = plt.subplots(figsize=(6, 4))
+            if chunked:
+                # Jumlah eksak dari pass chunked (df hanya sampel)
+                counts = eda.value_counts[selected_cat]
+                sns.barplot(x=counts.index.astype(str), y=counts.to_numpy(), ax=ax, color = 'lightblue')
+                ax.set_xlabel(selected_cat)
+                ax.set_ylabel("count")
+            else:
+                sns.countplot(data=df, x=selected_cat, order=df[selected_cat].value_counts().index, ax=ax, color = 'lightblue')
+            ax.set_title(f"Distribusi kategori pada fitur {selected_cat}")
+            return fig
+        st.image(figcache.chart("countplot", selected_cat, data_version, render_countplot), width="stretch")
+
+
+    with tab2, telemetry.span("eda.tab.fitur_target"):
         st.markdown("<h1 style='color:#63533e;'>Hubungan Fitur – Target</h1>", unsafe_allow_html=True)
         st.write("Scatter plot dan boxplot untuk melihat pengaruh fitur terhadap skor WLB (Work-Life Balance Score).")
         st.divider()
         st.markdown("<h2 style='color:#63533e;'>Scatter Plot Fitur Numerik - Target</h2>", unsafe_allow_html=True)
-        fitur_numerik = df.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        fitur_numerik = df.select_dtypes(include='number').columns.tolist()
         fitur_numerik = [col for col in fitur_numerik if col != 'WORK_LIFE_BALANCE_SCORE']
 
         st.write("Scatter plot untuk melihat pengaruh fitur numerik terhadap skor WLB.")
         feat_scatter = st.selectbox("Pilih fitur numerik:", fitur_numerik, key="scatter_numerik")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.regplot(data=df, x=feat_scatter, y="WORK_LIFE_BALANCE_SCORE",
-                    scatter_kws={'alpha': 0.5, 'color':'lightblue'},
-                    line_kws={'color':'red'}, ax=ax)
-        ax.set_title(f"{feat_scatter} vs Work-Life Balance Score")
-        st.pyplot(fig)
+        def render_regplot():
+            fig, ax = plt.subplots(figsize=(6, 4))
+            # Garis & pita 95% bentuk tertutup dari statistik cukup (tanpa bootstrap)
+            regstats.draw(ax, df[feat_scatter], df["WORK_LIFE_BALANCE_SCORE"], reg_stats[feat_scatter],
+                          scatter_kws={'alpha': 0.5, 'color':'lightblue'},
+                          line_kws={'color':'red'},
+                          xlabel=feat_scatter, ylabel="WORK_LIFE_BALANCE_SCORE")
+            ax.set_title(f"{feat_scatter} vs Work-Life Balance Score")
+            return fig
+        st.image(figcache.chart("regplot", feat_scatter, data_version, render_regplot), width="stretch")
 
         st.markdown("---")
         st.markdown("<h2 style='color:#63533e;'>Boxplot Fitur Kategorikal - Target</h2>", unsafe_allow_html=True)
-        fitur_kategorikal = df.select_dtypes(include='object').columns.tolist()
+        fitur_kategorikal = df.select_dtypes(include=['object', 'category']).columns.tolist()
         st.write("Boxplot untuk melihat pengaruh fitur kategori terhadap skor WLB.")
         feat_box = st.selectbox("Pilih fitur kategorikal:", fitur_kategorikal, key="boxplot_kategori")
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.boxplot(data=df, x=feat_box, y="WORK_LIFE_BALANCE_SCORE", ax=ax, palette='Pastel1')
-        ax.set_title(f"Distribusi Work-Life Balance Score berdasarkan {feat_box}")
-        st.pyplot(fig)
+        def render_boxplot():
+            fig, ax = plt.subplots(figsize=(6, 4))
+            sns.boxplot(data=df, x=feat_box, y="WORK_LIFE_BALANCE_SCORE", ax=ax, palette='Pastel1')
+            ax.set_title(f"Distribusi Work-Life Balance Score berdasarkan {feat_box}")
+            return fig
+        st.image(figcache.chart("boxplot", feat_box, data_version, render_boxplot), width="stretch")
+        if chunked and len(df) < clean_shape[0]:
+            st.caption(f"Scatter dan boxplot memakai sampel sistematis {len(df)} dari {clean_shape[0]} baris.")
 
 
-    with tab3:
+    with tab3, telemetry.span("eda.tab.korelasi"):
         st.markdown("<h1 style='color:#63533e;'>Korelasi Antar Fitur</h1>", unsafe_allow_html=True)
         st.write("Heatmap untuk melihat korelasi semua fitur numerik dengan target.")
         st.divider()
 
         st.markdown("<h2 style='color:#63533e;'>Analisis Korelasi terhadap Work-Life Balance Score</h2>", unsafe_allow_html=True)
-        def plot_correlation_heatmap(df):
-            plt.figure(figsize=(12, 8))
-            correlation = df.select_dtypes(include='number').corr()
+        def plot_correlation_heatmap(df, correlation=None):
+            fig = plt.figure(figsize=(12, 8))
+            if correlation is None:
+                correlation = df.select_dtypes(include='number').corr()
             sns.heatmap(correlation[['WORK_LIFE_BALANCE_SCORE']].sort_values(by='WORK_LIFE_BALANCE_SCORE', ascending=False),
                         annot=True, cmap='coolwarm')
             plt.title("Korelasi Fitur dengan WORK_LIFE_BALANCE_SCORE")
-            st.pyplot(plt)
+            return fig
             
-        plot_correlation_heatmap(df)
+        st.image(figcache.chart("corr_heatmap", None, data_version, lambda: plot_correlation_heatmap(df, correlation)), width="stretch")
         st.divider()
         st.write("Hasil visualisasi ditampilkan dalam bentuk **heatmap** dengan rentang nilai dari -1 hingga 1. **Insight yang diperoleh:**")
         st.write("**-  Korelasi Positif Tinggi**") 
@@ -453,6 +519,12 @@ def show_eda():
 # 3) PREDIKSI KESEHATAN
 # =============================================================
 def show_prediction():
+    import inference
+    import predcache
+    from population import population_index
+    from neighbors import neighbor_index
+    from whatif import sweep, format_change
+
     st.markdown("""
         <div style='background-color: #FAF3E0; padding: 1.5rem; border-radius: 12px;'>
             <h1 style='color: #E2725B;'>Your Health Prediction</h1>
@@ -463,10 +535,16 @@ def show_prediction():
     st.caption("We only use this information to provide personalized insights.")
     st.divider()
 
-    #load modelnya
-    model = joblib.load("linear_regression.pkl")
-    pt = joblib.load("power_transfromer.pkl")
-    scaler = joblib.load("scaler.pkl")
+    #load modelnya (tabel kontribusi per fitur dari rantai transform → scale → predict)
+    # stacking_model.pkl (hasil train.py) dipakai bila ada, lewat ensemble terkompilasi
+    stacking = os.path.exists("stacking_model.pkl")
+    model_files = ("stacking_model.pkl" if stacking else "linear_regression.pkl", "power_transfromer.pkl", "scaler.pkl")
+    with telemetry.span("predict.load_model"):
+        if stacking:
+            import ensemble
+            pipeline = ensemble.ensemble(*model_files)
+        else:
+            pipeline = inference.lookup(*model_files)
 
     # User Input
     name = st.text_input("**Enter your name**", placeholder="Ex. John Doe", max_chars=50)
@@ -490,12 +568,7 @@ def show_prediction():
     else:  # age between 51 and 80
         classification_age = "51 or more"
     # Mapping age
-    age_mapping = {
-        "36 to 50": 2,
-        "51 or more": 3,
-        "21 to 35": 1,
-        "Less than 20": 0,
-    }
+    age_mapping = AGE_MAPPING
     st.write("Classified age:", classification_age)
     if classification_age in age_mapping:
         st.write("Mapped Age Level:", age_mapping[classification_age])
@@ -508,11 +581,7 @@ def show_prediction():
         "Female": "Female",
         "Other": "Nan",
     }
-    gender_numeric = {
-        "Male": 0,
-        "Female": 1,
-        "Other": 2
-    }
+    gender_numeric = GENDER_NUMERIC
 
     gender = st.radio(
         "**Select your gender *(select one)***",
@@ -520,626 +589,53 @@ def show_prediction():
     )
     st.write("You selected", gender)
     col1, col2 = st.columns(2)
-    with col1:
-        fruitVeggies_mapping = {
-            "never (0 servings)": 0,
-            "Almost never (1 servings)": 1,
-            "Rarely (2 serving)": 2,
-            "Occasionally (3 servings)": 3,
-            "Often (4 servings)": 4,
-            "Very often (5 or more servings)": 5
-            }
-        fruitVeggies = st.radio(
-            "**1. How Many Fruits Or Vegetables Do You Eat Everyday?**",
-            list(fruitVeggies_mapping.keys())
-        )
-        st.write("You selected", fruitVeggies)
-
-        stress_mapping = {
-            "Not at all stressful": 0,
-            "Slightly stressful": 1,
-            "Somewhat stressful": 2,
-            "Moderately stressful": 3,
-            "Very stressful": 4,
-            "Extremely stressful": 5
-        }
-        dailyStress = st.radio(
-            "**2. How Much Stress Do You Typically Experience Everyday?**",
-            list(stress_mapping.keys())
-        )
-        st.write("You selected:", dailyStress)
-        
-        placesVisited_mapping = {
-            "never" : 0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "More than 10": 10
-        }
-        placesVisited = st.select_slider(
-            "**3. How Many New Places Do You Visit In a Month?**",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "More than 10",
-            ]
-        )
-        st.write("selected", placesVisited)
-        st.write("Mapped Places Visited Level:", placesVisited_mapping[placesVisited])
-
-        coreCircle_mapping = {
-            "No one": 0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "Large close circle": 10
-        }
-        coreCircle= st.select_slider(
-            "**4. How Many People That Are Very Close To You?**",
-            options=[
-                "No one",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "Large close circle",
-            ]
-        )
-        st.write("selected", coreCircle)
-        st.write("Mapped Core Circle Level:", coreCircle_mapping[coreCircle])
-
-        supportingOthers_mapping = {
-            "never" : 0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "Many people (more than 10)": 10
-        }
-        supportingOthers = st.select_slider(
-            "**5. How Many People Do You Help to Achieve a Better Life??**",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "Many people (more than 10)",
-            ]
-        )
-        st.write("selected", supportingOthers)
-        st.write("Mapped Supporting Others Level:", supportingOthers_mapping[supportingOthers])
-
-        socialNetwork_mapping = {
-            "No interactions at all" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "A Lot of interactions": 10
-        }
-        socialNetwork = st.select_slider(
-            "**6. With How Many People do You Interact With During the Day?**",
-            options=[
-                "No interactions at all",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "A Lot of interactions",
-            ]
-        )
-        st.write("selected", socialNetwork)
-        st.write("Mapped Supporting Others Level:", socialNetwork_mapping[socialNetwork])
-        
-        achievements_mapping = {
-            "No achievements" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "Many achievements (more than 10)": 10
-        }
-        achievements = st.select_slider(
-            "**7. How Many Remarkable Achievements Are You Proud of?**",
-            options=[
-                "No achievements",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "Many achievements (more than 10)",
-            ]
-        )
-        st.write("selected", achievements)
-        st.write("Mapped Achievements Level:", achievements_mapping[achievements])
-
-        donations_mapping = {
-            "Never" :0,
-            "Almost never": 1,
-            "Rarely": 2,
-            "Often": 3,
-            "Very often": 4,
-            "Always": 5,
-        }
-        donation =st.radio(
-            "**8. How Many Times do You Donate Your Time or Money for a Good Causes?**",
-            [
-                "Never",
-                "Almost never",
-                "Rarely",
-                "Often",
-                "Very often",
-                "Always",
-            ]
-        )
-        st.write("selected", donation)
-        st.write("Mapped Donations Level:", donations_mapping[donation])
-
-        bmiRange_mapping = {
-            "Underweight to  normal weight ( Less than 18.5 untill 24.9)": 1,
-            "Overweight to Obesity (25 until 29.9 or more)": 2,
-        }
-        bmiRange = st.radio(
-            "**9. What  Is Your Body Mass Index (BMI) Range?**",
-            [
-                "Underweight to  normal weight ( Less than 18.5 untill 24.9)",
-                "Overweight to Obesity (25 until 29.9 or more)",
-            ]
-        )
-        st.write("selected", bmiRange)
-        st.write("Mapped BMI Range Level:", bmiRange_mapping[bmiRange])
-
-    with col2:
-        toDoCompletition_mapping = {
-            "never" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "Always (10)": 10
-        }
-        toDoCompletition = st.select_slider(
-            "**10. Rate How Well Do You Complete Your Weekly To-Do Lists?**",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "Always (10)",
-            ]
-        )
-        st.write("selected", toDoCompletition)
-        st.write("Mapped To Do Completition Level:", toDoCompletition_mapping[toDoCompletition])
-
-        flow_mapping = {
-            "never" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "More than 10": 10
-        }
-        flow = st.select_slider(
-            "**11. In a typical day, how many hours do you experience ‘flow’?**",
-            help="*(Flow is a state of total immersion in an activity—often called being “in the zone.)*",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "More than 10",
-            ]
-        )
-        st.write("selected", flow)
-        st.write("Mapped Flow Level:", flow_mapping[flow])
-
-        steps_mapping = {
-            "None": 0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "More than 10": 10
-        }
-        steps = st.select_slider(
-            "**12. How Many Steps Do You Walk In a Day?**",
-            help="*(measured in units of thousands.)*",
-            options=[
-                "None",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "More than 10",
-            ]
-        )
-        st.write("selected", steps)
-        st.write("Mapped Steps Level:", steps_mapping[steps])
-
-        vision_mapping = {
-            "No clarity beyond today": 0,
-            "few weeks": 1,
-            "1 months": 2,
-            "2-3 month": 3,
-            "6 months": 4,
-            "1 year": 5,
-            "2 years": 6,
-            "3–5 years": 7,
-            "6–9 years": 8,
-            "9–10 years": 9,
-            "More than 10 years": 10
-        }
-        vision = st.select_slider(
-            "**13. For how many years ahead is your life vision very clear?**",
-            help="*(measured in units of hours.)*",
-            options=[
-                "No clarity beyond today",
-                "few weeks",
-                "1 months",
-                "2-3 month",
-                "6 months",
-                "1 year",
-                "2 years",
-                "3–5 years",
-                "6–9 years",
-                "9–10 years",
-                "More than 10 years",
-            ]
-        )
-        st.write("selected", vision)
-        st.write("Mapped Vision Level:", vision_mapping[vision])
-
-        sleep_mapping = {
-            "Not sleeping at all": 0,
-            "1 hours": 1,
-            "2 hours": 2,
-            "3 hours": 3,
-            "4 hours": 4,
-            "5 hours": 5,
-            "6 hours": 6,
-            "7 hours": 7,
-            "8 hours": 8,
-            "9 hours": 9,
-            "More than 9 hours": 10
-        }
-        sleep = st.select_slider(
-            "**14. About how long do you typically sleep each night?**",
-            help="*(measured in units of hours.)*",
-            options=[
-                "Not sleeping at all",
-                "1 hours",
-                "2 hours",
-                "3 hours",
-                "4 hours",
-                "5 hours",
-                "6 hours",
-                "7 hours",
-                "8 hours",
-                "9 hours",
-                "More than 9 hours",
-            ]
-        )
-        st.write("selected", sleep)
-        st.write("Mapped Sleep Level:", sleep_mapping[sleep])
-
-        lostVacation_mapping = {
-            "0 day": 0,
-            "1 day": 1,
-            "2 days": 2,
-            "3 days": 3,
-            "4-5 days": 4,
-            "6-7 days": 5,
-            "8-9 days": 6,
-            "10-12 days": 7,
-            "13-15 days": 8,
-            "14-16 days": 9,
-            "more than 16 days": 10
-        }
-        lostVacation = st.select_slider(
-            "**15. How Many Days Do You Typicallly Lose Every Year?**",
-            help="*(measured in units of days.)*",
-            options=[
-                "0 day",
-                "1 day",
-                "2 days",
-                "3 days",
-                "4-5 days",
-                "6-7 days",
-                "8-9 days",
-                "10-12 days",
-                "13-15 days",
-                "14-16 days",
-                "more than 16 days"
-            ]
-        )
-        st.write("selected", lostVacation)
-        st.write("Mapped Lost Vacation Level:", lostVacation_mapping[lostVacation])
-
-        shout_mapping = {
-            "Never": 0,
-            "Almost never shout or sulk": 1,
-            "Very rarely (a few times a year)": 2,
-            "Rarely (once a month or less)": 3,
-            "Occasionally (2–3 times a month)": 4,
-            "Sometimes (about once a week)": 5,
-            "Fairly often (2–3 times a week)": 6,
-            "Often (4–5 times a week)": 7,
-            "Very often (nearly every day)": 8,
-            "Almost always (multiple times daily": 9,
-            "Constantly shout or sulk": 10
-        }
-        shout = st.select_slider(
-            "**16. How Many Times Do You Shout or Yell?**",
-            help="*(measured in units of times.)*",
-            options=[
-                "Never",
-                "Almost never shout or sulk",
-                "Very rarely (a few times a year)",
-                "Rarely (once a month or less)",
-                "Occasionally (2–3 times a month)",
-                "Sometimes (about once a week)",
-                "Fairly often (2–3 times a week)",
-                "Often (4–5 times a week)",
-                "Very often (nearly every day)",
-                "Almost always (multiple times daily",
-                "Constantly shout or sulk",
-            ]
-        )
-        st.write("selected", shout)
-        st.write("Mapped Shout Level:", shout_mapping[shout])
-
-        sufficient_income_mapping = {
-            "Sufficient": 1,
-            "Not sufficient": 2,
-        }
-        sufficient_income = st.radio(
-            "**17. How sufficient is your income to cover your basic life expenses?**",
-            [
-                "Sufficient",
-                "Not sufficient",
-            ]
-        )
-        st.write("selected", sufficient_income)
-        st.write("Mapped Sufficient Income Level:", sufficient_income_mapping[sufficient_income])
-
-        personalAward_mapping = {
-            "none": 0,
-            "1": 1,
-            "2": 2,
-            "3-5": 3,
-            "6-9": 4,
-            "10-14": 5,
-            "15-19": 6,
-            "20-24": 7,
-            "25-29": 8,
-            "30-35": 9,
-            "more than 35": 10
-        }
-        personalAward = st.select_slider(
-            "**18. How Many Personal Awards Do You Have?**",
-            help="*(Here, “recognitions” refers to any formal or informal acknowledgements you’ve received—such as awards, certificates, public praise, or other expressions of appreciation for your achievements or contributions.)*",
-            options=[
-                "none",
-                "1",
-                "2",
-                "3-5",
-                "6-9",
-                "10-14",
-                "15-19",
-                "20-24",
-                "25-29",
-                "30-35",
-                "more than 35",
-            ]
-        )
-        st.write("selected", personalAward)
-        st.write("Mapped Personal Award Level:", personalAward_mapping[personalAward])
-
-        timeForPassion_mapping = {
-            "never" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "More than 10": 10
-        }
-        timeForPassion = st.select_slider(
-            "**19. How Many Hours Do You Spend Everyday On Your Passion?**",
-            help="*(measured in units of hours.)*",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "More than 10",
-            ]
-        )
-        st.write("selected", timeForPassion)
-        st.write("Mapped Time For Passion Level:", timeForPassion_mapping[timeForPassion])
-
-        weeklyMeditate_mapping = {
-            "never" :0,
-            "1": 1,
-            "2": 2,
-            "3": 3,
-            "4": 4,
-            "5": 5,
-            "6": 6,
-            "7": 7,
-            "8": 8,
-            "9": 9,
-            "More than 10": 10
-        }
-        weeklyMeditate = st.select_slider(
-            "**20. How Many Times Do You Meditate In a Week?**",
-            help="*(measured in units of times.)*",
-            options=[
-                "never",
-                "1",
-                "2",
-                "3",
-                "4",
-                "5",
-                "6",
-                "7",
-                "8",
-                "9",
-                "More than 10",
-            ]
-        )
-        st.write("selected", weeklyMeditate)
-        st.write("Mapped Weekly Meditate Level:", weeklyMeditate_mapping[weeklyMeditate])
-
+    # Widget dibangkitkan dari skema QUESTIONS (features.py)
+    answers = {}
+    for q in QUESTIONS:
+        with (col1 if q.column == 1 else col2):
+            if q.widget == "radio":
+                answers[q.feature] = st.radio(q.prompt, list(q.options), help=q.help)
+            else:
+                answers[q.feature] = st.select_slider(q.prompt, options=list(q.options), help=q.help)
+            st.write(q.echo, answers[q.feature])
+            if q.mapped:
+                st.write(q.mapped, q.options[answers[q.feature]])
     if st.button("Predict Health Status"):
         if not name or age == 0:
             st.warning("⚠️ Silakan isi *nama* dan *usia* terlebih dahulu sebelum melakukan prediksi.")
         else:
             # Grouping data
-            input_data = {
-                "FRUITS_VEGGIES": fruitVeggies_mapping[fruitVeggies],
-                "DAILY_STRESS": stress_mapping[dailyStress],
-                "PLACES_VISITED": placesVisited_mapping[placesVisited],
-                "CORE_CIRCLE": coreCircle_mapping[coreCircle],
-                "SUPPORTING_OTHERS": supportingOthers_mapping[supportingOthers],
-                "SOCIAL_NETWORK": socialNetwork_mapping[socialNetwork],
-                "ACHIEVEMENT": achievements_mapping[achievements],
-                "DONATION": donations_mapping[donation],
-                "BMI_RANGE": bmiRange_mapping[bmiRange],
-                "TODO_COMPLETED": toDoCompletition_mapping[toDoCompletition],
-                "FLOW": flow_mapping[flow],
-                "DAILY_STEPS": steps_mapping[steps],
-                "LIVE_VISION": vision_mapping[vision],
-                "SLEEP_HOURS": sleep_mapping[sleep],
-                "LOST_VACATION": lostVacation_mapping[lostVacation],
-                "DAILY_SHOUTING": shout_mapping[shout],
-                "SUFFICIENT_INCOME": sufficient_income_mapping[sufficient_income],
-                "PERSONAL_AWARDS": personalAward_mapping[personalAward],
-                "TIME_FOR_PASSION": timeForPassion_mapping[timeForPassion],
-                "WEEKLY_MEDITATION": weeklyMeditate_mapping[weeklyMeditate],
-                "AGE": age_mapping[classification_age],
-                "GENDER": gender_numeric[gender]
-            }       
-
-            features_df = pd.DataFrame([input_data])
-
-            # Normalisasi feature tertentu
-            col_to_normalize = ['ACHIEVEMENT','FLOW','LIVE_VISION','LOST_VACATION','DAILY_SHOUTING','SUFFICIENT_INCOME','TIME_FOR_PASSION']
-            normalized_feature = features_df.copy()
-            normalized_feature[col_to_normalize] = pt.transform(normalized_feature[col_to_normalize])
-            
-            scaled_date = normalized_feature.copy()
-            scaled_date = scaler.transform(normalized_feature)
-            
-            # Prediksi model
-            prediction = model.predict(scaled_date)
-            
-            def scale_value(x, old_min=480, old_max=780, new_min=1, new_max=100):
-                scaled = ((x - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
-                return scaled
-
-        
-            scaled_values = scale_value(prediction[0])
+            input_data = {q.feature: q.options[answers[q.feature]] for q in QUESTIONS}
+            input_data["AGE"] = age_mapping[classification_age]
+            input_data["GENDER"] = gender_numeric[gender]       
+
+            # Prediksi model (+ rekomendasi), di-cache per profil & versi model (predcache.py)
+            with telemetry.span("predict.score"):
+                result = predcache.predict([input_data[c] for c in FEATURES], pipeline, model_files)
+            scaled_values = result.score
         
             st.success(f"Hasil Prediksi: {scaled_values:.2f}")
+
+            # Posisi skor di populasi referensi (indeks terurut, population.py)
+            if os.path.exists("datasets_wellbeing.csv"):
+                with telemetry.span("predict.population"):
+                    pop = population_index("datasets_wellbeing.csv", model_files)
+                    pct, n = pop.below(scaled_values)
+                    pct_group, n_group = pop.below(scaled_values, input_data["AGE"], input_data["GENDER"])
+                if pct is not None:
+                    st.info(f"📊 Your score is higher than {int(pct)}% of {n:,} respondents in the reference dataset.")
+                if pct_group is not None:
+                    st.info(f"👥 Among {n_group:,} respondents aged {classification_age} ({gender}), your score is higher than {int(pct_group)}%.")
+
+                # Responden dengan kebiasaan paling mirip (neighbors.py)
+                with telemetry.span("predict.neighbors"):
+                    similar = neighbor_index("datasets_wellbeing.csv").similar([input_data[c] for c in FEATURES], k=25)
+                if len(similar["target"]):
+                    peer_scores = scale_value(similar["target"].astype(float))
+                    st.info(
+                        f"🧭 The {len(peer_scores)} respondents with habits most similar to yours score "
+                        f"{peer_scores.mean():.2f} on average (range {peer_scores.min():.2f}–{peer_scores.max():.2f})."
+                    )
         
             if scaled_values < 50:
                 st.markdown(
@@ -1171,113 +667,27 @@ def show_prediction():
 
             
             
-            # Personalized Recommendations
-        recommendations = []
-
-
-        # 1. Stress
-        stress_score = input_data["DAILY_STRESS"]
-        if stress_score >= 3 and stress_score <= 4:
-            recommendations.append("⚠️ High stress level detected. Consider stress-reducing activities like deep breathing, journaling, or nature walks.")
-        if stress_score >= 5:
-            recommendations.append("🧠 Your stress level is very high. Seek support from a therapist or mental health professional.")
-
-        # 2. Sleep
-        sleep_score = input_data["SLEEP_HOURS"]
-        if sleep_score < 4:
-            recommendations.append("💤 You're likely sleep-deprived. Aim for at least 7–8 hours of quality sleep.")
-
-        # 3. Fruits & Vegetables
-        fruit_score = input_data["FRUITS_VEGGIES"]
-        if fruit_score < 2:
-            recommendations.append("🍎 Try to increase your intake of fruits and vegetables. They’re vital for energy and mood.")
-
-        # 4. Physical Activity (Steps)
-        steps_score = input_data["DAILY_STEPS"]
-        if steps_score < 3:
-            recommendations.append("🚶‍♂️ You're not walking much. Try to reach 6,000–10,000 steps per day for better health.")
-
-        # 5. Meditation
-        meditation_score = input_data["WEEKLY_MEDITATION"]
-        if meditation_score < 2:
-            recommendations.append("🧘 Consider meditating a few times a week. It can boost focus and emotional well-being.")
-
-        # 6. Time for Passion
-        passion_score = input_data["TIME_FOR_PASSION"]
-        if passion_score < 3:
-            recommendations.append("🎨 Try to spend more time on your hobbies or passions to enhance life satisfaction.")
-
-        # 7. Social Interaction
-        social_score = input_data["SOCIAL_NETWORK"]
-        if social_score < 3:
-            recommendations.append("👥 Low social interaction detected. Connecting with people can improve your happiness and health.")
-
-        # 8. Core Circle (Close friends/family)
-        core_circle_score = input_data["CORE_CIRCLE"]
-        if core_circle_score < 2:
-            recommendations.append("🤝 Building deeper connections with people can increase your emotional support network.")
-
-        # 9. Supporting Others
-        support_score = input_data["SUPPORTING_OTHERS"]
-        if support_score < 2:
-            recommendations.append("❤️ Helping others can give you purpose and boost your self-esteem. Try small acts of kindness.")
-
-        # 10. Life Vision
-        vision_score = input_data["LIVE_VISION"]
-        if vision_score < 3:
-            recommendations.append("🔭 Consider clarifying your life goals. A clear vision can provide direction and motivation.")
-
-        # 11. To-Do Completion
-        todo_score = input_data["TODO_COMPLETED"]
-        if todo_score < 3:
-            recommendations.append("📋 You might benefit from better planning or routine. Try setting smaller, achievable goals.")
-
-        # 12. Achievements
-        achievement_score = input_data["ACHIEVEMENT"]
-        if achievement_score < 2:
-            recommendations.append("🏅 Celebrate small wins and keep setting personal goals to build a sense of accomplishment.")
-
-        # 13. Donation
-        donation_score = input_data["DONATION"]
-        if donation_score < 2:
-            recommendations.append("💰 Donating time or money to causes you care about can give a sense of purpose and fulfillment.")
-
-        # 14. BMI
-        bmi_score = input_data["BMI_RANGE"]
-        if bmi_score == 2:
-            recommendations.append("⚖️ You may be in an overweight category. A balanced diet and regular exercise can help.")
-
-        # 15. Lost Vacation
-        vacation_score = input_data["LOST_VACATION"]
-        if vacation_score > 5:
-            recommendations.append("🌴 You're losing too many vacation days. Taking time off helps restore energy and mental clarity.")
-
-        # 16. Shouting Frequency
-        shout_score = input_data["DAILY_SHOUTING"]
-        if shout_score > 5:
-            recommendations.append("📣 Frequent shouting might indicate unresolved tension. Consider talking to someone or journaling.")
-
-        # 17. Sufficient Income
-        income_score = input_data["SUFFICIENT_INCOME"]
-        if income_score == 2:
-            recommendations.append("💸 Financial stress affects well-being. Look into budgeting or financial planning help.")
-
-        # 18. Personal Awards
-        award_score = input_data["PERSONAL_AWARDS"]
-        if award_score < 2:
-            recommendations.append("🏆 You might benefit from setting goals that lead to recognition or feedback for your efforts.")
-
-        # 19. Flow (Immersed time)
-        flow_score = input_data["FLOW"]
-        if flow_score < 3:
-            recommendations.append("🔄 Try finding activities where you lose track of time. 'Flow' moments are deeply fulfilling.")
-
-
-        # Display Recommendations
-        if recommendations:
-            st.markdown("### 📝 Personalized Recommendations:")
-            for r in recommendations:
-                st.markdown(f"- {r}")
+            # Personalized Recommendations (tabel aturan di recommendations.py)
+            recommendations = result.recommendations
+
+            # Display Recommendations
+            if recommendations:
+                st.markdown("### 📝 Personalized Recommendations:")
+                for r in recommendations:
+                    st.markdown(f"- {r}")
+
+            # What-if: perubahan 1–2 kebiasaan terkecil menuju kategori berikutnya (whatif.py)
+            with telemetry.span("predict.whatif"):
+                what_if = sweep([input_data[c] for c in FEATURES], pipeline)
+            if what_if["targets"] or what_if["gains"]:
+                st.markdown("### 🎯 What If You Changed One or Two Habits?")
+                for level, options in what_if["targets"].items():
+                    for opt in options:
+                        changes = " + ".join(format_change(*c) for c in opt["changes"])
+                        st.markdown(f"- **{level}** ({opt['score']:.2f}): {changes}")
+                if not any(what_if["targets"].values()):
+                    for g in [g for g in what_if["gains"] if g["gain"] > 0][:3]:
+                        st.markdown(f"- {format_change(g['feature'], g['from'], g['to'])} (+{g['gain']:.2f})")
         
         
     # Footer
@@ -1344,14 +754,55 @@ def show_wellbeing():
                 </div>
             """, unsafe_allow_html=True)
 
+# =============================================================
+# DIAGNOSTIK (tersembunyi, ?diag=1)
+# =============================================================
+def show_diagnostics():
+    import pandas as pd
+
+    import figcache
+    import predcache
+
+    st.divider()
+    with st.expander("🛠️ Diagnostics", expanded=True):
+        if not telemetry.ENABLED:
+            st.caption("Telemetri mati. Jalankan dengan WLB_TELEMETRY=1 untuk mencatat waktu per bagian halaman.")
+        session = telemetry.session_id()
+        reruns = telemetry.recent(session)[:20]
+        if reruns:
+            last = reruns[0]
+            st.write(f"Sesi `{session}` · rerun terakhir: {last['page']} {last['total_ms']:.1f} ms ({last['status']})")
+            st.dataframe(pd.DataFrame(
+                [{"span": "· " * depth + name, "mulai_ms": round(start, 2), "durasi_ms": round(ms, 2)}
+                 for name, depth, start, ms in last["spans"]]
+            ))
+            st.write("Rerun terakhir sesi ini")
+            st.dataframe(pd.DataFrame(
+                [{"halaman": r["page"], "total_ms": round(r["total_ms"], 2), "status": r["status"]} for r in reruns]
+            ))
+        summary = telemetry.summary()
+        if summary:
+            st.write(f"Histogram proses (file Prometheus: `{telemetry.EXPORT_PATH}`)")
+            st.dataframe(pd.DataFrame(summary))
+        st.write("Artifact model")
+        st.dataframe(pd.DataFrame(artifacts.report()))
+        st.write("Cache chart & prediksi")
+        st.json({"figcache": figcache.stats(), "predcache": predcache.stats()})
+
 # =============================================================
 #                 ROUTER (Pilih Halaman)
 # =============================================================
-if st.session_state.current_page == "🏠 Home":
-    show_home()
-elif st.session_state.current_page == "📊 EDA":
-    show_eda()
-elif st.session_state.current_page == "📈 Health Prediction":
-    show_prediction()
-elif st.session_state.current_page == "🌿 Well-Being Tips":
-    show_wellbeing()
\ No newline at end of file
+# Setiap rerun + span di dalamnya dicatat bila WLB_TELEMETRY=1 (telemetry.py)
+with telemetry.rerun(st.session_state.current_page):
+    if st.session_state.current_page == "🏠 Home":
+        show_home()
+    elif st.session_state.current_page == "📊 EDA":
+        show_eda()
+    elif st.session_state.current_page == "📈 Health Prediction":
+        show_prediction()
+    elif st.session_state.current_page == "🌿 Well-Being Tips":
+        show_wellbeing()
+
+# Panel diagnostik tersembunyi: buka aplikasi dengan ?diag=1
+if st.query_params.get("diag") == "1":
+    show_diagnostics()
\ No newline at end of file
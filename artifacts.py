@@ -0,0 +1,148 @@
+# =============================================================
+# Registry artifact model (*.pkl) ─ dimuat sekali per proses
+# =============================================================
+# Streamlit menjalankan ulang Home.py pada setiap interaksi, tetapi modul
+# yang di-import tetap hidup di sys.modules. Registry ini memanfaatkan hal
+# tersebut: setiap artifact dimuat satu kali, dikunci dengan path + mtime
+# (dan sha256 isi file), lalu objek yang sama dibagikan ke semua sesi.
+# Modul ini sengaja ringan saat diimport (tanpa joblib/numpy di top level).
+import hashlib
+import os
+import sys
+import threading
+import time
+
+import telemetry
+
+_lock = threading.Lock()
+_registry = {}
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _freeze(obj, seen=None):
+    # Tandai semua array numpy di dalam estimator sebagai read-only supaya
+    # satu sesi tidak bisa mengubah parameter yang dipakai sesi lain.
+    import numpy as np
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        if obj.dtype == object:
+            # Array objek (mis. GradientBoosting.estimators_) dibaca Cython lewat
+            # memoryview yang harus writable; cukup bekukan isinya.
+            for v in obj.flat:
+                _freeze(v, seen)
+        else:
+            obj.flags.writeable = False
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _freeze(v, seen)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            _freeze(v, seen)
+    elif hasattr(obj, "__dict__"):
+        _freeze(vars(obj), seen)
+
+
+def _nbytes(obj, seen=None):
+    # Perkiraan ukuran objek di memori (rekursif, array dihitung dari nbytes).
+    import numpy as np
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_nbytes(k, seen) + _nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_nbytes(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _nbytes(vars(obj), seen)
+    return size
+
+
+def load(path):
+    """Kembalikan objek artifact bersama untuk `path`, memuat ulang hanya bila file berubah."""
+    key = os.path.abspath(path)
+    st = os.stat(key)  # FileNotFoundError diteruskan ke pemanggil
+    entry = _registry.get(key)
+    if entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        with _lock:
+            entry["hits"] += 1  # += bukan operasi atomik antar thread
+        return entry["obj"]
+
+    with _lock:
+        entry = _registry.get(key)
+        if entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            entry["hits"] += 1
+            return entry["obj"]
+
+        digest = _sha256(key)
+        if entry is not None and entry["sha256"] == digest:
+            # File disentuh (mtime berubah) tetapi isinya sama: tidak perlu unpickle ulang
+            entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            entry["hits"] += 1
+            return entry["obj"]
+
+        # joblib (dan numpy/sklearn) baru diimport saat artifact pertama dimuat
+        import joblib
+
+        t0 = time.perf_counter()
+        with telemetry.span("artifact.load"):
+            obj = joblib.load(key)
+        load_ms = (time.perf_counter() - t0) * 1000
+        _freeze(obj)
+        _registry[key] = {
+            "obj": obj,
+            "path": path,
+            "sha256": digest,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "load_ms": load_ms,
+            "mem_bytes": _nbytes(obj),
+            "loads": (entry["loads"] + 1) if entry else 1,
+            "hits": 0,
+        }
+        return obj
+
+
+def version(*paths):
+    """Sidik jari gabungan (sha256 pendek) dari artifact yang sudah dimuat."""
+    h = hashlib.sha256()
+    for path in paths:
+        load(path)
+        h.update(_registry[os.path.abspath(path)]["sha256"].encode())
+    return h.hexdigest()[:16]
+
+
+def report():
+    """Ringkasan per artifact: waktu muat, ukuran di memori, jumlah load & hit."""
+    rows = []
+    for entry in _registry.values():
+        rows.append({
+            "artifact": os.path.basename(entry["path"]),
+            "sha256": entry["sha256"][:12],
+            "file_kb": round(entry["size"] / 1024, 1),
+            "memory_kb": round(entry["mem_bytes"] / 1024, 1),
+            "load_ms": round(entry["load_ms"], 2),
+            "loads": entry["loads"],
+            "hits": entry["hits"],
+        })
+    return rows
+
+
+def clear():
+    with _lock:
+        _registry.clear()
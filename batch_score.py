@@ -0,0 +1,118 @@
+# =============================================================
+# Batch scoring CLI ─ skor survei CSV berskema datasets_wellbeing.csv
+# =============================================================
+# Contoh:
+#   python batch_score.py survey_export.csv -o scores.csv
+#   cat survey.csv | python batch_score.py - --keep Timestamp > scores.csv
+#
+# CSV dibaca per chunk berukuran tetap, setiap chunk di-encode (AGE/GENDER
+# sama dengan form prediksi), diskor secara vektor lewat tabel lookup dari
+# inference.py, lalu langsung ditulis ke output. Memori tetap datar
+# berapa pun besar file input. Dengan --tips ditambahkan kolom TIPS berisi
+# bitmask rekomendasi (bit i = recommendations.RULES[i]).
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import inference
+import recommendations
+from features import FEATURES, encode_frame, scale_value
+
+
+class MissingColumns(ValueError):
+    pass
+
+
+def check_columns(columns):
+    """Raise MissingColumns bila ada fitur form (features.QUESTIONS + AGE/GENDER) yang tidak ada di header."""
+    missing = [c for c in FEATURES if c not in columns]
+    if missing:
+        raise MissingColumns(f"Kolom wajib tidak ada di input: {', '.join(missing)}")
+
+
+def read_header(path):
+    return list(pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns)
+
+
+def iter_chunks(source, chunksize, keep=()):
+    # encoding utf-8-sig: dataset asli diawali BOM sebelum "Timestamp"
+    usecols = lambda c: c in FEATURES or c in keep
+    return pd.read_csv(source, chunksize=chunksize, usecols=usecols, encoding="utf-8-sig")
+
+
+def score_chunk(chunk, pipeline, keep=(), tips=False):
+    X = encode_frame(chunk)
+    valid = ~np.isnan(X).any(axis=1)
+    prediction = np.full(len(X), np.nan)
+    if valid.any():
+        prediction[valid] = pipeline.predict(X[valid])
+    out = chunk[[c for c in keep if c in chunk.columns]].copy()
+    out["PREDICTION"] = prediction
+    out["SCORE"] = scale_value(prediction)
+    if tips:
+        out["TIPS"] = pd.array(recommendations.bitmask(X), dtype="UInt32")
+        out.loc[~valid, "TIPS"] = pd.NA
+    return out, int((~valid).sum())
+
+
+def run(source, dest, chunksize=50_000, keep=(), pipeline=None, log=sys.stderr, tips=False):
+    pipeline = pipeline or inference.lookup()
+    rows = invalid = 0
+    t0 = time.perf_counter()
+    for i, chunk in enumerate(iter_chunks(source, chunksize, keep)):
+        check_columns(chunk.columns)
+        out, bad = score_chunk(chunk, pipeline, keep, tips)
+        out.to_csv(dest, header=(i == 0), index=False, float_format="%.4f")
+        rows += len(out)
+        invalid += bad
+        if log is not None:
+            rate = rows / max(time.perf_counter() - t0, 1e-9)
+            print(f"\r{rows:,} baris ({rate:,.0f} baris/detik)", end="", file=log, flush=True)
+    if log is not None:
+        print(f"\nSelesai: {rows:,} baris, {invalid:,} baris tidak valid (skor kosong).", file=log)
+    return rows, invalid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skor batch file survei well-being (CSV).")
+    parser.add_argument("input", help="file CSV input, atau '-' untuk stdin")
+    parser.add_argument("-o", "--output", default="-", help="file CSV output (default: stdout)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="jumlah baris per chunk")
+    parser.add_argument("--keep", nargs="*", default=[], help="kolom input yang ikut ditulis ke output")
+    parser.add_argument("--tips", action="store_true", help="tambahkan kolom TIPS (bitmask rekomendasi)")
+    parser.add_argument("--model", default="linear_regression.pkl")
+    parser.add_argument("--pt", default="power_transfromer.pkl")
+    parser.add_argument("--scaler", default="scaler.pkl")
+    parser.add_argument("--bundle", help="bundle model .wlb (bundle.py); menggantikan --model/--pt/--scaler")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.bundle:
+        import bundle
+        pipeline = bundle.load(args.bundle)
+    else:
+        pipeline = inference.lookup(args.model, args.pt, args.scaler)
+    source = sys.stdin.buffer if args.input == "-" else args.input
+    log = None if args.quiet else sys.stderr
+    try:
+        # File dicek sebelum output dibuka; stdin baru terbaca di chunk pertama (sebelum baris apa pun ditulis)
+        if source is not sys.stdin.buffer:
+            try:
+                columns = read_header(source)
+            except OSError as exc:
+                parser.error(str(exc))
+            check_columns(columns)
+        if args.output == "-":
+            run(source, sys.stdout, args.chunksize, args.keep, pipeline, log, args.tips)
+        else:
+            with open(args.output, "w", newline="") as dest:
+                run(source, dest, args.chunksize, args.keep, pipeline, log, args.tips)
+    except MissingColumns as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# =============================================================
+# Benchmark suite ─ latensi halaman Streamlit & komponen mentah
+# =============================================================
+# Contoh:
+#   python bench.py -o bench.json                          # jalankan semua skenario
+#   python bench.py --save-baseline bench_baseline.json    # simpan sebagai baseline
+#   python bench.py --baseline bench_baseline.json         # bandingkan; exit 1 bila regresi
+#   python bench.py -k app.eda --repeat 10
+#
+# Skenario:
+#   app.*    : Home.py dijalankan headless lewat streamlit.testing (AppTest):
+#              setiap halaman, rerun per tab EDA (ganti pilihan selectbox tab
+#              tersebut) dan klik "Predict Health Status" (cache prediksi
+#              dikosongkan dulu, jadi yang diukur adalah prediksi baru)
+#   data.*   : baca CSV mentah, DataFrame dari cache kolumnar, loop cleaning
+#   predict.*: satu baris dan batch 1/1k/20k/100k baris lewat scorer yang dipakai
+#              form, berdampingan dengan jalur sklearn asli (predict.sklearn_*)
+#              pada ukuran yang sama ─ scorer tidak boleh lebih lambat
+#   chart.*  : setiap chart EDA dirender tanpa figcache (termasuk encode PNG)
+# Setiap skenario punya setup (tidak diukur) lalu `--repeat` pengulangan
+# setelah `--warmup`; hasil per skenario berupa p50/p95/mean/min dalam ms.
+# Regresi = p50 lebih lambat dari baseline melebihi --tolerance (relatif)
+# dan --min-delta-ms (absolut, meredam noise skenario sangat cepat).
+# Skenario yang gagal (exception) juga membuat exit 1, dengan atau tanpa
+# baseline; terhadap baseline statusnya "error". Baseline mesin referensi
+# disimpan di bench_baseline.json.
+import argparse
+import collections
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import warnings
+
+import numpy as np
+
+import datastore
+from features import FEATURES
+
+CSV = "datasets_wellbeing.csv"
+SCRIPT = "Home.py"
+TARGET = "WORK_LIFE_BALANCE_SCORE"
+BATCH_SIZES = (1, 1_000, 20_000, 100_000)
+
+Scenario = collections.namedtuple("Scenario", ["name", "setup", "run"])
+
+
+def _summary(times):
+    ms = np.asarray(times) * 1000
+    return {
+        "n": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "min_ms": round(float(ms.min()), 3),
+    }
+
+
+# ── Skenario AppTest ──────────────────────────────────────────
+def _app(page):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SCRIPT, default_timeout=300)
+    at.session_state["current_page"] = page
+    return at
+
+
+def _checked(at):
+    if at.exception:
+        raise RuntimeError(f"Home.py gagal: {at.exception[0].value}")
+    return at
+
+
+def _page(page):
+    return Scenario(f"app.page.{page.split()[-1].lower()}", lambda: page, lambda p, i: _checked(_app(p).run()))
+
+
+def _eda_tab(name, keys):
+    # Rerun halaman EDA setelah pilihan selectbox milik satu tab diganti
+    def setup():
+        return _checked(_app("📊 EDA").run())
+
+    def run(at, i):
+        if keys:
+            box = at.selectbox(key=keys[i % len(keys)])
+            box.select(box.options[(i + 1) % len(box.options)])
+        return _checked(at.run())
+
+    return Scenario(f"app.eda.{name}", setup, run)
+
+
+def _predict_click():
+    import predcache
+
+    def setup():
+        at = _checked(_app("📈 Health Prediction").run())
+        at.text_input[0].input("Bench").run()
+        return _checked(at.number_input[0].set_value(30).run())
+
+    def run(at, i):
+        predcache.clear()
+        return _checked(at.button[0].click().run())
+
+    return Scenario("app.predict.click", setup, run)
+
+
+def app_scenarios():
+    pages = ["🏠 Home", "📊 EDA", "📈 Health Prediction", "🌿 Well-Being Tips"]
+    return [_page(p) for p in pages] + [
+        _eda_tab("distribusi", ["selectbox_numerik", "selectbox_kategori"]),
+        _eda_tab("fitur_target", ["scatter_numerik", "boxplot_kategori"]),
+        _eda_tab("korelasi", []),
+        _predict_click(),
+    ]
+
+
+# ── Komponen mentah ───────────────────────────────────────────
+def _model_files():
+    # Sama dengan show_prediction(): stacking bila ada, selain itu model linear
+    model = "stacking_model.pkl" if os.path.exists("stacking_model.pkl") else "linear_regression.pkl"
+    return model, "power_transfromer.pkl", "scaler.pkl"
+
+
+def _scorer():
+    # Stacking terkompilasi, atau tabel lookup untuk model linear
+    model_files = _model_files()
+    if model_files[0] == "stacking_model.pkl":
+        import ensemble
+        return ensemble.ensemble(*model_files)
+    import inference
+    return inference.lookup()
+
+
+def _sklearn_scorer():
+    import types
+
+    import artifacts
+    import inference
+
+    objs = [artifacts.load(path) for path in _model_files()]
+    return types.SimpleNamespace(predict=lambda X: inference.sklearn_predict(*objs, X))
+
+
+def data_scenarios():
+    import pandas as pd
+
+    import cleaning
+    import outofcore
+
+    return [
+        Scenario("data.read_csv", lambda: None, lambda _, i: pd.read_csv(CSV)),
+        Scenario("data.load_dataset", lambda: None, lambda _, i: datastore.load_dataset(CSV)),
+        Scenario("data.clean", lambda: datastore.load_dataset(CSV), lambda df, i: cleaning.clean(df)),
+        Scenario("data.outofcore", lambda: None, lambda _, i: outofcore.summarize(CSV, outofcore.MEMORY_MB)),
+    ]
+
+
+def predict_scenarios():
+    def setup_one():
+        rng = np.random.default_rng(0)
+        return _scorer(), rng.integers(0, 4, size=(64, len(FEATURES))).tolist()
+
+    def setup_batch(make, rows):
+        def setup():
+            rng = np.random.default_rng(0)
+            return make(), rng.integers(0, 4, size=(rows, len(FEATURES))).astype(np.float64)
+        return setup
+
+    out = [Scenario("predict.single", setup_one, lambda s, i: s[0].predict_one(s[1][i % len(s[1])]))]
+    for rows in BATCH_SIZES:
+        out += [
+            Scenario(f"predict.batch_{rows}", setup_batch(_scorer, rows), lambda s, i: s[0].predict(s[1])),
+            Scenario(f"predict.sklearn_{rows}", setup_batch(_sklearn_scorer, rows), lambda s, i: s[0].predict(s[1])),
+        ]
+    return out
+
+
+def _charts(df, dists, reg_stats):
+    # Kode render yang sama dengan closure di show_eda()
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    import distributions
+    import regstats
+
+    numeric = [c for c in df.select_dtypes(include="number").columns if c != TARGET][0]
+    category = df.select_dtypes(include=["object", "category"]).columns[0]
+
+    def target_hist():
+        fig, ax = plt.subplots(figsize=(8, 4))
+        distributions.draw(ax, dists[TARGET], color="Teal")
+        return fig
+
+    def feature_hist():
+        fig, ax = plt.subplots(figsize=(8, 4))
+        distributions.draw(ax, dists[numeric], color="salmon")
+        return fig
+
+    def countplot():
+        fig, ax = plt.subplots(figsize=(6, 4))
+        sns.countplot(data=df, x=category, order=df[category].value_counts().index, ax=ax, color="lightblue")
+        return fig
+
+    def regplot():
+        fig, ax = plt.subplots(figsize=(6, 4))
+        regstats.draw(ax, df[numeric], df[TARGET], reg_stats[numeric],
+                      scatter_kws={"alpha": 0.5, "color": "lightblue"}, line_kws={"color": "red"},
+                      xlabel=numeric, ylabel=TARGET)
+        return fig
+
+    def boxplot():
+        fig, ax = plt.subplots(figsize=(6, 4))
+        sns.boxplot(data=df, x=category, y=TARGET, ax=ax, palette="Pastel1")
+        return fig
+
+    def corr_heatmap():
+        fig = plt.figure(figsize=(12, 8))
+        correlation = df.select_dtypes(include="number").corr()
+        sns.heatmap(correlation[[TARGET]].sort_values(by=TARGET, ascending=False), annot=True, cmap="coolwarm")
+        return fig
+
+    return {f.__name__: f for f in (target_hist, feature_hist, countplot, regplot, boxplot, corr_heatmap)}
+
+
+def chart_scenarios():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    import cleaning
+    import distributions
+    import figcache
+    import regstats
+
+    def render(charts, name):
+        fig = charts[name]()
+        try:
+            fig.savefig(io.BytesIO(), **figcache.SAVEFIG_OPTIONS)
+        finally:
+            plt.close(fig)
+
+    def setup():
+        return _charts(
+            cleaning.cleaned_dataset(CSV)[0],
+            distributions.cleaned_distributions(CSV),
+            regstats.cleaned_regression_stats(CSV),
+        )
+
+    names = ["target_hist", "feature_hist", "countplot", "regplot", "boxplot", "corr_heatmap"]
+    return [Scenario(f"chart.{n}", setup, lambda charts, i, n=n: render(charts, n)) for n in names]
+
+
+def scenarios():
+    return app_scenarios() + data_scenarios() + predict_scenarios() + chart_scenarios()
+
+
+# ── Runner & perbandingan baseline ────────────────────────────
+def run(selected, repeat=20, warmup=2, log=sys.stderr):
+    results = {}
+    for sc in selected:
+        t0 = time.perf_counter()
+        try:
+            state = sc.setup()
+            for i in range(warmup):
+                sc.run(state, i)
+            times = []
+            for i in range(repeat):
+                t = time.perf_counter()
+                sc.run(state, warmup + i)
+                times.append(time.perf_counter() - t)
+        except Exception as exc:  # skenario gagal dicatat, suite tetap jalan
+            results[sc.name] = {"error": f"{type(exc).__name__}: {exc}"}
+        else:
+            results[sc.name] = _summary(times)
+        if log is not None:
+            r = results[sc.name]
+            line = r["error"] if "error" in r else f"p50 {r['p50_ms']:>10.3f} ms   p95 {r['p95_ms']:>10.3f} ms"
+            print(f"{sc.name:<28} {line}   ({time.perf_counter() - t0:.1f} s)", file=log, flush=True)
+    return results
+
+
+def compare(results, baseline, tolerance=0.2, min_delta_ms=0.5):
+    """Per skenario: rasio p50 terhadap baseline dan status ok / regression / improved."""
+    out = {}
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base or "error" in base:
+            continue
+        if "error" in r:
+            # Skenario yang dulu jalan sekarang gagal: lebih buruk dari regresi apa pun
+            out[name] = {"baseline_p50_ms": base["p50_ms"], "ratio": None, "status": "error"}
+            continue
+        ratio = r["p50_ms"] / base["p50_ms"] if base["p50_ms"] else float("inf")
+        delta = r["p50_ms"] - base["p50_ms"]
+        if ratio > 1 + tolerance and delta > min_delta_ms:
+            status = "regression"
+        elif ratio < 1 - tolerance and -delta > min_delta_ms:
+            status = "improved"
+        else:
+            status = "ok"
+        out[name] = {"baseline_p50_ms": base["p50_ms"], "ratio": round(ratio, 3), "status": status}
+    return out
+
+
+def _meta():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "dataset": datastore.dataset_version(CSV) if os.path.exists(CSV) else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark halaman Home.py dan komponen mentahnya.")
+    parser.add_argument("-k", "--select", action="append", default=[], help="hanya skenario yang namanya memuat teks ini")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("-o", "--output", default="-", help="file JSON hasil (default: stdout)")
+    parser.add_argument("--baseline", help="file JSON baseline untuk dibandingkan")
+    parser.add_argument("--save-baseline", help="tulis hasil juga sebagai baseline baru")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="batas perlambatan p50 relatif (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="perlambatan absolut minimum untuk regresi")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    logging.disable(logging.ERROR)  # log "bare mode" AppTest membanjiri output
+    selected = [sc for sc in scenarios() if not args.select or any(s in sc.name for s in args.select)]
+    log = None if args.quiet else sys.stderr
+    report = {"meta": _meta(), "repeat": args.repeat, "scenarios": run(selected, args.repeat, args.warmup, log)}
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline"] = baseline.get("meta")
+        report["comparison"] = compare(report["scenarios"], baseline["scenarios"], args.tolerance, args.min_delta_ms)
+        regressions = [n for n, c in report["comparison"].items() if c["status"] == "regression"]
+        if log is not None:
+            for name, c in report["comparison"].items():
+                print(f"{name:<28} x{str(c['ratio']):<7} {c['status']}", file=log)
+    errors = [n for n, r in report["scenarios"].items() if "error" in r]
+
+    text = json.dumps(report, indent=1)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+    if errors:
+        print(f"Gagal: {', '.join(errors)}", file=sys.stderr)
+    if regressions:
+        print(f"Regresi: {', '.join(regressions)}", file=sys.stderr)
+    if errors or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
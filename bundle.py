@@ -0,0 +1,254 @@
+# =============================================================
+# Bundle model biner tanpa pickle (satu file, bisa di-mmap)
+# =============================================================
+# Contoh:
+#   python bundle.py export -o model.wlb                        # linear_regression.pkl
+#   python bundle.py export -o stacking.wlb --model stacking_model.pkl
+#   python bundle.py info model.wlb
+#
+# Tata letak file:
+#   MAGIC (8 byte) | versi format (uint32) | panjang manifest (uint32)
+#   | manifest JSON (utf-8) | padding ke 64 byte | blok data array
+# Manifest mencatat jenis model, urutan fitur, parameter skalar, sha256 artifact
+# sumber, lokasi setiap array (dtype, shape, offset dalam blok data) dan sha256
+# blok data. Array dibaca sebagai view read-only di atas satu np.memmap, jadi
+# banyak proses worker berbagi halaman memori yang sama dan load hanya
+# membaca manifest (+ checksum bila verify=True). Tidak ada kode yang
+# dieksekusi saat load, berbeda dengan joblib/pickle.
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import types
+
+import numpy as np
+
+from features import FEATURES, COL_TO_NORMALIZE
+
+MAGIC = b"WLBMODEL"
+FORMAT_VERSION = 1
+ALIGN = 64
+_HEADER = struct.Struct("<8sII")
+
+_lock = threading.Lock()
+_cache = {}
+
+
+class BundleError(ValueError):
+    pass
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _preprocess_arrays(pt, scaler):
+    n = len(FEATURES)
+    if getattr(pt, "method", "yeo-johnson") != "yeo-johnson":
+        raise TypeError(f"PowerTransformer method '{pt.method}' tidak didukung")
+    standardize = getattr(pt, "standardize", False)
+    lambdas = np.asarray(pt.lambdas_, dtype=np.float64)
+    return {
+        "pre.lambdas": lambdas,
+        "pre.pt_mean": np.asarray(pt._scaler.mean_, dtype=np.float64) if standardize else np.zeros(len(lambdas)),
+        "pre.pt_scale": np.asarray(pt._scaler.scale_, dtype=np.float64) if standardize else np.ones(len(lambdas)),
+        "pre.mean": np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n),
+        "pre.scale": np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n),
+    }
+
+
+def _base_arrays(prefix, compiled):
+    # compiled = ensemble.LinearBase / ensemble.TreeBase
+    if hasattr(compiled, "coef"):
+        return {"kind": "linear", "intercept": compiled.intercept}, {f"{prefix}.coef": compiled.coef}
+    params = {"kind": "trees", "depth": compiled.depth, "scale": compiled.scale, "offset": compiled.offset}
+    arrays = {
+        f"{prefix}.feature": compiled.feature.astype(np.int32),
+        f"{prefix}.threshold": compiled.threshold.astype(np.float64),
+        f"{prefix}.children": compiled.children.astype(np.int32),
+        f"{prefix}.value": compiled.value.astype(np.float64),
+        f"{prefix}.roots": compiled.roots.astype(np.int32),
+    }
+    return params, arrays
+
+
+def export(out_path, model_path="linear_regression.pkl", pt_path="power_transfromer.pkl", scaler_path="scaler.pkl"):
+    """Tulis bundle dari artifact .pkl; hasil load diverifikasi terhadap jalur sklearn. Kembalikan manifest."""
+    import artifacts
+    import ensemble
+    import inference
+
+    model, pt, scaler = artifacts.load(model_path), artifacts.load(pt_path), artifacts.load(scaler_path)
+    arrays = _preprocess_arrays(pt, scaler)
+    if type(model).__name__ == "StackingRegressor":
+        compiled = ensemble.CompiledEnsemble(model, pt, scaler)
+        bases = []
+        for i, base in enumerate(compiled.bases):
+            params, base_arrays = _base_arrays(f"base{i}", base)
+            bases.append(params)
+            arrays.update(base_arrays)
+        arrays["meta.coef"] = compiled.meta_coef
+        params = {
+            "kind": "stacking",
+            "bases": bases,
+            "meta_intercept": compiled.meta_intercept,
+            "passthrough": compiled.passthrough,
+        }
+    elif hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        arrays["model.coef"] = np.asarray(model.coef_, dtype=np.float64).ravel()
+        params = {"kind": "linear", "intercept": float(np.ravel(model.intercept_)[0])}
+    else:
+        raise TypeError(f"Model {type(model).__name__} tidak bisa diekspor")
+
+    # Tata letak blok data: setiap array rata 64 byte
+    layout, offset = {}, 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = arr
+        layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    data = bytearray(offset)
+    for name, arr in arrays.items():
+        start = layout[name]["offset"]
+        data[start:start + arr.nbytes] = arr.tobytes()
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "model": params,
+        "features": list(FEATURES),
+        "normalize": list(COL_TO_NORMALIZE),
+        "sources": {os.path.basename(p): _sha256_file(p) for p in (model_path, pt_path, scaler_path)},
+        "arrays": layout,
+        "data_bytes": len(data),
+        "data_sha256": hashlib.sha256(data).hexdigest(),
+    }
+    blob = json.dumps(manifest, separators=(",", ":")).encode()
+    head = _HEADER.pack(MAGIC, FORMAT_VERSION, len(blob)) + blob
+    head += b"\0" * (-len(head) % ALIGN)
+
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(head)
+        f.write(data)
+    try:
+        scorer = _open(tmp, verify=True)[1]
+        expected = inference.sklearn_predict(model, pt, scaler, _SAMPLE)
+        if not np.allclose(scorer.predict(_SAMPLE), expected, rtol=1e-9, atol=1e-7):
+            raise BundleError("Bundle menyimpang dari model sklearn sumber")
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, out_path)
+    return manifest
+
+
+_SAMPLE = np.random.default_rng(0).integers(0, 11, size=(256, len(FEATURES))).astype(np.float64)
+
+
+def read_manifest(path):
+    with open(path, "rb") as f:
+        magic, version, length = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise BundleError(f"{path} bukan bundle model")
+        if version != FORMAT_VERSION:
+            raise BundleError(f"Versi bundle {version} tidak didukung (diharapkan {FORMAT_VERSION})")
+        manifest = json.loads(f.read(length))
+    data_start = -(-(_HEADER.size + length) // ALIGN) * ALIGN
+    return manifest, data_start
+
+
+def _open(path, verify=True):
+    import ensemble
+    import inference
+
+    manifest, data_start = read_manifest(path)
+    if manifest["features"] != list(FEATURES) or manifest["normalize"] != list(COL_TO_NORMALIZE):
+        raise BundleError("Urutan fitur bundle berbeda dengan features.py")
+    data = np.memmap(path, dtype=np.uint8, mode="r", offset=data_start, shape=(manifest["data_bytes"],))
+    if verify and hashlib.sha256(data).hexdigest() != manifest["data_sha256"]:
+        raise BundleError(f"Checksum data {path} tidak cocok")
+
+    def array(name):
+        spec = manifest["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = spec["offset"]
+        return data[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    ns = types.SimpleNamespace
+    pt = ns(method="yeo-johnson", standardize=True, lambdas_=array("pre.lambdas"),
+            _scaler=ns(mean_=array("pre.pt_mean"), scale_=array("pre.pt_scale")))
+    scaler = ns(mean_=array("pre.mean"), scale_=array("pre.scale"), with_mean=True, with_std=True)
+    params = manifest["model"]
+    if params["kind"] == "linear":
+        model = ns(coef_=array("model.coef"), intercept_=params["intercept"])
+        scorer = inference.LookupScorer(inference.CompiledPipeline(model, pt, scaler))
+    elif params["kind"] == "stacking":
+        bases = []
+        for i, base in enumerate(params["bases"]):
+            if base["kind"] == "linear":
+                bases.append(ensemble.LinearBase(ns(coef_=array(f"base{i}.coef"), intercept_=base["intercept"])))
+            else:
+                bases.append(ensemble.TreeBase.from_arrays(
+                    array(f"base{i}.feature"), array(f"base{i}.threshold"), array(f"base{i}.children"),
+                    array(f"base{i}.value"), array(f"base{i}.roots"), base["depth"], base["scale"], base["offset"],
+                ))
+        scorer = ensemble.CompiledEnsemble.from_parts(
+            ensemble.Preprocessor(pt, scaler), bases, array("meta.coef"), params["meta_intercept"], params["passthrough"],
+        )
+    else:
+        raise BundleError(f"Jenis model bundle '{params['kind']}' tidak dikenal")
+    return manifest, scorer
+
+
+def load(path="model.wlb", verify=True):
+    """Scorer (predict/predict_one) dari bundle; dibuka sekali per proses selama file tidak berubah."""
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    entry = _cache.get(key)
+    if entry is None or entry[0] != (st.st_size, st.st_mtime_ns):
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None or entry[0] != (st.st_size, st.st_mtime_ns):
+                entry = _cache[key] = ((st.st_size, st.st_mtime_ns), *_open(key, verify))
+    return entry[2]
+
+
+def version(path="model.wlb"):
+    """sha256 pendek blok data bundle (kunci cache turunan, setara artifacts.version)."""
+    return read_manifest(path)[0]["data_sha256"][:16]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor / periksa bundle model tanpa pickle.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="tulis bundle dari artifact .pkl")
+    exp.add_argument("-o", "--output", default="model.wlb")
+    exp.add_argument("--model", default="linear_regression.pkl")
+    exp.add_argument("--pt", default="power_transfromer.pkl")
+    exp.add_argument("--scaler", default="scaler.pkl")
+    info = sub.add_parser("info", help="tampilkan manifest bundle dan verifikasi checksum")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        manifest = export(args.output, args.model, args.pt, args.scaler)
+        size = os.path.getsize(args.output)
+        print(f"{args.output}: {manifest['model']['kind']}, {len(manifest['arrays'])} array, {size / 1024:.1f} KB", file=sys.stderr)
+    else:
+        manifest, _ = read_manifest(args.path)
+        _open(args.path, verify=True)
+        summary = {k: v for k, v in manifest.items() if k != "arrays"}
+        summary["arrays"] = {k: f"{v['dtype']}{tuple(v['shape'])}" for k, v in manifest["arrays"].items()}
+        print(json.dumps(summary, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# =============================================================
+# Pipeline data cleaning untuk halaman EDA (sekali per versi dataset)
+# =============================================================
+# Langkah yang sama dengan show_eda(): hapus Timestamp → dropna →
+# drop_duplicates → filter outlier IQR per fitur numerik secara berurutan.
+# Bedanya, semua langkah hanya memperbarui satu mask boolean baris; frame
+# hanya disalin sekali di akhir. Hasil + laporan per langkah di-cache
+# dengan kunci sha256 dataset, jadi rerun Streamlit tidak menghitung ulang.
+#
+# Untuk data yang datang per chunk / tidak muat di memori, batas IQR bisa
+# diturunkan dari QuantileSketch (sketches.py) yang dibangun per chunk dan
+# digabung lintas proses: sketch_columns() → iqr_bounds() → filter_chunks().
+# Catatan: di jalur streaming semua batas dihitung atas himpunan baris yang
+# sama (tidak berurutan per fitur seperti clean()).
+import threading
+
+import numpy as np
+
+import datastore
+import sketches
+
+DROP_COLUMNS = ['Timestamp']
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def clean(df):
+    """Kembalikan (df_bersih, laporan) dengan semantik filter berurutan yang lama.
+
+    Laporan berisi kolom yang dihapus, jumlah sel kosong, jumlah baris duplikat,
+    dan daftar (fitur, baris_terhapus) untuk filter IQR.
+    """
+    report = {"dropped_columns": [], "missing": 0, "duplicates": 0, "outliers": []}
+    drop = [c for c in DROP_COLUMNS if c in df.columns]
+    if drop:
+        df = df.drop(columns=drop)
+        report["dropped_columns"] = drop
+
+    null = df.isnull().to_numpy()
+    report["missing"] = int(null.sum())
+    keep = ~null.any(axis=1)
+
+    # Baris tanpa NaN hanya bisa menjadi duplikat dari baris tanpa NaN lain,
+    # jadi duplicated() pada frame penuh sama dengan setelah dropna.
+    dup = df.duplicated().to_numpy() & keep
+    report["duplicates"] = int(dup.sum())
+    keep &= ~dup
+
+    remaining = int(keep.sum())
+    for fitur in df.select_dtypes(include='number').columns:
+        col = df[fitur].to_numpy()
+        Q1, Q3 = np.quantile(col[keep], [0.25, 0.75])
+        IQR = Q3 - Q1
+        lower = Q1 - 1.5 * IQR
+        upper = Q3 + 1.5 * IQR
+        keep &= (col >= lower) & (col <= upper)
+        after = int(keep.sum())
+        report["outliers"].append((fitur, remaining - after))
+        remaining = after
+
+    report["total_outliers"] = sum(n for _, n in report["outliers"])
+    return df[keep], report
+
+
+def cleaned_dataset(csv_path="datasets_wellbeing.csv"):
+    """(df_bersih, laporan) untuk CSV; dihitung sekali per versi dataset."""
+    version = datastore.dataset_version(csv_path)
+    key = (csv_path, version)
+    entry = _cache.get(key)
+    if entry is None:
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None:
+                df, report = clean(datastore.load_dataset(csv_path))
+                for old in [k for k in _cache if k[0] == csv_path]:
+                    del _cache[old]
+                entry = _cache[key] = (df, report)
+    df, report = entry
+    return df.copy(deep=False), report
+
+
+def iqr_bounds(sketch):
+    """(batas bawah, batas atas) = Q1 − 1.5·IQR, Q3 + 1.5·IQR dari QuantileSketch."""
+    Q1, Q3 = sketch.quantile([0.25, 0.75])
+    IQR = Q3 - Q1
+    return float(Q1 - 1.5 * IQR), float(Q3 + 1.5 * IQR)
+
+
+def sketch_columns(frames, columns, eps=sketches.EPS):
+    """Satu pass atas iterator DataFrame: {kolom: QuantileSketch}. Hasil beberapa proses bisa di-merge."""
+    result = {c: sketches.QuantileSketch(eps) for c in columns}
+    for frame in frames:
+        for c in columns:
+            result[c].update(frame[c].to_numpy(dtype=np.float64))
+    return result
+
+
+def outlier_mask(frame, bounds):
+    """Mask baris yang berada di dalam semua batas {kolom: (bawah, atas)}."""
+    keep = np.ones(len(frame), dtype=bool)
+    for c, (lower, upper) in bounds.items():
+        col = frame[c].to_numpy()
+        keep &= (col >= lower) & (col <= upper)
+    return keep
+
+
+def filter_chunks(frames, bounds):
+    """Generator chunk tanpa outlier: satu pass streaming dengan batas yang sudah diketahui."""
+    for frame in frames:
+        yield frame[outlier_mask(frame, bounds)]
@@ -0,0 +1,224 @@
+# =============================================================
+# Cache kolumnar datasets_wellbeing.csv (memory-mapped)
+# =============================================================
+# CSV diparse sekali lalu disimpan sebagai file .npy per kelompok kolom:
+#   - jawaban survei 0–10 → satu matriks int8 (Fortran order, satu blok pandas)
+#   - kolom teks (Timestamp, AGE, GENDER, ...) → kode kategori + daftar kategori
+#   - WORK_LIFE_BALANCE_SCORE / kolom desimal lain → float32
+# Semua dimuat dengan np.load(mmap_mode="r"), jadi rerun dan sesi lain
+# memakai halaman memori yang sama. Cache dibangun ulang otomatis bila
+# CSV berubah (ukuran/mtime, dikonfirmasi dengan sha256).
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import telemetry
+
+FORMAT_VERSION = 1
+KEEP_VERSIONS = 3          # direktori versi turunan yang selalu disimpan (termasuk yang baru)
+PRUNE_MIN_AGE = 3600.0     # detik; versi lebih muda dari ini tidak pernah dihapus
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def cache_path(csv_path):
+    csv_path = os.path.abspath(csv_path)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), ".cache", f"{name}.cols")
+
+
+def prune_versions(parent, current, keep=KEEP_VERSIONS, min_age=PRUNE_MIN_AGE):
+    """Hapus direktori versi lama di `parent` (mis. .cache/<dataset>.population/).
+
+    Proses lain bisa masih memakai versi sebelumnya (model/dataset lama) atau
+    baru akan membukanya, jadi yang dihapus hanya versi di luar `keep` terbaru
+    (menurut mtime) DAN lebih tua dari `min_age` detik. Direktori .tmp- milik
+    penulis lain tidak disentuh. Mengembalikan daftar path yang dihapus.
+    """
+    entries = []
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if name.startswith(".tmp-") or os.path.abspath(path) == os.path.abspath(current):
+            continue
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    now = time.time()
+    removed = []
+    for mtime, path in entries[max(keep - 1, 0):]:
+        if now - mtime >= min_age:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_info(csv_path, digest=None):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest or _sha256(csv_path)}
+
+
+def _category_codes(series):
+    cat = series.astype("category").cat
+    n = len(cat.categories)
+    dtype = np.int8 if n < 127 else np.int16 if n < 32767 else np.int32
+    return cat.codes.to_numpy().astype(dtype), [str(c) for c in cat.categories]
+
+
+def build(csv_path, out_dir=None):
+    """Parse CSV dan tulis cache kolumnar; mengembalikan path direktori cache."""
+    out_dir = out_dir or cache_path(csv_path)
+    source = _source_info(csv_path)
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+
+    columns, codes, floats, cats = [], [], {}, {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s) and len(s) and s.min() >= -128 and s.max() <= 127:
+            columns.append({"name": col, "kind": "int8"})
+            codes.append(s.to_numpy(dtype=np.int8))
+        elif pd.api.types.is_numeric_dtype(s):
+            columns.append({"name": col, "kind": "float32"})
+            floats[col] = s.to_numpy(dtype=np.float32)
+        else:
+            # Kolom teks, termasuk kolom angka yang tercampur nilai tidak valid
+            # (mis. DAILY_STRESS berisi "1/1/00"): tetap kategorik seperti read_csv.
+            c, categories = _category_codes(s)
+            columns.append({"name": col, "kind": "category", "categories": categories})
+            cats[col] = c
+
+    parent = os.path.dirname(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        if codes:
+            np.save(os.path.join(tmp, "codes.npy"), np.asfortranarray(np.column_stack(codes)))
+        for i, (col, arr) in enumerate(floats.items()):
+            np.save(os.path.join(tmp, f"float_{i}.npy"), arr)
+        for i, (col, arr) in enumerate(cats.items()):
+            np.save(os.path.join(tmp, f"cat_{i}.npy"), arr)
+        meta = {
+            "format": FORMAT_VERSION,
+            "rows": len(df),
+            "columns": columns,
+            "float_files": {col: f"float_{i}.npy" for i, col in enumerate(floats)},
+            "cat_files": {col: f"cat_{i}.npy" for i, col in enumerate(cats)},
+            "source": source,
+        }
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        # Ganti cache lama secara atomik (rename direktori)
+        if os.path.exists(out_dir):
+            old = out_dir + ".old"
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(out_dir, old)
+            os.replace(tmp, out_dir)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return out_dir
+
+
+def _read_meta(out_dir):
+    try:
+        with open(os.path.join(out_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("format") == FORMAT_VERSION else None
+
+
+def _is_fresh(meta, csv_path):
+    if meta is None:
+        return False
+    st = os.stat(csv_path)
+    src = meta["source"]
+    if src["size"] == st.st_size and src["mtime_ns"] == st.st_mtime_ns:
+        return True
+    # mtime berubah: hanya bangun ulang bila isinya benar-benar berbeda
+    return src["size"] == st.st_size and src["sha256"] == _sha256(csv_path)
+
+
+def _open(out_dir, meta):
+    arrays = {}
+    if any(c["kind"] == "int8" for c in meta["columns"]):
+        arrays["codes"] = np.load(os.path.join(out_dir, "codes.npy"), mmap_mode="r")
+    for col, fname in meta["float_files"].items():
+        arrays[col] = np.load(os.path.join(out_dir, fname), mmap_mode="r")
+    for col, fname in meta["cat_files"].items():
+        arrays[col] = np.load(os.path.join(out_dir, fname), mmap_mode="r")
+    return arrays
+
+
+def _frame(meta, arrays):
+    int_cols = [c["name"] for c in meta["columns"] if c["kind"] == "int8"]
+    parts = {}
+    if int_cols:
+        block = pd.DataFrame(arrays["codes"], columns=int_cols, copy=False)
+        parts.update({c: block[c] for c in int_cols})
+    for c in meta["columns"]:
+        if c["kind"] == "float32":
+            parts[c["name"]] = pd.Series(arrays[c["name"]], copy=False)
+        elif c["kind"] == "category":
+            cat = pd.Categorical.from_codes(arrays[c["name"]], categories=c["categories"])
+            parts[c["name"]] = pd.Series(cat, copy=False)
+    df = pd.concat(parts, axis=1, copy=False)
+    return df[[c["name"] for c in meta["columns"]]]
+
+
+def _entry(csv_path):
+    key = os.path.abspath(csv_path)
+    out_dir = cache_path(key)
+    st = os.stat(key)
+    entry = _loaded.get(key)
+    if entry is None or (entry["size"], entry["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+        with _lock:
+            entry = _loaded.get(key)
+            if entry is None or (entry["size"], entry["mtime_ns"]) != (st.st_size, st.st_mtime_ns):
+                meta = _read_meta(out_dir)
+                if not _is_fresh(meta, key):
+                    with telemetry.span("datastore.build"):
+                        build(key, out_dir)
+                    meta = _read_meta(out_dir)
+                entry = _loaded[key] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "meta": meta,
+                    "arrays": _open(out_dir, meta),
+                }
+    return entry
+
+
+def load_dataset(csv_path="datasets_wellbeing.csv"):
+    """DataFrame baru di atas array memory-mapped; cache dibangun/diperbarui bila perlu.
+
+    Setiap pemanggil mendapat objek DataFrame sendiri (aman untuk drop/dropna
+    inplace), tetapi datanya berbagi halaman mmap yang sama.
+    """
+    entry = _entry(csv_path)
+    return _frame(entry["meta"], entry["arrays"])
+
+
+def dataset_version(csv_path="datasets_wellbeing.csv"):
+    """sha256 pendek dari CSV sumber, dipakai sebagai kunci cache turunan."""
+    return _entry(csv_path)["meta"]["source"]["sha256"][:16]
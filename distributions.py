@@ -0,0 +1,167 @@
+# =============================================================
+# Distribusi terhitung-di-muka untuk tab "Distribusi Data"
+# =============================================================
+# sns.histplot(kde=True) menjalankan Gaussian KDE atas setiap baris mentah
+# (O(n × grid)) setiap kali fitur dipilih. Di sini distribusi dihitung
+# sekali per versi dataset:
+#   - fitur diskrit (kode integer 0–10): jumlah per level secara eksak;
+#     KDE-nya juga eksak karena semua massa berada di titik integer.
+#   - target kontinu (WORK_LIFE_BALANCE_SCORE): histogram + KDE ter-binning
+#     (linear binning ke grid tetap, konvolusi Gaussian via FFT).
+# Biaya render chart tidak lagi bergantung pada jumlah baris.
+# from_sketch() menghasilkan distribusi yang sama dari QuantileSketch mode exact
+# (pasangan nilai–jumlah), untuk data yang dibaca per chunk (outofcore.py).
+import threading
+
+import numpy as np
+
+import cleaning
+import datastore
+
+GRID_SIZE = 512
+CUT = 0  # perpanjangan grid KDE dalam satuan bandwidth (histplot memakai cut=0)
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _scott(n, std):
+    # Bandwidth Scott untuk data 1-D, sama dengan scipy.stats.gaussian_kde
+    return std * n ** (-1 / 5)
+
+
+def _weighted_std(points, weights):
+    n = weights.sum()
+    mean = np.dot(points, weights) / n
+    return np.sqrt(np.dot((points - mean) ** 2, weights) / (n - 1))
+
+
+def discrete(values):
+    """Jumlah eksak per level integer + KDE (skala frekuensi) dari jumlah tersebut."""
+    values = np.asarray(values)
+    lo = int(values.min())
+    counts = np.bincount((values - lo).astype(np.intp))
+    return _discrete(np.arange(lo, lo + len(counts)), counts)
+
+
+def _discrete(levels, counts):
+    n = counts.sum()
+    dist = {"kind": "discrete", "n": int(n), "levels": levels, "counts": counts}
+    std = _weighted_std(levels.astype(np.float64), counts.astype(np.float64)) if n > 1 else 0.0
+    if std > 0:
+        bw = _scott(n, std)
+        grid = np.linspace(levels[0] - CUT * bw, levels[-1] + CUT * bw, GRID_SIZE)
+        z = (grid[:, None] - levels[None, :]) / bw
+        density = np.exp(-0.5 * z * z) @ counts / (n * bw * np.sqrt(2 * np.pi))
+        # histogram lebar bin 1 → kurva frekuensi = densitas × n
+        dist.update(grid=grid, kde=density * n)
+    return dist
+
+
+def continuous(values, bins="auto", grid_size=GRID_SIZE):
+    """Histogram + KDE ter-binning (FFT) untuk kolom kontinu."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    n = len(values)
+    counts, edges = np.histogram(values, bins=bins)
+    std = values.std(ddof=1) if n > 1 else 0.0
+    return _continuous(values, None, n, std, counts, edges, grid_size)
+
+
+def _continuous(points, weights, n, std, counts, edges, grid_size):
+    dist = {"kind": "continuous", "n": n, "edges": edges, "counts": counts}
+    if std > 0:
+        bw = _scott(n, std)
+        lo, hi = points.min() - CUT * bw, points.max() + CUT * bw
+        grid = np.linspace(lo, hi, grid_size)
+        delta = grid[1] - grid[0]
+        # Linear binning: massa tiap titik dibagi ke dua titik grid terdekat
+        pos = (points - lo) / delta
+        left = np.clip(np.floor(pos).astype(np.intp), 0, grid_size - 2)
+        frac = pos - left
+        if weights is None:
+            mass = np.bincount(left, 1 - frac, grid_size) + np.bincount(left + 1, frac, grid_size)
+        else:
+            mass = (np.bincount(left, (1 - frac) * weights, grid_size)
+                    + np.bincount(left + 1, frac * weights, grid_size))
+        # Konvolusi dengan kernel Gaussian lewat FFT (zero padding, tanpa wrap-around)
+        half = grid_size - 1
+        offsets = np.arange(-half, half + 1) * delta
+        kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+        size = 1 << int(np.ceil(np.log2(len(mass) + len(kernel) - 1)))
+        conv = np.fft.irfft(np.fft.rfft(mass, size) * np.fft.rfft(kernel, size), size)
+        density = conv[half:half + grid_size] / n
+        binwidth = np.diff(edges).mean()
+        dist.update(grid=grid, kde=np.maximum(density, 0) * n * binwidth)
+    return dist
+
+
+def _auto_edges(sketch):
+    # Tepi bin np.histogram(bins="auto") = min(Freedman–Diaconis, Sturges), dari sketch
+    first, last = sketch.min, sketch.max
+    n = sketch.n
+    q75, q25 = (np.quantile(np.array(b[:2]), b[2]) for b in (sketch.bracket(0.75), sketch.bracket(0.25)))
+    fd = 2.0 * (q75 - q25) * n ** (-1.0 / 3.0)
+    sturges = (last - first) / (np.log2(n) + 1.0)
+    width = min(fd, sturges) if fd else sturges
+    if first == last:
+        first, last = first - 0.5, last + 0.5
+    bins = int(np.ceil((last - first) / width)) if width else 1
+    return np.linspace(first, last, bins + 1, endpoint=True)
+
+
+def from_sketch(sketch, kind, grid_size=GRID_SIZE):
+    """Distribusi dari QuantileSketch kolom ("discrete"/"continuous").
+
+    Mode exact identik dengan discrete()/continuous() atas semua nilai; mode
+    KLL memakai item berbobot sketch (perkiraan).
+    """
+    points, weights = sketch.items()
+    if kind == "discrete":
+        lo = int(points[0])
+        counts = np.bincount((points - lo).astype(np.intp), weights=weights)
+        return _discrete(np.arange(lo, lo + len(counts)), np.rint(counts).astype(np.int64))
+    weights = weights.astype(np.float64)
+    edges = _auto_edges(sketch)
+    counts = np.rint(np.histogram(points, bins=edges, weights=weights)[0]).astype(np.int64)
+    std = _weighted_std(points, weights) if sketch.n > 1 else 0.0
+    return _continuous(points, weights, sketch.n, std, counts, edges, grid_size)
+
+
+def compute(df, target="WORK_LIFE_BALANCE_SCORE"):
+    """Distribusi untuk semua kolom numerik frame."""
+    out = {}
+    for col in df.select_dtypes(include='number').columns:
+        values = df[col].to_numpy()
+        if col != target and values.dtype.kind in "iu":
+            out[col] = discrete(values)
+        else:
+            out[col] = continuous(values)
+    return out
+
+
+def cleaned_distributions(csv_path="datasets_wellbeing.csv"):
+    """Distribusi data hasil cleaning; dihitung sekali per versi dataset."""
+    key = (csv_path, datastore.dataset_version(csv_path))
+    dists = _cache.get(key)
+    if dists is None:
+        with _lock:
+            dists = _cache.get(key)
+            if dists is None:
+                df, _ = cleaning.cleaned_dataset(csv_path)
+                for old in [k for k in _cache if k[0] == csv_path]:
+                    del _cache[old]
+                dists = _cache[key] = compute(df)
+    return dists
+
+
+def draw(ax, dist, color):
+    """Gambar histogram + garis KDE dari distribusi terhitung (pengganti sns.histplot(kde=True))."""
+    if dist["kind"] == "discrete":
+        ax.bar(dist["levels"], dist["counts"], width=1.0, color=color, alpha=0.5, edgecolor="white")
+    else:
+        ax.stairs(dist["counts"], dist["edges"], fill=True, color=color, alpha=0.5)
+        ax.stairs(dist["counts"], dist["edges"], color="white", linewidth=0.5)
+    if "kde" in dist:
+        ax.plot(dist["grid"], dist["kde"], color=color)
+    ax.set_ylabel("Count")
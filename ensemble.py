@@ -0,0 +1,265 @@
+# =============================================================
+# Inferensi terkompilasi untuk stacking_model.pkl (StackingRegressor)
+# =============================================================
+# Setiap base learner di-"flatten" sekali menjadi array NumPy bersebelahan:
+#   - model linear (Ridge/LinearRegression/…) → vektor koef + intercept
+#   - RandomForest / GradientBoosting → semua pohon digabung menjadi satu
+#     array node (fitur, threshold, anak kiri/kanan, nilai daun) + indeks akar
+# Prediksi pohon berjalan serentak untuk semua (baris × pohon): satu langkah
+# turun per level kedalaman, tanpa loop Python per pohon/baris. Daun menunjuk
+# ke dirinya sendiri sehingga langkah ekstra tidak mengubah hasil.
+# Prapemrosesan (Yeo-Johnson + StandardScaler) dan meta-learner linear ikut
+# dikompilasi; hasil diverifikasi terhadap jalur sklearn saat dibangun.
+# Traversal NumPy unggul untuk baris tunggal/batch kecil (tanpa overhead
+# validasi/joblib sklearn), tetapi per baris ~2x lebih lambat dari traversal C
+# sklearn. Batch sebesar SKLEARN_MIN_ROWS / FOREST_MIN_ROWS ke atas diteruskan
+# ke estimator aslinya bila tersedia (bundle.py tanpa pickle tetap terkompilasi).
+import concurrent.futures
+import os
+import threading
+
+import numpy as np
+
+import artifacts
+from features import FEATURES, COL_TO_NORMALIZE
+from inference import _yeo_johnson, sklearn_predict
+
+BLOCK = 1024            # baris per blok traversal pohon (matriks node tetap di cache CPU)
+PARALLEL_MIN = 200_000  # (baris × pohon) minimum sebelum pekerjaan dibagi ke thread pool
+SKLEARN_MIN_ROWS = 256  # baris minimum sebelum GradientBoosting/DecisionTree memakai predict sklearn
+FOREST_MIN_ROWS = 1024  # idem RandomForest/ExtraTrees (predict sklearn punya overhead joblib tetap)
+
+_lock = threading.Lock()
+_cache = {}
+_pool = None
+
+
+def _thread_pool():
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="ensemble",
+                )
+    return _pool
+
+
+class Preprocessor:
+    # PowerTransformer (kolom COL_TO_NORMALIZE) → StandardScaler, sebagai aritmatika NumPy
+    def __init__(self, pt, scaler, columns=FEATURES, normalize=COL_TO_NORMALIZE):
+        if getattr(pt, "method", "yeo-johnson") != "yeo-johnson":
+            raise TypeError(f"PowerTransformer method '{pt.method}' tidak didukung")
+        self.idx = np.array([list(columns).index(c) for c in normalize])
+        self.lambdas = np.asarray(pt.lambdas_, dtype=np.float64)
+        if getattr(pt, "standardize", False):
+            self.pt_mean = np.asarray(pt._scaler.mean_, dtype=np.float64)
+            self.pt_scale = np.asarray(pt._scaler.scale_, dtype=np.float64)
+        else:
+            self.pt_mean = np.zeros(len(self.idx))
+            self.pt_scale = np.ones(len(self.idx))
+        n = len(columns)
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(n)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(n)
+
+    def transform(self, X):
+        Z = np.array(X, dtype=np.float64, ndmin=2)
+        for k, (j, lmbda) in enumerate(zip(self.idx, self.lambdas)):
+            Z[:, j] = (_yeo_johnson(Z[:, j], lmbda) - self.pt_mean[k]) / self.pt_scale[k]
+        Z -= self.mean
+        Z /= self.scale
+        return Z
+
+
+class LinearBase:
+    def __init__(self, model):
+        self.coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+        self.intercept = float(np.ravel(model.intercept_)[0])
+        self.work = 1
+
+    def predict(self, Z, compiled=False):
+        return Z @ self.coef + self.intercept
+
+
+class TreeBase:
+    # Semua pohon satu ensemble dalam array node bersama:
+    #   children[node] = (anak kiri, anak kanan); daun → (node, node)
+    # prediksi = offset + scale × Σ_pohon nilai_daun
+    def __init__(self, trees, scale, offset):
+        features, thresholds, children, values, roots = [], [], [], [], []
+        start = depth = 0
+        for tree in trees:
+            t = tree.tree_
+            if t.n_outputs != 1:
+                raise TypeError("Hanya pohon regresi satu output yang didukung")
+            n = t.node_count
+            leaf = t.children_left == -1
+            node = np.arange(n)
+            left = np.where(leaf, node, t.children_left) + start
+            right = np.where(leaf, node, t.children_right) + start
+            features.append(np.where(leaf, 0, t.feature))
+            thresholds.append(np.where(leaf, np.inf, t.threshold))
+            children.append(np.column_stack([left, right]))
+            values.append(t.value[:, 0, 0])
+            roots.append(start)
+            start += n
+            depth = max(depth, t.max_depth)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.children = np.concatenate(children).astype(np.intp)
+        self._children = self.children.ravel()
+        self.value = np.concatenate(values).astype(np.float64)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.depth = depth
+        self.scale = float(scale)
+        self.offset = float(offset)
+        self.work = len(self.roots)
+        self.estimator = None
+        self.min_rows = None
+
+    @classmethod
+    def from_arrays(cls, feature, threshold, children, value, roots, depth, scale, offset):
+        """TreeBase dari array ter-flatten (mis. view mmap dari bundle.py), tanpa salinan."""
+        self = cls.__new__(cls)
+        self.feature, self.threshold, self.children = feature, threshold, children
+        self._children = children.reshape(-1)
+        self.value, self.roots = value, roots
+        self.depth, self.scale, self.offset = int(depth), float(scale), float(offset)
+        self.work = len(roots)
+        self.estimator = None
+        self.min_rows = None
+        return self
+
+    def predict(self, Z, compiled=False):
+        if not compiled and self.estimator is not None and len(Z) >= self.min_rows:
+            return self.estimator.predict(Z)
+        # sklearn membandingkan X dalam float32 dengan threshold float64
+        Z32 = np.ascontiguousarray(Z, dtype=np.float32)
+        out = np.empty(len(Z32))
+        for start in range(0, len(Z32), BLOCK):
+            out[start:start + BLOCK] = self._predict_block(Z32[start:start + BLOCK])
+        return out
+
+    def _predict_block(self, Z32):
+        n, width = Z32.shape
+        flat = Z32.ravel()
+        base = (np.arange(n, dtype=np.intp) * width)[:, None]
+        node = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+        for _ in range(self.depth):
+            x = flat.take(base + self.feature.take(node))
+            node = self._children.take(2 * node + (x > self.threshold.take(node)))
+        return self.offset + self.scale * self.value.take(node).sum(axis=1)
+
+
+def compile_base(est):
+    """Base learner sklearn → LinearBase / TreeBase."""
+    name = type(est).__name__
+    if hasattr(est, "coef_") and hasattr(est, "intercept_"):
+        return LinearBase(est)
+    if name in ("RandomForestRegressor", "ExtraTreesRegressor"):
+        return _with_estimator(TreeBase(est.estimators_, 1.0 / len(est.estimators_), 0.0), est, FOREST_MIN_ROWS)
+    if name == "DecisionTreeRegressor":
+        return _with_estimator(TreeBase([est], 1.0, 0.0), est, SKLEARN_MIN_ROWS)
+    if name == "GradientBoostingRegressor":
+        if getattr(est, "loss", "squared_error") != "squared_error":
+            raise TypeError(f"Loss GradientBoosting '{est.loss}' tidak didukung")
+        init = est.init_
+        if init == "zero":
+            offset = 0.0
+        elif hasattr(init, "constant_"):
+            offset = float(np.ravel(init.constant_)[0])
+        else:
+            raise TypeError(f"Init GradientBoosting {type(init).__name__} tidak didukung")
+        return _with_estimator(TreeBase(est.estimators_[:, 0], est.learning_rate, offset), est, SKLEARN_MIN_ROWS)
+    raise TypeError(f"Base learner {name} tidak bisa dikompilasi")
+
+
+def _with_estimator(base, est, min_rows):
+    base.estimator, base.min_rows = est, min_rows
+    return base
+
+
+class CompiledEnsemble:
+    def __init__(self, model, pt, scaler):
+        if type(model).__name__ != "StackingRegressor":
+            raise TypeError(f"{type(model).__name__} bukan StackingRegressor")
+        if list(getattr(model, "stack_method_", [])) != ["predict"] * len(model.estimators_):
+            raise TypeError("Hanya stack_method 'predict' yang didukung")
+        meta = model.final_estimator_
+        if not hasattr(meta, "coef_"):
+            raise TypeError(f"Meta-learner {type(meta).__name__} bukan model linear")
+        self.preprocess = Preprocessor(pt, scaler)
+        self.bases = [compile_base(est) for est in model.estimators_ if est != "drop"]
+        self.meta_coef = np.asarray(meta.coef_, dtype=np.float64).ravel()
+        self.meta_intercept = float(np.ravel(meta.intercept_)[0])
+        self.passthrough = bool(model.passthrough)
+
+    @classmethod
+    def from_parts(cls, preprocess, bases, meta_coef, meta_intercept, passthrough=False):
+        self = cls.__new__(cls)
+        self.preprocess = preprocess
+        self.bases = list(bases)
+        self.meta_coef = meta_coef
+        self.meta_intercept = float(meta_intercept)
+        self.passthrough = bool(passthrough)
+        return self
+
+    def base_predictions(self, Z, workers=None, compiled=False):
+        """Matriks (n, jumlah base learner) prediksi base learner atas input ter-transform.
+
+        Untuk batch besar, pasangan (base learner × blok baris) dibagi ke thread
+        pool; operasi take/ufunc NumPy melepas GIL sehingga berjalan paralel.
+        compiled=True memaksa traversal NumPy walau estimator sklearn tersedia.
+        """
+        if workers is None:
+            workers = (os.cpu_count() or 1) > 1 and len(Z) * sum(b.work for b in self.bases) >= PARALLEL_MIN
+        out = np.empty((len(Z), len(self.bases)))
+        if not workers:
+            for j, b in enumerate(self.bases):
+                out[:, j] = b.predict(Z, compiled)
+            return out
+        step = max(BLOCK, -(-len(Z) // (os.cpu_count() or 1)))
+        tasks = [(j, s) for j in range(len(self.bases)) for s in range(0, len(Z), step)]
+
+        def run(task):
+            j, s = task
+            out[s:s + step, j] = self.bases[j].predict(Z[s:s + step], compiled)
+
+        list(_thread_pool().map(run, tasks))
+        return out
+
+    def predict(self, X, workers=None, compiled=False):
+        """Skor untuk matriks (n, 22) atau satu vektor (22,) berisi kode mentah."""
+        Z = self.preprocess.transform(X)
+        meta_X = self.base_predictions(Z, workers, compiled)
+        if self.passthrough:
+            meta_X = np.hstack([meta_X, Z])
+        return meta_X @ self.meta_coef + self.meta_intercept
+
+    def predict_one(self, values):
+        return float(self.predict(np.asarray(values, dtype=np.float64)[None, :], workers=False)[0])
+
+    def verify(self, model, pt, scaler, X=None, rtol=1e-9, atol=1e-7):
+        # Bandingkan dengan jalur sklearn pada sampel kode 0..10
+        if X is None:
+            rng = np.random.default_rng(0)
+            X = rng.integers(0, 11, size=(256, len(FEATURES))).astype(np.float64)
+        expected = sklearn_predict(model, pt, scaler, X)
+        got = self.predict(X, compiled=True)
+        if not np.allclose(got, expected, rtol=rtol, atol=atol):
+            raise AssertionError(f"Ensemble terkompilasi menyimpang dari sklearn (maks {np.max(np.abs(got - expected)):.3g})")
+
+
+def ensemble(model_path="stacking_model.pkl", pt_path="power_transfromer.pkl", scaler_path="scaler.pkl"):
+    """CompiledEnsemble bersama per proses, dibangun ulang (dan diverifikasi) bila artifact berubah."""
+    objs = (artifacts.load(model_path), artifacts.load(pt_path), artifacts.load(scaler_path))
+    key = (model_path, pt_path, scaler_path)
+    entry = _cache.get(key)
+    if entry is None or any(a is not b for a, b in zip(entry[0], objs)):
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None or any(a is not b for a, b in zip(entry[0], objs)):
+                compiled = CompiledEnsemble(*objs)
+                compiled.verify(*objs)
+                entry = _cache[key] = (objs, compiled)
+    return entry[1]
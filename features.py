@@ -0,0 +1,534 @@
+# =============================================================
+# Definisi fitur ─ urutan kolom yang dipakai saat model dilatih
+# =============================================================
+# Urutan ini sama dengan `scaler.feature_names_in_` dan dict `input_data`
+# di show_prediction(); semua jalur inferensi memakai urutan yang sama.
+import collections
+
+FEATURES = [
+    "FRUITS_VEGGIES",
+    "DAILY_STRESS",
+    "PLACES_VISITED",
+    "CORE_CIRCLE",
+    "SUPPORTING_OTHERS",
+    "SOCIAL_NETWORK",
+    "ACHIEVEMENT",
+    "DONATION",
+    "BMI_RANGE",
+    "TODO_COMPLETED",
+    "FLOW",
+    "DAILY_STEPS",
+    "LIVE_VISION",
+    "SLEEP_HOURS",
+    "LOST_VACATION",
+    "DAILY_SHOUTING",
+    "SUFFICIENT_INCOME",
+    "PERSONAL_AWARDS",
+    "TIME_FOR_PASSION",
+    "WEEKLY_MEDITATION",
+    "AGE",
+    "GENDER",
+]
+
+# Kolom yang dinormalisasi dengan PowerTransformer (Yeo-Johnson)
+COL_TO_NORMALIZE = ['ACHIEVEMENT', 'FLOW', 'LIVE_VISION', 'LOST_VACATION', 'DAILY_SHOUTING', 'SUFFICIENT_INCOME', 'TIME_FOR_PASSION']
+
+TARGET = "WORK_LIFE_BALANCE_SCORE"
+
+# Encoding AGE & GENDER, sama dengan age_mapping / gender_numeric di show_prediction()
+AGE_MAPPING = {
+    "36 to 50": 2,
+    "51 or more": 3,
+    "21 to 35": 1,
+    "Less than 20": 0,
+}
+GENDER_NUMERIC = {
+    "Male": 0,
+    "Female": 1,
+    "Other": 2
+}
+
+
+# =============================================================
+# Skema pertanyaan form prediksi ─ dibangun sekali saat import
+# =============================================================
+# Satu sumber untuk widget di show_prediction(), encoding `input_data`,
+# dan encoder vektor jawaban survei mentah (label → kode) untuk bulk ingest.
+#   widget : "radio" atau "select_slider"
+#   options: label jawaban → kode model (urutan = urutan opsi di widget)
+#   echo   : teks konfirmasi pilihan; mapped: teks "Mapped ... Level:" (opsional)
+#   column : kolom layout (1 = kiri, 2 = kanan)
+Question = collections.namedtuple(
+    "Question", ["feature", "prompt", "widget", "options", "help", "echo", "mapped", "column"],
+    defaults=[None, "selected", None, 1],
+)
+
+QUESTIONS = [
+    Question(
+        feature="FRUITS_VEGGIES",
+        prompt="**1. How Many Fruits Or Vegetables Do You Eat Everyday?**",
+        widget="radio",
+        options={
+            "never (0 servings)": 0,
+            "Almost never (1 servings)": 1,
+            "Rarely (2 serving)": 2,
+            "Occasionally (3 servings)": 3,
+            "Often (4 servings)": 4,
+            "Very often (5 or more servings)": 5,
+        },
+        echo="You selected",
+        column=1,
+    ),
+    Question(
+        feature="DAILY_STRESS",
+        prompt="**2. How Much Stress Do You Typically Experience Everyday?**",
+        widget="radio",
+        options={
+            "Not at all stressful": 0,
+            "Slightly stressful": 1,
+            "Somewhat stressful": 2,
+            "Moderately stressful": 3,
+            "Very stressful": 4,
+            "Extremely stressful": 5,
+        },
+        echo="You selected:",
+        column=1,
+    ),
+    Question(
+        feature="PLACES_VISITED",
+        prompt="**3. How Many New Places Do You Visit In a Month?**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "More than 10": 10,
+        },
+        echo="selected",
+        mapped="Mapped Places Visited Level:",
+        column=1,
+    ),
+    Question(
+        feature="CORE_CIRCLE",
+        prompt="**4. How Many People That Are Very Close To You?**",
+        widget="select_slider",
+        options={
+            "No one": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "Large close circle": 10,
+        },
+        echo="selected",
+        mapped="Mapped Core Circle Level:",
+        column=1,
+    ),
+    Question(
+        feature="SUPPORTING_OTHERS",
+        prompt="**5. How Many People Do You Help to Achieve a Better Life??**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "Many people (more than 10)": 10,
+        },
+        echo="selected",
+        mapped="Mapped Supporting Others Level:",
+        column=1,
+    ),
+    Question(
+        feature="SOCIAL_NETWORK",
+        prompt="**6. With How Many People do You Interact With During the Day?**",
+        widget="select_slider",
+        options={
+            "No interactions at all": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "A Lot of interactions": 10,
+        },
+        echo="selected",
+        mapped="Mapped Social Network Level:",
+        column=1,
+    ),
+    Question(
+        feature="ACHIEVEMENT",
+        prompt="**7. How Many Remarkable Achievements Are You Proud of?**",
+        widget="select_slider",
+        options={
+            "No achievements": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "Many achievements (more than 10)": 10,
+        },
+        echo="selected",
+        mapped="Mapped Achievements Level:",
+        column=1,
+    ),
+    Question(
+        feature="DONATION",
+        prompt="**8. How Many Times do You Donate Your Time or Money for a Good Causes?**",
+        widget="radio",
+        options={
+            "Never": 0,
+            "Almost never": 1,
+            "Rarely": 2,
+            "Often": 3,
+            "Very often": 4,
+            "Always": 5,
+        },
+        echo="selected",
+        mapped="Mapped Donations Level:",
+        column=1,
+    ),
+    Question(
+        feature="BMI_RANGE",
+        prompt="**9. What  Is Your Body Mass Index (BMI) Range?**",
+        widget="radio",
+        options={
+            "Underweight to  normal weight ( Less than 18.5 untill 24.9)": 1,
+            "Overweight to Obesity (25 until 29.9 or more)": 2,
+        },
+        echo="selected",
+        mapped="Mapped BMI Range Level:",
+        column=1,
+    ),
+    Question(
+        feature="TODO_COMPLETED",
+        prompt="**10. Rate How Well Do You Complete Your Weekly To-Do Lists?**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "Always (10)": 10,
+        },
+        echo="selected",
+        mapped="Mapped To Do Completition Level:",
+        column=2,
+    ),
+    Question(
+        feature="FLOW",
+        prompt="**11. In a typical day, how many hours do you experience ‘flow’?**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "More than 10": 10,
+        },
+        help="*(Flow is a state of total immersion in an activity—often called being “in the zone.)*",
+        echo="selected",
+        mapped="Mapped Flow Level:",
+        column=2,
+    ),
+    Question(
+        feature="DAILY_STEPS",
+        prompt="**12. How Many Steps Do You Walk In a Day?**",
+        widget="select_slider",
+        options={
+            "None": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "More than 10": 10,
+        },
+        help="*(measured in units of thousands.)*",
+        echo="selected",
+        mapped="Mapped Steps Level:",
+        column=2,
+    ),
+    Question(
+        feature="LIVE_VISION",
+        prompt="**13. For how many years ahead is your life vision very clear?**",
+        widget="select_slider",
+        options={
+            "No clarity beyond today": 0,
+            "few weeks": 1,
+            "1 months": 2,
+            "2-3 month": 3,
+            "6 months": 4,
+            "1 year": 5,
+            "2 years": 6,
+            "3–5 years": 7,
+            "6–9 years": 8,
+            "9–10 years": 9,
+            "More than 10 years": 10,
+        },
+        help="*(measured in units of hours.)*",
+        echo="selected",
+        mapped="Mapped Vision Level:",
+        column=2,
+    ),
+    Question(
+        feature="SLEEP_HOURS",
+        prompt="**14. About how long do you typically sleep each night?**",
+        widget="select_slider",
+        options={
+            "Not sleeping at all": 0,
+            "1 hours": 1,
+            "2 hours": 2,
+            "3 hours": 3,
+            "4 hours": 4,
+            "5 hours": 5,
+            "6 hours": 6,
+            "7 hours": 7,
+            "8 hours": 8,
+            "9 hours": 9,
+            "More than 9 hours": 10,
+        },
+        help="*(measured in units of hours.)*",
+        echo="selected",
+        mapped="Mapped Sleep Level:",
+        column=2,
+    ),
+    Question(
+        feature="LOST_VACATION",
+        prompt="**15. How Many Days Do You Typicallly Lose Every Year?**",
+        widget="select_slider",
+        options={
+            "0 day": 0,
+            "1 day": 1,
+            "2 days": 2,
+            "3 days": 3,
+            "4-5 days": 4,
+            "6-7 days": 5,
+            "8-9 days": 6,
+            "10-12 days": 7,
+            "13-15 days": 8,
+            "14-16 days": 9,
+            "more than 16 days": 10,
+        },
+        help="*(measured in units of days.)*",
+        echo="selected",
+        mapped="Mapped Lost Vacation Level:",
+        column=2,
+    ),
+    Question(
+        feature="DAILY_SHOUTING",
+        prompt="**16. How Many Times Do You Shout or Yell?**",
+        widget="select_slider",
+        options={
+            "Never": 0,
+            "Almost never shout or sulk": 1,
+            "Very rarely (a few times a year)": 2,
+            "Rarely (once a month or less)": 3,
+            "Occasionally (2–3 times a month)": 4,
+            "Sometimes (about once a week)": 5,
+            "Fairly often (2–3 times a week)": 6,
+            "Often (4–5 times a week)": 7,
+            "Very often (nearly every day)": 8,
+            "Almost always (multiple times daily": 9,
+            "Constantly shout or sulk": 10,
+        },
+        help="*(measured in units of times.)*",
+        echo="selected",
+        mapped="Mapped Shout Level:",
+        column=2,
+    ),
+    Question(
+        feature="SUFFICIENT_INCOME",
+        prompt="**17. How sufficient is your income to cover your basic life expenses?**",
+        widget="radio",
+        options={
+            "Sufficient": 1,
+            "Not sufficient": 2,
+        },
+        echo="selected",
+        mapped="Mapped Sufficient Income Level:",
+        column=2,
+    ),
+    Question(
+        feature="PERSONAL_AWARDS",
+        prompt="**18. How Many Personal Awards Do You Have?**",
+        widget="select_slider",
+        options={
+            "none": 0,
+            "1": 1,
+            "2": 2,
+            "3-5": 3,
+            "6-9": 4,
+            "10-14": 5,
+            "15-19": 6,
+            "20-24": 7,
+            "25-29": 8,
+            "30-35": 9,
+            "more than 35": 10,
+        },
+        help="*(Here, “recognitions” refers to any formal or informal acknowledgements you’ve received—such as awards, certificates, public praise, or other expressions of appreciation for your achievements or contributions.)*",
+        echo="selected",
+        mapped="Mapped Personal Award Level:",
+        column=2,
+    ),
+    Question(
+        feature="TIME_FOR_PASSION",
+        prompt="**19. How Many Hours Do You Spend Everyday On Your Passion?**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "More than 10": 10,
+        },
+        help="*(measured in units of hours.)*",
+        echo="selected",
+        mapped="Mapped Time For Passion Level:",
+        column=2,
+    ),
+    Question(
+        feature="WEEKLY_MEDITATION",
+        prompt="**20. How Many Times Do You Meditate In a Week?**",
+        widget="select_slider",
+        options={
+            "never": 0,
+            "1": 1,
+            "2": 2,
+            "3": 3,
+            "4": 4,
+            "5": 5,
+            "6": 6,
+            "7": 7,
+            "8": 8,
+            "9": 9,
+            "More than 10": 10,
+        },
+        help="*(measured in units of times.)*",
+        echo="selected",
+        mapped="Mapped Weekly Meditate Level:",
+        column=2,
+    ),
+]
+
+# label → kode untuk semua kolom berlabel, termasuk AGE & GENDER
+LABEL_CODES = {q.feature: q.options for q in QUESTIONS}
+LABEL_CODES["AGE"] = AGE_MAPPING
+LABEL_CODES["GENDER"] = GENDER_NUMERIC
+# Kode yang sah per fitur (opsi form); input di luar ini ditolak encode_record
+VALID_CODES = {f: frozenset(options.values()) for f, options in LABEL_CODES.items()}
+
+
+def scale_value(x, old_min=480, old_max=780, new_min=1, new_max=100):
+    # Skala skor WLB mentah (480–780) ke rentang 1–100; bekerja untuk skalar maupun array
+    scaled = ((x - old_min) / (old_max - old_min)) * (new_max - new_min) + new_min
+    return scaled
+
+
+def encode_record(record):
+    """Ubah satu dict jawaban (kunci = FEATURES) menjadi list 22 kode.
+
+    AGE/GENDER boleh berupa label ("36 to 50", "Female") atau kode angka.
+    """
+    values = []
+    for col in FEATURES:
+        if col not in record:
+            raise KeyError(f"Fitur '{col}' tidak ada")
+        v = record[col]
+        if col == "AGE" and isinstance(v, str):
+            v = AGE_MAPPING[v]
+        elif col == "GENDER" and isinstance(v, str):
+            v = GENDER_NUMERIC[v]
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise ValueError(f"Nilai '{col}' harus berupa angka, bukan {v!r}")
+        # Cek keanggotaan (bukan math.isfinite): NaN, ±Infinity, 1e300 dan int raksasa
+        # semuanya ditolak tanpa OverflowError dan tanpa overflow di PowerTransformer
+        if v not in VALID_CODES[col]:
+            raise ValueError(f"Nilai '{col}' harus salah satu dari {sorted(VALID_CODES[col])}, bukan {v!r}")
+        values.append(v)
+    return values
+
+
+def encode_labels(values, feature):
+    """Encode satu kolom jawaban secara vektor: label form → kode, angka/teks angka tetap.
+
+    Nilai yang bukan label dan bukan angka menjadi NaN.
+    """
+    import numpy as np
+    import pandas as pd
+
+    s = pd.Series(values, copy=False)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.to_numpy(dtype=np.float64, na_value=np.nan)
+    mapping = LABEL_CODES.get(feature, {})
+    # Lookup lewat kode kategori: satu hash per nilai unik, sisanya indexing array
+    cat = pd.Categorical(s, categories=list(mapping))
+    lut = np.array(list(mapping.values()) + [np.nan], dtype=np.float64)
+    out = lut[cat.codes]
+    missing = np.isnan(out)
+    if missing.any():
+        out[missing] = pd.to_numeric(s[missing], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return out
+
+
+def encode_frame(df):
+    """Ubah DataFrame berskema datasets_wellbeing.csv menjadi matriks kode (n, 22).
+
+    Kolom boleh berisi kode angka atau label jawaban form (termasuk AGE/GENDER);
+    nilai yang tidak dikenal atau kosong menjadi NaN sehingga bisa disaring pemanggil.
+    """
+    import numpy as np
+
+    out = np.empty((len(df), len(FEATURES)), dtype=np.float64)
+    for j, col in enumerate(FEATURES):
+        out[:, j] = encode_labels(df[col], col)
+    return out
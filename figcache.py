@@ -0,0 +1,93 @@
+# =============================================================
+# Cache gambar chart EDA (LRU, dibatasi ukuran byte)
+# =============================================================
+# Setiap chart seaborn dirender sekali per (jenis chart, fitur, versi
+# dataset), disimpan sebagai PNG, lalu figure matplotlib langsung ditutup.
+# Pergantian fitur di selectbox cukup berupa lookup dict + st.image.
+import collections
+import io
+import threading
+
+import matplotlib.pyplot as plt
+
+import telemetry
+
+# Sama dengan default savefig st.pyplot
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+class FigureCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # pyplot memakai state global; render dari beberapa sesi harus serial
+        self._render_lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, render, span="chart.render"):
+        """PNG (bytes) untuk `key`; `render()` dipanggil hanya saat cache miss dan harus mengembalikan Figure."""
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return png
+        with self._render_lock:
+            with self._lock:
+                png = self._items.get(key)
+                if png is not None:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return png
+            # Span mencakup render matplotlib/seaborn + encode PNG
+            with telemetry.span(span):
+                fig = render()
+                try:
+                    buf = io.BytesIO()
+                    fig.savefig(buf, **SAVEFIG_OPTIONS)
+                    png = buf.getvalue()
+                finally:
+                    plt.close(fig)
+        with self._lock:
+            self.misses += 1
+            if key not in self._items:
+                self._items[key] = png
+                self._bytes += len(png)
+                self._evict()
+        return png
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            _, png = self._items.popitem(last=False)
+            self._bytes -= len(png)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_default = FigureCache()
+
+
+def chart(kind, feature, version, render):
+    """PNG dari cache proses untuk chart `kind` atas `feature` pada versi dataset `version`."""
+    return _default.get((kind, feature, version), render, f"chart.{kind}")
+
+
+def stats():
+    return _default.stats()
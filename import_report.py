@@ -0,0 +1,87 @@
+# =============================================================
+# Laporan cold start per halaman Home.py
+# =============================================================
+# Setiap halaman dijalankan sekali di interpreter baru (subprocess) lewat
+# streamlit.testing AppTest, sehingga waktu yang terukur adalah biaya
+# cold start sebenarnya: import + eksekusi skrip pertama kali.
+#
+#   python import_report.py                          # Home.py saat ini
+#   git show <rev>:Home.py > /tmp/Home_lama.py
+#   python import_report.py --baseline /tmp/Home_lama.py   # sebelum vs sesudah
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PAGES = ["🏠 Home", "📊 EDA", "📈 Health Prediction", "🌿 Well-Being Tips"]
+HEAVY = ["pandas", "numpy", "matplotlib", "seaborn", "scipy", "sklearn", "joblib"]
+
+
+def _child(script, page):
+    t0 = time.perf_counter()
+    import streamlit  # noqa: F401  (biaya dasar yang sama untuk semua halaman)
+    from streamlit.testing.v1 import AppTest
+    t_streamlit = time.perf_counter() - t0
+
+    at = AppTest.from_file(os.path.abspath(script), default_timeout=600)
+    at.session_state["current_page"] = page
+    t1 = time.perf_counter()
+    at.run()
+    t_run = time.perf_counter() - t1
+    print(json.dumps({
+        "page": page,
+        "streamlit_s": round(t_streamlit, 3),
+        "first_run_s": round(t_run, 3),
+        "heavy_modules": [m for m in HEAVY if m in sys.modules],
+        "exception": str(at.exception[0].message) if at.exception else None,
+    }))
+
+
+def measure(script):
+    rows = []
+    for page in PAGES:
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", script, page],
+            capture_output=True, text=True, check=True,
+        )
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ukur cold start per halaman Home.py.")
+    parser.add_argument("--script", default="Home.py", help="skrip Streamlit yang diukur")
+    parser.add_argument("--baseline", help="versi Home.py lama sebagai pembanding")
+    parser.add_argument("--json", action="store_true", help="cetak hasil mentah sebagai JSON")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    after = measure(args.script)
+    before = measure(args.baseline) if args.baseline else None
+    if args.json:
+        print(json.dumps({"after": after, "before": before}, indent=1, ensure_ascii=False))
+        return
+
+    print(f"{'halaman':<24}{'sebelum (s)':>12}{'sesudah (s)':>12}  modul berat (sesudah)")
+    failed = False
+    for i, row in enumerate(after):
+        prev = f"{before[i]['first_run_s']:.3f}" if before else "-"
+        note = ""
+        # Halaman yang berhenti karena exception tidak mengukur apa pun → tandai dan gagal
+        for label, r in (("sesudah", row), ("sebelum", before[i] if before else None)):
+            if r is not None and r["exception"]:
+                note += f"  ⚠ {label}: {r['exception']}"
+                failed = True
+        print(f"{row['page']:<24}{prev:>12}{row['first_run_s']:>12.3f}  {', '.join(row['heavy_modules']) or '-'}{note}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
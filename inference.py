@@ -0,0 +1,214 @@
+# =============================================================
+# Inferensi terkompilasi ─ PowerTransformer → StandardScaler → LinearRegression
+# =============================================================
+# Parameter hasil fit (lambda Yeo-Johnson, mean/scale, koefisien) dibaca
+# sekali, lalu seluruh rantai dilebur menjadi aritmatika NumPy biasa:
+#
+#   skor = b + Σ w_j · x_j  +  Σ v_k · yeojohnson(x_k; λ_k)
+#
+# tanpa DataFrame, tanpa copy, dan tanpa validasi sklearn per panggilan.
+import math
+import threading
+
+import numpy as np
+
+import artifacts
+from features import FEATURES, COL_TO_NORMALIZE
+
+
+def _yeo_johnson(x, lmbda):
+    # Sama persis dengan PowerTransformer._yeo_johnson_transform
+    out = np.zeros_like(x)
+    pos = x >= 0
+    if abs(lmbda) < np.spacing(1.0):
+        out[pos] = np.log1p(x[pos])
+    else:
+        out[pos] = (np.power(x[pos] + 1, lmbda) - 1) / lmbda
+    if abs(lmbda - 2) > np.spacing(1.0):
+        out[~pos] = -(np.power(-x[~pos] + 1, 2 - lmbda) - 1) / (2 - lmbda)
+    else:
+        out[~pos] = -np.log1p(-x[~pos])
+    return out
+
+
+def _yeo_johnson_scalar(x, lmbda):
+    if x >= 0:
+        if abs(lmbda) < 2.220446049250313e-16:
+            return math.log1p(x)
+        return ((x + 1) ** lmbda - 1) / lmbda
+    if abs(lmbda - 2) > 2.220446049250313e-16:
+        return -((1 - x) ** (2 - lmbda) - 1) / (2 - lmbda)
+    return -math.log1p(-x)
+
+
+def sklearn_predict(model, pt, scaler, X):
+    # Jalur referensi: identik dengan kode lama di show_prediction()
+    import pandas as pd
+
+    df = pd.DataFrame(np.atleast_2d(X), columns=FEATURES)
+    df[COL_TO_NORMALIZE] = pt.transform(df[COL_TO_NORMALIZE])
+    return model.predict(scaler.transform(df))
+
+
+class CompiledPipeline:
+    def __init__(self, model, pt, scaler, columns=FEATURES, normalize=COL_TO_NORMALIZE):
+        if not hasattr(model, "coef_") or not hasattr(model, "intercept_"):
+            raise TypeError(f"{type(model).__name__} bukan model linear; tidak bisa dikompilasi")
+        if getattr(pt, "method", "yeo-johnson") != "yeo-johnson":
+            raise TypeError(f"PowerTransformer method '{pt.method}' tidak didukung")
+        names = getattr(scaler, "feature_names_in_", None)
+        if names is not None and list(names) != list(columns):
+            raise ValueError("Urutan kolom scaler berbeda dengan FEATURES")
+        names = getattr(pt, "feature_names_in_", None)
+        if names is not None and list(names) != list(normalize):
+            raise ValueError("Urutan kolom PowerTransformer berbeda dengan COL_TO_NORMALIZE")
+
+        self.columns = list(columns)
+        self.normalize = list(normalize)
+        self.idx = np.array([self.columns.index(c) for c in self.normalize])
+        self.lambdas = np.asarray(pt.lambdas_, dtype=np.float64)
+
+        coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+        intercept = float(np.ravel(model.intercept_)[0])
+        mean = np.asarray(scaler.mean_, dtype=np.float64) if scaler.with_mean else np.zeros(len(coef))
+        scale = np.asarray(scaler.scale_, dtype=np.float64) if scaler.with_std else np.ones(len(coef))
+
+        # StandardScaler + LinearRegression → satu vektor bobot dan bias
+        w = coef / scale
+        bias = intercept - float(np.dot(mean, w))
+
+        # Standardisasi internal PowerTransformer ikut dilebur ke bobot kolom YJ
+        if getattr(pt, "standardize", False):
+            pt_mean = np.asarray(pt._scaler.mean_, dtype=np.float64)
+            pt_scale = np.asarray(pt._scaler.scale_, dtype=np.float64)
+            v = w[self.idx] / pt_scale
+            bias -= float(np.dot(pt_mean, v))
+        else:
+            v = w[self.idx].copy()
+        w = w.copy()
+        w[self.idx] = 0.0
+
+        self.weights = w
+        self.yj_weights = v
+        self.bias = bias
+        # Versi list Python untuk jalur satu baris (lebih cepat dari NumPy di n=22)
+        self._w = w.tolist()
+        self._yj = list(zip(self.idx.tolist(), self.lambdas.tolist(), v.tolist()))
+
+    def predict(self, X):
+        """Skor untuk matriks (n, 22) atau satu vektor (22,) berisi kode mentah."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        out = X @ self.weights + self.bias
+        for k, (j, lmbda) in enumerate(zip(self.idx, self.lambdas)):
+            out += self.yj_weights[k] * _yeo_johnson(X[:, j], lmbda)
+        return out
+
+    def predict_one(self, values):
+        """Skor satu responden dari list/tuple 22 kode, dalam urutan FEATURES."""
+        total = self.bias
+        for w, x in zip(self._w, values):
+            total += w * x
+        for j, lmbda, v in self._yj:
+            total += v * _yeo_johnson_scalar(values[j], lmbda)
+        return total
+
+    def verify(self, model, pt, scaler, X=None, rtol=1e-9, atol=1e-7):
+        # Bandingkan dengan jalur sklearn pada sampel kode 0..10
+        if X is None:
+            rng = np.random.default_rng(0)
+            X = rng.integers(0, 11, size=(64, len(self.columns))).astype(np.float64)
+        expected = sklearn_predict(model, pt, scaler, X)
+        got = self.predict(X)
+        if not np.allclose(got, expected, rtol=rtol, atol=atol):
+            raise AssertionError(f"Kernel terkompilasi menyimpang dari sklearn (maks {np.max(np.abs(got - expected)):.3g})")
+        got_one = np.array([self.predict_one(row) for row in X.tolist()])
+        if not np.allclose(got_one, expected, rtol=rtol, atol=atol):
+            raise AssertionError("predict_one menyimpang dari sklearn")
+
+
+class LookupScorer:
+    # Semua input form berupa kode integer kecil (0–10), dan rantai model
+    # bersifat aditif per fitur. Kontribusi tiap fitur untuk tiap level bisa
+    # dihitung di muka: prediksi = bias + 22 lookup tabel.
+    def __init__(self, pipeline, levels=11):
+        self.pipeline = pipeline
+        self.levels = levels
+        grid = np.arange(levels, dtype=np.float64)
+        table = np.outer(pipeline.weights, grid)
+        for k, (j, lmbda) in enumerate(zip(pipeline.idx, pipeline.lambdas)):
+            table[j] += pipeline.yj_weights[k] * _yeo_johnson(grid, lmbda)
+        table.flags.writeable = False
+        self.table = table
+        self.bias = pipeline.bias
+        self._flat = table.ravel()
+        self._offsets = np.arange(len(pipeline.columns)) * levels
+        self._ones = np.ones(len(pipeline.columns))
+        self._rows = table.tolist()
+
+    def predict(self, X):
+        """Seperti CompiledPipeline.predict; baris di luar tabel dihitung lewat kernel."""
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.dtype.kind in "iu" and len(X) and X.min() >= 0 and X.max() < self.levels:
+            return self._gather(X)
+        with np.errstate(invalid="ignore"):
+            codes = X.astype(np.intp)
+            inside = ((codes == X) & (codes >= 0) & (codes < self.levels)).all(axis=1)
+        out = np.empty(len(X))
+        out[inside] = self._gather(codes[inside])
+        out[~inside] = self.pipeline.predict(X[~inside])
+        return out
+
+    def _gather(self, codes):
+        return np.take(self._flat, codes + self._offsets) @ self._ones + self.bias
+
+    def predict_one(self, values):
+        try:
+            if min(values) >= 0:
+                return self.bias + sum(map(list.__getitem__, self._rows, values))
+        except (IndexError, TypeError):
+            pass
+        # Kode di luar tabel (atau bukan integer) → kernel biasa
+        return self.pipeline.predict_one(values)
+
+
+_lock = threading.Lock()
+_compiled = {}
+_lookups = {}
+
+
+def compiled(model_path="linear_regression.pkl", pt_path="power_transfromer.pkl", scaler_path="scaler.pkl"):
+    """CompiledPipeline bersama per proses, dibangun ulang bila artifact berubah."""
+    # artifacts.load mengembalikan objek yang sama selama file tidak berubah,
+    # jadi identitas objek cukup sebagai kunci versi.
+    objs = (artifacts.load(model_path), artifacts.load(pt_path), artifacts.load(scaler_path))
+    key = (model_path, pt_path, scaler_path)
+    entry = _compiled.get(key)
+    if entry is None or any(a is not b for a, b in zip(entry[0], objs)):
+        with _lock:
+            entry = _compiled.get(key)
+            if entry is None or any(a is not b for a, b in zip(entry[0], objs)):
+                pipe = CompiledPipeline(*objs)
+                pipe.verify(*objs)
+                entry = _compiled[key] = (objs, pipe)
+    return entry[1]
+
+
+def lookup(model_path="linear_regression.pkl", pt_path="power_transfromer.pkl", scaler_path="scaler.pkl"):
+    """LookupScorer bersama per proses; ikut dibangun ulang saat kernel dibangun ulang."""
+    pipe = compiled(model_path, pt_path, scaler_path)
+    scorer = _lookups.get(id(pipe))
+    if scorer is None or scorer.pipeline is not pipe:
+        with _lock:
+            scorer = _lookups.get(id(pipe))
+            if scorer is None or scorer.pipeline is not pipe:
+                scorer = LookupScorer(pipe)
+                grid = np.indices((scorer.levels,)).repeat(len(pipe.columns), axis=0).T
+                if not np.allclose(scorer.predict(grid.astype(np.float64)), pipe.predict(grid), rtol=1e-12, atol=1e-9):
+                    raise AssertionError("Tabel lookup menyimpang dari kernel terkompilasi")
+                _lookups.clear()
+                _lookups[id(pipe)] = scorer
+    return scorer
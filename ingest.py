@@ -0,0 +1,415 @@
+# =============================================================
+# Ingest inkremental respons survei + statistik berjalan
+# =============================================================
+# Contoh:
+#   python ingest.py export_harian.csv            # tambahkan ke datasets_wellbeing.csv
+#   python ingest.py --summary                    # ringkasan statistik berjalan (JSON)
+#   python ingest.py --rebuild                    # hitung ulang dari CSV penuh
+#
+# Statistik dihitung atas baris "dropna → drop_duplicates" (tanpa Timestamp),
+# sama dengan dua langkah pertama cleaning.py:
+#   - jumlah sel kosong & baris duplikat (hash 64-bit per baris dalam shard
+#     uint64 terurut; tabrakan hash diabaikan)
+#   - kolom numerik: count, mean, M2 (Welford/Chan, digabung per chunk), min, max
+#   - co-moment setiap kolom numerik dengan WORK_LIFE_BALANCE_SCORE → korelasi
+#   - kolom kategorik: jumlah per kategori
+#   - QuantileSketch per kolom numerik (sketches.py) → kuartil describe() dan
+#     batas outlier IQR tanpa membaca ulang CSV
+# Setiap append hanya memproses baris baru (O(baris baru)); status disimpan di
+# .cache/<dataset>.stats/ bersama ukuran & mtime CSV. Bila CSV diubah di luar
+# ingest, status dibangun ulang dari CSV secara streaming per chunk.
+# Hash disimpan sebagai shard .npy yang tidak pernah diubah: hash baru menjadi
+# shard baru, digabung dengan shard sebelumnya bila ukurannya sudah ≥ separuhnya
+# (ukuran shard menurun geometris, jadi O(log n) shard dan setiap hash ditulis
+# ulang O(log n) kali). Append hanya menulis shard baru/hasil gabungan dan
+# meta.json (momen, sketch, jumlah kategori), bukan seluruh himpunan hash.
+# Skema (kolom numerik vs kategorik) mengikuti inferensi pandas atas CSV penuh:
+# kolom numerik bila semua nilainya terbaca sebagai angka.
+import argparse
+import collections
+import copy
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+import datastore
+import sketches
+
+FORMAT_VERSION = 3
+TARGET = "WORK_LIFE_BALANCE_SCORE"
+DROP_COLUMNS = ["Timestamp"]
+CHUNKSIZE = 100_000
+
+_lock = threading.Lock()
+_append_lock = threading.Lock()
+_cache = {}
+
+# name = nama file shard di direktori status (None = belum ditulis)
+Shard = collections.namedtuple("Shard", ["name", "hashes"])
+
+
+def read_chunks(path, chunksize=CHUNKSIZE):
+    """CSV per chunk sebagai teks (dtype str); konversi angka mengikuti skema."""
+    return pd.read_csv(path, dtype=str, encoding="utf-8-sig", chunksize=chunksize)
+
+
+def infer_schema(path, chunksize=CHUNKSIZE):
+    """{"columns", "numeric", "categorical"}; satu pass streaming atas CSV."""
+    columns, numeric = None, None
+    for chunk in read_chunks(path, chunksize):
+        if columns is None:
+            columns = list(chunk.columns)
+            numeric = {c: True for c in columns if c not in DROP_COLUMNS}
+        for c in numeric:
+            if numeric[c]:
+                values = chunk[c].dropna()
+                numeric[c] = bool(pd.to_numeric(values, errors="coerce").notna().all())
+    if columns is None:
+        raise ValueError(f"{path} kosong")
+    return {
+        "columns": columns,
+        "numeric": [c for c in numeric if numeric[c]],
+        "categorical": [c for c in numeric if not numeric[c]],
+    }
+
+
+class SchemaChanged(ValueError):
+    pass
+
+
+class RunningStats:
+    def __init__(self, schema):
+        self.schema = schema
+        p = len(schema["numeric"])
+        self.target = schema["numeric"].index(TARGET) if TARGET in schema["numeric"] else None
+        self.rows = 0            # semua baris yang pernah di-ingest
+        self.missing = 0         # sel kosong (tanpa Timestamp)
+        self.duplicates = 0      # baris lengkap yang duplikat baris lengkap sebelumnya
+        self.n = 0               # baris unik lengkap (basis statistik)
+        self.mean = np.zeros(p)
+        self.m2 = np.zeros(p)
+        self.comoment = np.zeros(p)   # Σ (x − x̄)(y − ȳ) terhadap TARGET
+        self.min = np.full(p, np.inf)
+        self.max = np.full(p, -np.inf)
+        self.categories = {c: {} for c in schema["categorical"]}
+        self.shards = []         # Shard hash baris unik lengkap, ukuran menurun
+        self.sketches = {c: sketches.QuantileSketch() for c in schema["numeric"]}
+
+    def _frame(self, chunk):
+        # Teks → kolom bertipe sesuai skema; kolom numerik yang tidak terbaca = skema berubah
+        if list(chunk.columns) != self.schema["columns"]:
+            raise ValueError("Kolom CSV berbeda dengan skema dataset")
+        frame = chunk.drop(columns=[c for c in DROP_COLUMNS if c in chunk.columns])
+        for c in self.schema["numeric"]:
+            values = pd.to_numeric(frame[c], errors="coerce")
+            if (values.isna() & frame[c].notna()).any():
+                raise SchemaChanged(f"Nilai non-numerik di kolom '{c}'")
+            frame[c] = values.astype(np.float64)
+        return frame
+
+    def update(self, chunk):
+        """Tambahkan satu chunk CSV mentah (dtype str); kembalikan baris unik lengkap yang baru (bertipe)."""
+        frame = self._frame(chunk)
+        null = frame.isnull().to_numpy()
+        self.rows += len(frame)
+        self.missing += int(null.sum())
+        complete = frame[~null.any(axis=1)]
+
+        # Duplikat: dalam chunk (kemunculan pertama dipertahankan) dan terhadap hash lama
+        h = pd.util.hash_pandas_object(complete, index=False).to_numpy()
+        _, first = np.unique(h, return_index=True)
+        keep = np.zeros(len(h), dtype=bool)
+        keep[first] = True
+        for shard in self.shards:
+            pos = np.minimum(np.searchsorted(shard.hashes, h), len(shard.hashes) - 1)
+            keep &= shard.hashes[pos] != h
+        self.duplicates += int(len(h) - keep.sum())
+        if keep.any():
+            self.shards.append(Shard(None, np.sort(h[keep])))
+            self._compact()
+
+        unique = complete[keep]
+        self.add_rows(unique)
+        return unique
+
+    def _compact(self):
+        # Gabung shard terakhir ke pendahulunya selama ukurannya ≥ separuh pendahulu
+        while len(self.shards) > 1 and 2 * len(self.shards[-1].hashes) >= len(self.shards[-2].hashes):
+            b, a = self.shards.pop(), self.shards.pop()
+            merged = np.concatenate([a.hashes, b.hashes])
+            merged.sort(kind="stable")  # dua run terurut → merge linear
+            self.shards.append(Shard(None, merged))
+
+    @property
+    def hashes(self):
+        """Semua hash baris unik lengkap, terurut (salinan)."""
+        if not self.shards:
+            return np.empty(0, dtype=np.uint64)
+        return np.sort(np.concatenate([shard.hashes for shard in self.shards]))
+
+    def copy(self):
+        """Salinan independen; array shard (tidak pernah diubah di tempat) dipakai bersama."""
+        return copy.deepcopy(self, {id(shard.hashes): shard.hashes for shard in self.shards})
+
+    def add_rows(self, frame):
+        """Tambahkan baris bertipe (tanpa cek null/duplikat) ke momen, sketch dan jumlah kategori."""
+        if not len(frame):
+            return
+        X = frame[self.schema["numeric"]].to_numpy(dtype=np.float64)
+        self._merge_moments(X)
+        for j, c in enumerate(self.schema["numeric"]):
+            self.sketches[c].update(X[:, j])
+        for c in self.schema["categorical"]:
+            counts = self.categories[c]
+            for value, k in frame[c].value_counts(sort=False).items():
+                counts[value] = counts.get(value, 0) + int(k)
+
+    def _merge_moments(self, X):
+        # Gabungan dua kelompok (Chan dkk.): kelompok lama (n_a) + chunk baru (n_b)
+        n_a, n_b = self.n, len(X)
+        n = n_a + n_b
+        mean_b = X.mean(axis=0)
+        dev = X - mean_b
+        m2_b = (dev * dev).sum(axis=0)
+        delta = mean_b - self.mean
+        if self.target is not None:
+            co_b = (dev * dev[:, self.target, None]).sum(axis=0)
+            self.comoment += co_b + delta * delta[self.target] * n_a * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.mean += delta * n_b / n
+        self.min = np.minimum(self.min, X.min(axis=0))
+        self.max = np.maximum(self.max, X.max(axis=0))
+        self.n = n
+
+    def describe(self):
+        """Tabel seperti df.describe() (std ddof=1; kuartil dari sketch)."""
+        std = np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.full(len(self.m2), np.nan)
+        if self.n:
+            quartiles = np.array([self.sketches[c].quantile([0.25, 0.5, 0.75]) for c in self.schema["numeric"]])
+        else:
+            quartiles = np.full((len(self.m2), 3), np.nan)
+        return pd.DataFrame(
+            {
+                "count": float(self.n), "mean": self.mean, "std": std, "min": self.min,
+                "25%": quartiles[:, 0], "50%": quartiles[:, 1], "75%": quartiles[:, 2], "max": self.max,
+            },
+            index=self.schema["numeric"],
+        ).T
+
+    def iqr_bounds(self):
+        """{kolom: (bawah, atas)} batas outlier IQR atas baris unik lengkap (lihat cleaning.filter_chunks)."""
+        return {c: cleaning.iqr_bounds(self.sketches[c]) for c in self.schema["numeric"] if self.sketches[c].n}
+
+    def target_correlation(self):
+        """Korelasi Pearson setiap kolom numerik dengan TARGET."""
+        if self.target is None:
+            raise KeyError(TARGET)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2[self.target])
+        return pd.Series(corr, index=self.schema["numeric"], name=TARGET)
+
+    def value_counts(self, column):
+        return pd.Series(self.categories[column], name="count").sort_values(ascending=False, kind="stable")
+
+    def report(self):
+        return {"rows": self.rows, "missing": self.missing, "duplicates": self.duplicates, "unique_complete": self.n}
+
+
+def build(csv_path, chunksize=CHUNKSIZE):
+    """RunningStats dari CSV penuh, dua pass streaming (skema, lalu statistik)."""
+    stats = RunningStats(infer_schema(csv_path, chunksize))
+    for chunk in read_chunks(csv_path, chunksize):
+        stats.update(chunk)
+    return stats
+
+
+def _state_dir(csv_path):
+    name = os.path.basename(datastore.cache_path(csv_path)).rsplit(".", 1)[0]
+    return os.path.join(os.path.dirname(datastore.cache_path(csv_path)), f"{name}.stats")
+
+
+def _source(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _write_shards(out_dir, stats):
+    # Tulis shard yang belum punya file; shard yang sudah ada di disk tidak disentuh
+    for i, shard in enumerate(stats.shards):
+        if shard.name is None:
+            fd, path = tempfile.mkstemp(prefix="hashes-", suffix=".npy", dir=out_dir)
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, shard.hashes)
+            stats.shards[i] = Shard(os.path.basename(path), shard.hashes)
+
+
+def _write_meta(out_dir, stats, source):
+    meta = {
+        "format": FORMAT_VERSION,
+        "source": source,
+        "schema": stats.schema,
+        "counters": {k: getattr(stats, k) for k in ("rows", "missing", "duplicates", "n")},
+        "moments": {k: getattr(stats, k).tolist() for k in ("mean", "m2", "comoment", "min", "max")},
+        "categories": stats.categories,
+        "sketches": {c: sk.state() for c, sk in stats.sketches.items()},
+        "shards": [shard.name for shard in stats.shards],
+    }
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=out_dir)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(out_dir, "meta.json"))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _write(out_dir, stats, source):
+    """Status lengkap ke direktori baru, lalu menggantikan `out_dir` (build/rebuild)."""
+    parent = os.path.dirname(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        stats.shards = [Shard(None, shard.hashes) for shard in stats.shards]
+        _write_shards(tmp, stats)
+        _write_meta(tmp, stats, source)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.replace(tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def _update(out_dir, stats, source):
+    """Tulis hanya shard baru + meta.json ke `out_dir` yang sudah ada (append)."""
+    _write_shards(out_dir, stats)
+    _write_meta(out_dir, stats, source)
+    # Shard yang sudah digabung (dan sisa append yang terputus) tidak dirujuk lagi
+    live = {shard.name for shard in stats.shards}
+    for name in os.listdir(out_dir):
+        if name.startswith("hashes-") and name not in live:
+            try:
+                os.unlink(os.path.join(out_dir, name))
+            except OSError:
+                pass
+
+
+def _read(out_dir, source):
+    try:
+        with open(os.path.join(out_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if (meta.get("format"), meta.get("source")) != (FORMAT_VERSION, source):
+            return None
+        stats = RunningStats(meta["schema"])
+        for k, v in meta["counters"].items():
+            setattr(stats, k, v)
+        for k, v in meta["moments"].items():
+            setattr(stats, k, np.array(v, dtype=np.float64))
+        stats.categories = meta["categories"]
+        stats.sketches = {c: sketches.QuantileSketch.from_state(v) for c, v in meta["sketches"].items()}
+        stats.shards = [Shard(name, np.load(os.path.join(out_dir, name), mmap_mode="r")) for name in meta["shards"]]
+    except (OSError, ValueError, KeyError):
+        return None
+    return stats
+
+
+def running_stats(csv_path="datasets_wellbeing.csv"):
+    """RunningStats untuk isi CSV saat ini; dibaca dari .cache atau dibangun ulang bila basi."""
+    key = os.path.abspath(csv_path)
+    source = _source(key)
+    entry = _cache.get(key)
+    if entry is None or entry[0] != source:
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None or entry[0] != source:
+                out_dir = _state_dir(key)
+                stats = _read(out_dir, source)
+                if stats is None:
+                    stats = build(key)
+                    _write(out_dir, stats, source)
+                entry = _cache[key] = (source, stats)
+    return entry[1]
+
+
+def _data_bytes(path):
+    # Isi file tanpa BOM dan tanpa baris header
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(b"\xef\xbb\xbf"):
+        raw = raw[3:]
+    _, _, body = raw.partition(b"\n")
+    return body
+
+
+def append(csv_path, new_path, chunksize=CHUNKSIZE):
+    """Tambahkan baris `new_path` (header sama) ke `csv_path` dan perbarui statistik. Kembalikan laporan chunk baru."""
+    key = os.path.abspath(csv_path)
+    with _append_lock:
+        # Statistik diperbarui pada salinan; CSV baru ditulis setelah semua chunk terbaca.
+        # Bila proses berhenti di antara append CSV dan tulis status, ukuran/mtime
+        # tidak cocok lagi dan running_stats() membangun ulang dari CSV.
+        stats = running_stats(key).copy()
+        before = stats.report()
+        try:
+            for chunk in read_chunks(new_path, chunksize):
+                stats.update(chunk)
+        except SchemaChanged:
+            # Kolom numerik menerima teks → pandas akan membacanya sebagai kategorik;
+            # skema & statistik dihitung ulang dari CSV penuh setelah append
+            stats = None
+        body = _data_bytes(new_path)
+        if body.strip():
+            with open(key, "rb+") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+        source = _source(key)
+        if stats is None:
+            stats = build(key, chunksize)
+            _write(_state_dir(key), stats, source)
+        else:
+            _update(_state_dir(key), stats, source)
+        with _lock:
+            _cache[key] = (source, stats)
+    after = stats.report()
+    return {k: after[k] - before[k] for k in after}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest respons survei baru + statistik berjalan.")
+    parser.add_argument("new", nargs="*", help="file CSV respons baru (header sama dengan dataset)")
+    parser.add_argument("--csv", default="datasets_wellbeing.csv")
+    parser.add_argument("--rebuild", action="store_true", help="hitung ulang statistik dari CSV penuh")
+    parser.add_argument("--summary", action="store_true", help="cetak ringkasan statistik (JSON)")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        _write(_state_dir(args.csv), build(args.csv), _source(args.csv))
+    for path in args.new:
+        added = append(args.csv, path)
+        print(f"{path}: +{added['rows']} baris, {added['duplicates']} duplikat, {added['missing']} sel kosong", file=sys.stderr)
+    if args.summary or not (args.new or args.rebuild):
+        stats = running_stats(args.csv)
+        print(json.dumps({
+            **stats.report(),
+            "describe": json.loads(stats.describe().to_json()),
+            "target_correlation": stats.target_correlation().round(6).to_dict(),
+            "iqr_bounds": stats.iqr_bounds(),
+            "categories": stats.categories,
+        }, indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# =============================================================
+# Indeks "People like you" ─ k-NN atas profil survei ter-encode
+# =============================================================
+# Profil = 22 kode fitur diskret (0–10; AGE 0–3; GENDER 0–2), jarak = L1
+# (Manhattan), jadi setiap jarak adalah bilangan bulat 0–255 (uint8).
+# Indeks kode ter-pack: setiap 4 fitur berurutan digabung menjadi satu kode
+# basis 11 (11⁴ = 14641 → uint16), 22 fitur → 6 kolom kode (12 byte/profil).
+# Per query dibuat 6 tabel jarak (kode blok → jarak L1 blok), sehingga jarak
+# ke semua profil = 6 gather + 6 penjumlahan uint8, diproses per blok baris
+# agar buffer tetap di cache CPU. k terdekat dipilih dengan histogram jarak
+# (bukan sort penuh). Hasilnya eksak, sama dengan scan penuh atas 22 kolom.
+#
+# Catatan: pohon (ball tree / kd-tree) maupun indeks pivot sudah diukur pada
+# 2 juta profil; di 22 dimensi diskret pemangkasannya lemah dan query-nya
+# lebih lambat dari scan ter-pack ini (±20 ms per juta profil, satu core).
+# Indeks dibangun sekali per versi dataset di .cache/<dataset>.neighbors/.
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+import datastore
+from features import FEATURES, TARGET, encode_frame
+
+FORMAT_VERSION = 1
+BASE = 11          # level kode per fitur (0–10)
+GROUP = 4          # fitur per kode ter-pack (11⁴ < 2¹⁶)
+BLOCK = 65_536     # baris per blok scan
+GROUPS = [list(range(i, min(i + GROUP, len(FEATURES)))) for i in range(0, len(FEATURES), GROUP)]
+_LEVELS = np.arange(BASE)
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def packable(codes):
+    """Mask baris yang semua kodenya bilangan bulat 0–10 (NaN / di luar rentang → False)."""
+    codes = np.asarray(codes, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        ok = (codes >= 0) & (codes < BASE) & (codes == np.floor(codes))
+    return ok.all(axis=1)
+
+
+def _check(codes):
+    # Input pengguna di luar rentang ditolak (data dataset difilter lewat packable())
+    if not packable(np.atleast_2d(codes)).all():
+        raise ValueError(f"Kode fitur harus bilangan bulat 0–{BASE - 1}")
+
+
+def pack(codes):
+    """Matriks kode (n, 22) → kode blok ter-pack (len(GROUPS), n) uint16."""
+    codes = np.asarray(codes)
+    _check(codes)
+    packed = np.zeros((len(GROUPS), len(codes)), dtype=np.uint16)
+    for g, cols in enumerate(GROUPS):
+        for c in cols:
+            packed[g] *= BASE
+            packed[g] += codes[:, c].astype(np.uint16)
+    return packed
+
+
+def distance_tables(x):
+    """Per blok: tabel jarak L1 dari setiap kode blok ke bagian `x` yang sama."""
+    _check(x)
+    x = np.asarray(x, dtype=np.int64)
+    tables = []
+    for cols in GROUPS:
+        table = np.zeros((1,), dtype=np.uint8)
+        for c in cols:
+            # kode = (((a·11) + b)·11 + c)… → dimensi terakhir berubah paling cepat
+            table = (table[:, None] + np.abs(_LEVELS - x[c]).astype(np.uint8)[None, :]).ravel()
+        tables.append(table)
+    return tables
+
+
+class NeighborIndex:
+    def __init__(self, packed, target, rows):
+        self.packed = packed
+        self.target = target
+        self.rows = rows
+
+    def __len__(self):
+        return self.packed.shape[1]
+
+    @classmethod
+    def build(cls, codes, target, rows=None):
+        rows = np.arange(len(codes)) if rows is None else np.asarray(rows)
+        return cls(pack(codes), np.asarray(target, dtype=np.float32), rows)
+
+    def distances(self, x):
+        """Jarak L1 (uint8) dari `x` (22 kode) ke semua profil."""
+        tables = distance_tables(x)
+        n = len(self)
+        dist = np.empty(n, dtype=np.uint8)
+        buf = np.empty(min(BLOCK, n), dtype=np.uint8)
+        for start in range(0, n, BLOCK):
+            stop = min(start + BLOCK, n)
+            out, tmp = dist[start:stop], buf[:stop - start]
+            np.take(tables[0], self.packed[0, start:stop], out=out)
+            for g in range(1, len(tables)):
+                np.take(tables[g], self.packed[g, start:stop], out=tmp)
+                out += tmp
+        return dist
+
+    def query(self, x, k=25):
+        """(posisi, jarak L1) k profil terdekat, urut menurut (jarak, posisi)."""
+        dist = self.distances(x)
+        k = min(k, len(dist))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), dist[:0]
+        # Jarak ambang ke-k dari histogram, lalu hanya kandidat ≤ ambang diurutkan
+        cutoff = int(np.searchsorted(np.cumsum(np.bincount(dist, minlength=256)), k))
+        cand = np.flatnonzero(dist <= cutoff)
+        order = np.lexsort((cand, dist[cand]))[:k]
+        pos = cand[order]
+        return pos, dist[pos]
+
+    def similar(self, x, k=25):
+        """Ringkasan k responden termirip: baris asli, jarak, dan nilai target."""
+        pos, dist = self.query(x, k)
+        return {"rows": self.rows[pos], "distance": dist, "target": self.target[pos]}
+
+
+def _write(out_dir, index, dataset_version):
+    parent = os.path.dirname(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        for name in ("packed", "target", "rows"):
+            np.save(os.path.join(tmp, f"{name}.npy"), getattr(index, name))
+        meta = {"format": FORMAT_VERSION, "dataset": dataset_version, "rows": len(index)}
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.replace(tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # Versi lama mungkin masih di-mmap / akan dibuka proses lain: hanya yang basi dihapus
+    datastore.prune_versions(parent, out_dir)
+
+
+def _read(out_dir, dataset_version):
+    try:
+        with open(os.path.join(out_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if (meta.get("format"), meta.get("dataset")) != (FORMAT_VERSION, dataset_version):
+            return None
+        arrays = {
+            name: np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode="r")
+            for name in ("packed", "target", "rows")
+        }
+    except (OSError, ValueError):
+        return None
+    return NeighborIndex(**arrays)
+
+
+def neighbor_index(csv_path="datasets_wellbeing.csv"):
+    """NeighborIndex untuk versi dataset saat ini; dibangun sekali lalu dibaca dari disk."""
+    dataset_version = datastore.dataset_version(csv_path)
+    key = (csv_path, dataset_version)
+    index = _cache.get(key)
+    if index is None:
+        with _lock:
+            index = _cache.get(key)
+            if index is None:
+                name = os.path.basename(datastore.cache_path(csv_path)).rsplit(".", 1)[0]
+                out_dir = os.path.join(
+                    os.path.dirname(datastore.cache_path(csv_path)), f"{name}.neighbors", dataset_version,
+                )
+                index = _read(out_dir, dataset_version)
+                if index is None:
+                    df = datastore.load_dataset(csv_path)
+                    X = encode_frame(df)
+                    target = df[TARGET].to_numpy(dtype=np.float64)
+                    # Baris dengan kode kosong / di luar 0–10 (mis. hasil ingest.append)
+                    # tidak masuk indeks, bukan menggagalkan halaman prediksi
+                    valid = packable(X) & np.isfinite(target)
+                    built = NeighborIndex.build(X[valid], target[valid], np.flatnonzero(valid))
+                    _write(out_dir, built, dataset_version)
+                    index = _read(out_dir, dataset_version)
+                for old in [k for k in _cache if k[0] == csv_path]:
+                    del _cache[old]
+                _cache[key] = index
+    return index
@@ -0,0 +1,366 @@
+# =============================================================
+# EDA out-of-core: tabel halaman EDA dari arsip CSV besar, per chunk
+# =============================================================
+# Contoh:
+#   python outofcore.py arsip_survei.csv --memory-mb 256
+#
+# Untuk arsip survei berjuta-juta baris yang tidak muat di memori. Tabel yang
+# sama dengan halaman EDA dihitung dengan membaca CSV per chunk berukuran
+# terbatas, tanpa pernah memuat seluruh data:
+#   1. skema: kolom numerik vs teks dan tipe seperti datastore.py
+#      (int8 / float32 / category)
+#   2. dropna + drop_duplicates lewat ingest.RunningStats (hash per baris);
+#      baris unik lengkap di-spill ke file kolumnar sementara, dibaca ulang
+#      per potongan (np.fromfile) agar halaman file tidak ikut menumpuk
+#   3. filter outlier IQR berurutan per fitur seperti cleaning.clean(): satu
+#      pass atas spill per fitur, kuartil dari QuantileSketch mode exact
+#      (aritmetika np.quantile diulang dengan dtype kolom → batas identik)
+#   4. satu pass akhir atas baris yang lolos: describe, korelasi ke target,
+#      jumlah kategori, distribusi (distributions.from_sketch), statistik
+#      regresi (regstats), head() dan sampel sistematis ≤ SAMPLE_ROWS baris
+#      untuk scatter/boxplot
+# Ukuran chunk diturunkan dari batas memori (WLB_EDA_MEMORY_MB, default 512):
+# batas dikurangi biaya tetap per baris (hash uint64 + salinan saat merge shard +
+# mask baris) dan sampel, sisanya dibagi perkiraan memori satu baris teks ×
+# OVERHEAD (dikalibrasi dari puncak RSS per baris chunk).
+# Batas ini untuk memori kerja engine, di luar memori dasar proses (pandas,
+# Streamlit). Kolom dengan nilai unik > sketches.MAX_EXACT beralih ke mode
+# KLL: kuartil/batas IQR dan distribusinya menjadi perkiraan (galat rank eps).
+#
+# Halaman EDA memakai mode ini bila WLB_EDA_CHUNKED=1, atau otomatis (default
+# "auto") bila CSV lebih besar dari AUTO_BYTES.
+import argparse
+import collections
+import hashlib
+import itertools
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+import datastore
+import distributions
+import ingest
+import regstats
+import sketches
+
+MEMORY_MB = int(os.environ.get("WLB_EDA_MEMORY_MB", "512"))
+MODE = os.environ.get("WLB_EDA_CHUNKED", "auto")   # "1" selalu, "0" tidak pernah, "auto"
+AUTO_BYTES = 256 << 20
+SAMPLE_ROWS = regstats.SCATTER_MAX
+HEAD_ROWS = 5
+PROBE_ROWS = 1000
+MIN_CHUNK = 1000
+OVERHEAD = 6            # frame teks + frame bertipe + hash + salinan dedup per chunk
+FIXED_ROW_BYTES = 24    # hash uint64 per baris unik (dua kali saat merge shard) + mask keep
+TARGET = ingest.TARGET
+DROP_COLUMNS = ingest.DROP_COLUMNS
+
+Summary = collections.namedtuple("Summary", [
+    "version", "head", "shape", "dtypes", "report", "clean_head", "clean_shape",
+    "describe", "target_correlation", "value_counts", "distributions", "regression",
+    "sample", "chunk_rows",
+])
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def enabled(csv_path="datasets_wellbeing.csv"):
+    """True bila halaman EDA sebaiknya memakai engine chunked untuk CSV ini."""
+    if MODE == "auto":
+        return os.path.getsize(csv_path) > AUTO_BYTES
+    return MODE not in ("", "0")
+
+
+def plan(csv_path, memory_mb=None):
+    """Jumlah baris per chunk agar memori kerja ≈ memory_mb; ValueError bila batas terlalu kecil."""
+    memory_mb = MEMORY_MB if memory_mb is None else memory_mb
+    probe = next(ingest.read_chunks(csv_path, PROBE_ROWS), None)
+    if probe is None or not len(probe):
+        raise ValueError(f"{csv_path} kosong")
+    row_bytes = probe.memory_usage(deep=True).sum() / len(probe)
+    with open(csv_path, "rb") as f:
+        lines = list(itertools.islice(f, PROBE_ROWS + 1))[1:]
+    est_rows = os.path.getsize(csv_path) / (sum(map(len, lines)) / len(lines))
+    fixed = est_rows * FIXED_ROW_BYTES + SAMPLE_ROWS * probe.shape[1] * 8
+    rows = int((memory_mb * (1 << 20) - fixed) // (row_bytes * OVERHEAD))
+    if rows < MIN_CHUNK:
+        raise ValueError(f"Batas memori {memory_mb} MB terlalu kecil untuk {csv_path} "
+                         f"(±{est_rows:,.0f} baris); naikkan WLB_EDA_MEMORY_MB")
+    return rows
+
+
+def _digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _schema(csv_path, chunk_rows):
+    # Skema ingest + tipe datastore: int8 bila semua nilai bilangan bulat -128..127
+    # tanpa sel kosong, float32 bila numerik lainnya, category bila teks
+    columns, numeric, integer, lo, hi = None, {}, {}, {}, {}
+    for chunk in ingest.read_chunks(csv_path, chunk_rows):
+        if columns is None:
+            columns = list(chunk.columns)
+            numeric = {c: True for c in columns}
+            integer = {c: True for c in columns}
+            lo, hi = {c: math.inf for c in columns}, {c: -math.inf for c in columns}
+        for c in columns:
+            if not numeric[c]:
+                continue
+            s = chunk[c]
+            values = pd.to_numeric(s, errors="coerce")
+            if (values.isna() & s.notna()).any():
+                numeric[c] = integer[c] = False
+                continue
+            if integer[c]:
+                integer[c] = bool(s.notna().all() and s.str.fullmatch(r"[+-]?\d+").all())
+            if values.notna().any():
+                lo[c], hi[c] = min(lo[c], values.min()), max(hi[c], values.max())
+    if columns is None:
+        raise ValueError(f"{csv_path} kosong")
+    kinds = {}
+    for c in columns:
+        if integer[c] and lo[c] >= -128 and hi[c] <= 127:
+            kinds[c] = "int8"
+        elif numeric[c]:
+            kinds[c] = "float32"
+        else:
+            kinds[c] = "category"
+    kept = [c for c in columns if c not in DROP_COLUMNS]
+    return {
+        "columns": columns,
+        "numeric": [c for c in kept if numeric[c]],
+        "categorical": [c for c in kept if not numeric[c]],
+        "kinds": kinds,
+    }
+
+
+def _typed(chunk, kinds):
+    # Chunk teks → frame bertipe seperti datastore.load_dataset (untuk head())
+    out = {}
+    for c in chunk.columns:
+        if kinds[c] == "category":
+            out[c] = chunk[c].astype("category")
+        else:
+            out[c] = pd.to_numeric(chunk[c]).astype(np.int8 if kinds[c] == "int8" else np.float32)
+    return pd.DataFrame(out, index=chunk.index)
+
+
+class _Spill:
+    """Baris unik lengkap dalam file kolumnar sementara; kode kategori sesuai urutan kemunculan."""
+
+    def __init__(self, directory, schema):
+        self.dir = directory
+        self.kinds = schema["kinds"]
+        self.columns = schema["numeric"] + schema["categorical"]
+        self.codes = {c: {} for c in schema["categorical"]}
+        self.n = 0
+        self._paths = {c: os.path.join(directory, f"{i}.bin") for i, c in enumerate(["__index__"] + self.columns)}
+        self._files = {c: open(path, "wb") for c, path in self._paths.items()}
+
+    def dtype(self, column):
+        if column == "__index__":
+            return np.int64
+        return {"int8": np.int8, "float32": np.float32, "category": np.int32}[self.kinds[column]]
+
+    def append(self, frame):
+        self._files["__index__"].write(frame.index.to_numpy(dtype=np.int64).tobytes())
+        for c in self.columns:
+            if c in self.codes:
+                mapping = self.codes[c]
+                for value in frame[c].unique():
+                    mapping.setdefault(value, len(mapping))
+                values = pd.Index(list(mapping)).get_indexer(frame[c])
+            else:
+                values = frame[c].to_numpy()
+            self._files[c].write(np.asarray(values, dtype=self.dtype(c)).tobytes())
+        self.n += len(frame)
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+    def read(self, column, start, stop):
+        dtype = np.dtype(self.dtype(column))
+        return np.fromfile(self._paths[column], dtype=dtype, count=stop - start, offset=start * dtype.itemsize)
+
+
+def _ranges(n, step):
+    for a in range(0, n, step):
+        yield a, min(a + step, n)
+
+
+def _np_quantile(sketch, q, dtype):
+    # Kuantil dengan aritmetika np.quantile atas kolom ber-dtype `dtype`
+    lo, hi, frac = sketch.bracket(q)
+    return np.quantile(np.array([lo, hi], dtype=dtype), frac)
+
+
+def summarize(csv_path, memory_mb=None, chunk_rows=None):
+    """Summary tabel EDA untuk CSV, dihitung per chunk (tanpa cache)."""
+    chunk_rows = chunk_rows or plan(csv_path, memory_mb)
+    schema = _schema(csv_path, chunk_rows)
+    kinds = schema["kinds"]
+    parent = os.path.dirname(datastore.cache_path(csv_path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-ooc-", dir=parent)
+    try:
+        # Pass 1: dropna + drop_duplicates, spill baris unik lengkap
+        stats = ingest.RunningStats(schema)
+        spill = _Spill(tmp, schema)
+        categories = {c: set() for c in schema["categorical"]}
+        head = None
+        try:
+            for chunk in ingest.read_chunks(csv_path, chunk_rows):
+                if head is None:
+                    head = _typed(chunk.head(HEAD_ROWS), kinds)
+                for c in categories:
+                    categories[c].update(chunk[c].dropna().unique())
+                spill.append(stats.update(chunk))
+        finally:
+            spill.close()
+        categories = {c: sorted(v) for c, v in categories.items()}
+        n = spill.n
+
+        # Pass 2..p+1: filter IQR berurutan per fitur numerik
+        keep = np.ones(n, dtype=bool)
+        outliers, remaining = [], n
+        for c in schema["numeric"]:
+            dtype = spill.dtype(c)
+            sketch = sketches.QuantileSketch()
+            for a, b in _ranges(n, chunk_rows):
+                sketch.update(spill.read(c, a, b)[keep[a:b]])
+            Q1, Q3 = (_np_quantile(sketch, q, dtype) for q in (0.25, 0.75))
+            IQR = Q3 - Q1
+            lower = Q1 - 1.5 * IQR
+            upper = Q3 + 1.5 * IQR
+            for a, b in _ranges(n, chunk_rows):
+                part = spill.read(c, a, b)
+                keep[a:b] &= (part >= lower) & (part <= upper)
+            after = int(keep.sum())
+            outliers.append((c, remaining - after))
+            remaining = after
+
+        # Pass akhir: tabel dan distribusi dari baris yang lolos
+        clean_columns = [c for c in schema["columns"] if c not in DROP_COLUMNS]
+        remap = {}
+        for c, mapping in spill.codes.items():
+            remap[c] = pd.Index(categories[c]).get_indexer(list(mapping)).astype(np.int32)
+        final = ingest.RunningStats(schema)
+        features = [c for c in schema["numeric"] if c != TARGET]
+        regression = None
+        stride = max(1, math.ceil(remaining / SAMPLE_ROWS))
+        heads, samples, seen = [], [], 0
+        for a, b in _ranges(n, chunk_rows):
+            mask = keep[a:b]
+            if not mask.any():
+                continue
+            parts = {}
+            for c in clean_columns:
+                values = spill.read(c, a, b)[mask]
+                if kinds[c] == "category":
+                    values = pd.Categorical.from_codes(remap[c][values], categories=categories[c])
+                parts[c] = values
+            frame = pd.DataFrame(parts, index=spill.read("__index__", a, b)[mask])
+            final.add_rows(frame)
+            if TARGET in schema["numeric"]:
+                part = regstats.sufficient_stats(frame, columns=features)
+                regression = part if regression is None else {
+                    c: regstats.merge(regression[c], part[c]) for c in features}
+            if sum(map(len, heads)) < HEAD_ROWS:
+                heads.append(frame.head(HEAD_ROWS - sum(map(len, heads))))
+            rank = seen + np.arange(len(frame))
+            samples.append(frame[rank % stride == 0])
+            seen += len(frame)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    empty = _typed(pd.DataFrame({c: pd.Series(dtype=str) for c in clean_columns}), kinds)
+    dtypes = pd.Series(
+        [pd.CategoricalDtype(categories.get(c)) if kinds[c] == "category"
+         else np.dtype(np.int8 if kinds[c] == "int8" else np.float32) for c in schema["columns"]],
+        index=schema["columns"], dtype=object,
+    )
+    report = {
+        "dropped_columns": [c for c in DROP_COLUMNS if c in schema["columns"]],
+        "missing": stats.missing,
+        "duplicates": stats.duplicates,
+        "outliers": outliers,
+        "total_outliers": sum(k for _, k in outliers),
+    }
+    dists = {}
+    for c in schema["numeric"]:
+        if final.sketches[c].n:
+            kind = "discrete" if c != TARGET and kinds[c] == "int8" else "continuous"
+            dists[c] = distributions.from_sketch(final.sketches[c], kind)
+    return Summary(
+        version=f"chunked-{_digest(csv_path)[:16]}",
+        head=head,
+        shape=(stats.rows, len(schema["columns"])),
+        dtypes=dtypes,
+        report=report,
+        clean_head=pd.concat(heads) if heads else empty,
+        clean_shape=(remaining, len(clean_columns)),
+        describe=final.describe(),
+        target_correlation=final.target_correlation() if TARGET in schema["numeric"] else None,
+        value_counts={c: final.value_counts(c) for c in schema["categorical"]},
+        distributions=dists,
+        regression=regression,
+        sample=pd.concat(samples) if samples else empty,
+        chunk_rows=chunk_rows,
+    )
+
+
+def summary(csv_path="datasets_wellbeing.csv"):
+    """Summary untuk isi CSV saat ini; dihitung sekali per ukuran/mtime file di proses ini."""
+    key = os.path.abspath(csv_path)
+    st = os.stat(key)
+    source = (st.st_size, st.st_mtime_ns, MEMORY_MB)
+    entry = _cache.get(key)
+    if entry is None or entry[0] != source:
+        with _lock:
+            entry = _cache.get(key)
+            if entry is None or entry[0] != source:
+                entry = _cache[key] = (source, summarize(key, MEMORY_MB))
+    return entry[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tabel EDA dari CSV besar secara out-of-core (per chunk).")
+    parser.add_argument("csv", nargs="?", default="datasets_wellbeing.csv")
+    parser.add_argument("--memory-mb", type=int, default=MEMORY_MB, help="batas memori kerja engine (MB)")
+    parser.add_argument("--chunk-rows", type=int, help="paksa ukuran chunk (baris), abaikan --memory-mb")
+    args = parser.parse_args(argv)
+
+    try:
+        result = summarize(args.csv, args.memory_mb, args.chunk_rows)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    out = {
+        "chunk_rows": result.chunk_rows,
+        "shape": result.shape,
+        "clean_shape": result.clean_shape,
+        "report": result.report,
+        "describe": json.loads(result.describe.to_json()),
+        "target_correlation": None if result.target_correlation is None
+        else result.target_correlation.round(4).to_dict(),
+        "value_counts": {c: vc.to_dict() for c, vc in result.value_counts.items()},
+    }
+    print(json.dumps(out, indent=1, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
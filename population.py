@@ -0,0 +1,184 @@
+# =============================================================
+# Indeks skor populasi ─ persentil instan untuk hasil prediksi
+# =============================================================
+# Seluruh dataset referensi diskor sekali per (versi dataset, versi model),
+# lalu skor (skala 1–100, sama dengan "Hasil Prediksi") disimpan terurut:
+#   - overall.npy : semua responden valid
+#   - strata.npy  : segmen terurut per strata AGE, GENDER, dan AGE × GENDER
+#     (batas segmen di meta.json)
+# File disimpan di .cache/<dataset>.population/ dan dimuat dengan mmap.
+# Persentil satu prediksi = satu binary search, O(log n), tanpa membaca CSV.
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+import artifacts
+import datastore
+import inference
+from features import FEATURES, encode_frame, scale_value
+
+FORMAT_VERSION = 1
+MODEL_FILES = ("linear_regression.pkl", "power_transfromer.pkl", "scaler.pkl")
+
+_AGE = FEATURES.index("AGE")
+_GENDER = FEATURES.index("GENDER")
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def _stratum_key(age=None, gender=None):
+    return f"{'*' if age is None else int(age)},{'*' if gender is None else int(gender)}"
+
+
+class PopulationIndex:
+    def __init__(self, overall, strata, segments):
+        self.overall = overall
+        self.strata = strata
+        self.segments = segments
+
+    def __len__(self):
+        return len(self.overall)
+
+    def _segment(self, age=None, gender=None):
+        if age is None and gender is None:
+            return self.overall
+        bounds = self.segments.get(_stratum_key(age, gender))
+        if bounds is None:
+            return self.overall[:0]
+        return self.strata[bounds[0]:bounds[1]]
+
+    def percentile(self, score, age=None, gender=None):
+        """(persentil 0–100, ukuran populasi) skor di antara responden strata tersebut.
+
+        Persentil = persen responden dengan skor lebih rendah, ditambah
+        separuh yang skornya sama (mid-rank). Strata kosong → (None, 0).
+        """
+        scores = self._segment(age, gender)
+        n = len(scores)
+        if n == 0:
+            return None, 0
+        lo = np.searchsorted(scores, score, side="left")
+        hi = np.searchsorted(scores, score, side="right")
+        return 100.0 * float(lo + hi) / (2 * n), n
+
+    def below(self, score, age=None, gender=None):
+        """(persen responden dengan skor lebih rendah, ukuran populasi); untuk teks "lebih tinggi dari X%".
+
+        Beda dengan percentile(): skor yang sama tidak dihitung. Strata kosong → (None, 0).
+        """
+        scores = self._segment(age, gender)
+        n = len(scores)
+        if n == 0:
+            return None, 0
+        return 100.0 * float(np.searchsorted(scores, score, side="left")) / n, n
+
+    def quantile(self, q, age=None, gender=None):
+        """Skor pada kuantil `q` (0–1) dari strata tersebut."""
+        scores = self._segment(age, gender)
+        if len(scores) == 0:
+            return None
+        return float(scores[min(int(q * len(scores)), len(scores) - 1)])
+
+
+def compute(df, scorer):
+    """(overall, strata, segments) dari frame mentah berskema datasets_wellbeing.csv."""
+    X = encode_frame(df)
+    X = X[~np.isnan(X).any(axis=1)]
+    scores = scale_value(scorer.predict(X))
+    age = X[:, _AGE].astype(np.int64)
+    gender = X[:, _GENDER].astype(np.int64)
+
+    overall = np.sort(scores)
+    parts, segments, start = [], {}, 0
+    groups = [(a, None) for a in np.unique(age)] + [(None, g) for g in np.unique(gender)]
+    groups += [(a, g) for a in np.unique(age) for g in np.unique(gender)]
+    for a, g in groups:
+        mask = np.ones(len(scores), dtype=bool)
+        if a is not None:
+            mask &= age == a
+        if g is not None:
+            mask &= gender == g
+        part = np.sort(scores[mask])
+        if len(part):
+            segments[_stratum_key(a, g)] = [start, start + len(part)]
+            parts.append(part)
+            start += len(part)
+    strata = np.concatenate(parts) if parts else np.empty(0)
+    return overall, strata, segments
+
+
+def _write(out_dir, overall, strata, segments, dataset_version, model_version):
+    parent = os.path.dirname(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        np.save(os.path.join(tmp, "overall.npy"), overall)
+        np.save(os.path.join(tmp, "strata.npy"), strata)
+        meta = {
+            "format": FORMAT_VERSION,
+            "dataset": dataset_version,
+            "model": model_version,
+            "rows": len(overall),
+            "segments": segments,
+        }
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.replace(tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # Versi lama mungkin masih di-mmap / akan dibuka proses lain: hanya yang basi dihapus
+    datastore.prune_versions(parent, out_dir)
+
+
+def _read(out_dir, dataset_version, model_version):
+    try:
+        with open(os.path.join(out_dir, "meta.json")) as f:
+            meta = json.load(f)
+        if (meta.get("format"), meta.get("dataset"), meta.get("model")) != (FORMAT_VERSION, dataset_version, model_version):
+            return None
+        overall = np.load(os.path.join(out_dir, "overall.npy"), mmap_mode="r")
+        strata = np.load(os.path.join(out_dir, "strata.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    return PopulationIndex(overall, strata, meta["segments"])
+
+
+def _scorer(model_files):
+    # stacking_model.pkl → ensemble terkompilasi; model linear → tabel lookup
+    if type(artifacts.load(model_files[0])).__name__ == "StackingRegressor":
+        import ensemble
+        return ensemble.ensemble(*model_files)
+    return inference.lookup(*model_files)
+
+
+def population_index(csv_path="datasets_wellbeing.csv", model_files=MODEL_FILES):
+    """PopulationIndex untuk dataset & model saat ini; dibangun sekali lalu dibaca dari disk."""
+    dataset_version = datastore.dataset_version(csv_path)
+    model_version = artifacts.version(*model_files)
+    key = (csv_path, dataset_version, model_version)
+    index = _cache.get(key)
+    if index is None:
+        with _lock:
+            index = _cache.get(key)
+            if index is None:
+                name = os.path.basename(datastore.cache_path(csv_path)).rsplit(".", 1)[0]
+                out_dir = os.path.join(
+                    os.path.dirname(datastore.cache_path(csv_path)),
+                    f"{name}.population", f"{dataset_version}-{model_version}",
+                )
+                index = _read(out_dir, dataset_version, model_version)
+                if index is None:
+                    built = compute(datastore.load_dataset(csv_path), _scorer(model_files))
+                    _write(out_dir, *built, dataset_version, model_version)
+                    index = _read(out_dir, dataset_version, model_version)
+                for old in [k for k in _cache if k[0] == csv_path]:
+                    del _cache[old]
+                _cache[key] = index
+    return index
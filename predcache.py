@@ -0,0 +1,95 @@
+# =============================================================
+# Cache hasil prediksi (LRU, dibatasi jumlah entri)
+# =============================================================
+# Ruang input form terbatas (22 kode bilangan bulat kecil) dan banyak
+# pengguna mengirim profil yang sama. Hasil satu prediksi (nilai mentah,
+# skor terskala, daftar rekomendasi) disimpan per (versi model, tuple kode
+# input) untuk seluruh proses. Versi model = artifacts.version(...) atas
+# file artifact, jadi saat salah satu artifact berubah semua entri lama
+# dibuang sekaligus.
+import collections
+import threading
+
+import artifacts
+from features import scale_value
+from recommendations import recommend
+
+MAX_ITEMS = 4096
+
+Result = collections.namedtuple("Result", ["prediction", "score", "recommendations"])
+
+
+class PredictionCache:
+    def __init__(self, max_items=MAX_ITEMS):
+        self.max_items = max_items
+        self._items = collections.OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, version, codes, compute):
+        """Result untuk `codes` pada versi model `version`; `compute(codes)` dipanggil hanya saat miss."""
+        key = (version, tuple(int(c) for c in codes))
+        with self._lock:
+            if version != self._version:
+                if self._items:
+                    self.invalidations += 1
+                self._items.clear()
+                self._version = version
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return result
+        result = compute(key[1])
+        with self._lock:
+            self.misses += 1
+            if version == self._version and key not in self._items:
+                self._items[key] = result
+                while len(self._items) > self.max_items:
+                    self._items.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._version = None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._items),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "model_version": self._version,
+            }
+
+
+_default = PredictionCache()
+
+
+def predict(codes, scorer, model_files):
+    """Result (prediksi, skor, rekomendasi) untuk satu vektor kode berurutan FEATURES.
+
+    `scorer` punya predict_one(values); `model_files` adalah artifact yang
+    membentuk scorer dan menjadi versi kunci cache.
+    """
+    def compute(values):
+        prediction = scorer.predict_one(values)
+        return Result(prediction, float(scale_value(prediction)), tuple(recommend(list(values))))
+
+    return _default.get(artifacts.version(*model_files), codes, compute)
+
+
+def stats():
+    return _default.stats()
+
+
+def clear():
+    _default.clear()
@@ -0,0 +1,142 @@
+# =============================================================
+# Rule engine rekomendasi personal (vektor, per baris responden)
+# =============================================================
+# 19 topik rekomendasi (20 aturan) show_prediction() ditulis sebagai tabel ambang.
+# Setiap aturan berisi satu atau beberapa klausa (operator, ambang) atas
+# satu fitur ter-encode; aturan aktif bila semua klausanya terpenuhi.
+# Tabel dikompilasi sekali saat import menjadi array indeks kolom/ambang per
+# operator, lalu dievaluasi sebagai mask boolean NumPy atas matriks (n, 22)
+# berurutan FEATURES. Hasil per responden berupa bitmask uint32:
+#   bit i aktif  ⇔  RULES[i] terpicu
+# Nilai NaN (baris tidak valid) tidak pernah memicu aturan.
+import collections
+
+import numpy as np
+
+from features import FEATURES
+
+Rule = collections.namedtuple("Rule", ["feature", "clauses", "message"])
+
+RULES = [
+    # 1. Stress
+    Rule("DAILY_STRESS", ((">=", 3), ("<=", 4)),
+         "⚠️ High stress level detected. Consider stress-reducing activities like deep breathing, journaling, or nature walks."),
+    Rule("DAILY_STRESS", ((">=", 5),),
+         "🧠 Your stress level is very high. Seek support from a therapist or mental health professional."),
+    # 2. Sleep
+    Rule("SLEEP_HOURS", (("<", 4),),
+         "💤 You're likely sleep-deprived. Aim for at least 7–8 hours of quality sleep."),
+    # 3. Fruits & Vegetables
+    Rule("FRUITS_VEGGIES", (("<", 2),),
+         "🍎 Try to increase your intake of fruits and vegetables. They’re vital for energy and mood."),
+    # 4. Physical Activity (Steps)
+    Rule("DAILY_STEPS", (("<", 3),),
+         "🚶‍♂️ You're not walking much. Try to reach 6,000–10,000 steps per day for better health."),
+    # 5. Meditation
+    Rule("WEEKLY_MEDITATION", (("<", 2),),
+         "🧘 Consider meditating a few times a week. It can boost focus and emotional well-being."),
+    # 6. Time for Passion
+    Rule("TIME_FOR_PASSION", (("<", 3),),
+         "🎨 Try to spend more time on your hobbies or passions to enhance life satisfaction."),
+    # 7. Social Interaction
+    Rule("SOCIAL_NETWORK", (("<", 3),),
+         "👥 Low social interaction detected. Connecting with people can improve your happiness and health."),
+    # 8. Core Circle (Close friends/family)
+    Rule("CORE_CIRCLE", (("<", 2),),
+         "🤝 Building deeper connections with people can increase your emotional support network."),
+    # 9. Supporting Others
+    Rule("SUPPORTING_OTHERS", (("<", 2),),
+         "❤️ Helping others can give you purpose and boost your self-esteem. Try small acts of kindness."),
+    # 10. Life Vision
+    Rule("LIVE_VISION", (("<", 3),),
+         "🔭 Consider clarifying your life goals. A clear vision can provide direction and motivation."),
+    # 11. To-Do Completion
+    Rule("TODO_COMPLETED", (("<", 3),),
+         "📋 You might benefit from better planning or routine. Try setting smaller, achievable goals."),
+    # 12. Achievements
+    Rule("ACHIEVEMENT", (("<", 2),),
+         "🏅 Celebrate small wins and keep setting personal goals to build a sense of accomplishment."),
+    # 13. Donation
+    Rule("DONATION", (("<", 2),),
+         "💰 Donating time or money to causes you care about can give a sense of purpose and fulfillment."),
+    # 14. BMI
+    Rule("BMI_RANGE", (("==", 2),),
+         "⚖️ You may be in an overweight category. A balanced diet and regular exercise can help."),
+    # 15. Lost Vacation
+    Rule("LOST_VACATION", ((">", 5),),
+         "🌴 You're losing too many vacation days. Taking time off helps restore energy and mental clarity."),
+    # 16. Shouting Frequency
+    Rule("DAILY_SHOUTING", ((">", 5),),
+         "📣 Frequent shouting might indicate unresolved tension. Consider talking to someone or journaling."),
+    # 17. Sufficient Income
+    Rule("SUFFICIENT_INCOME", (("==", 2),),
+         "💸 Financial stress affects well-being. Look into budgeting or financial planning help."),
+    # 18. Personal Awards
+    Rule("PERSONAL_AWARDS", (("<", 2),),
+         "🏆 You might benefit from setting goals that lead to recognition or feedback for your efforts."),
+    # 19. Flow (Immersed time)
+    Rule("FLOW", (("<", 3),),
+         "🔄 Try finding activities where you lose track of time. 'Flow' moments are deeply fulfilling."),
+]
+
+_OPS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+}
+
+
+def _compile(rules):
+    # {operator: (indeks aturan, indeks kolom, ambang)}; dalam satu operator
+    # setiap aturan muncul paling banyak sekali sehingga indeks aturan unik.
+    groups = {}
+    for i, rule in enumerate(rules):
+        col = FEATURES.index(rule.feature)
+        for op, value in rule.clauses:
+            if op not in _OPS:
+                raise ValueError(f"Operator tidak dikenal pada aturan {rule.feature}: {op!r}")
+            groups.setdefault(op, []).append((i, col, value))
+    compiled = []
+    for op, items in groups.items():
+        rule_idx, col_idx, values = zip(*items)
+        if len(set(rule_idx)) != len(rule_idx):
+            raise ValueError(f"Klausa {op!r} ganda dalam satu aturan")
+        compiled.append((_OPS[op], np.array(rule_idx), np.array(col_idx), np.array(values, dtype=np.float64)))
+    return compiled
+
+
+_COMPILED = _compile(RULES)
+_BITS = np.left_shift(np.uint32(1), np.arange(len(RULES), dtype=np.uint32))
+MESSAGES = [rule.message for rule in RULES]
+
+
+def evaluate(X):
+    """Mask boolean (n, len(RULES)) aturan yang terpicu untuk matriks ter-encode (n, 22)."""
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X[None, :]
+    hit = np.ones((len(X), len(RULES)), dtype=bool)
+    for op, rule_idx, col_idx, values in _COMPILED:
+        hit[:, rule_idx] &= op(X[:, col_idx], values)
+    return hit
+
+
+def bitmask(X):
+    """Bitmask uint32 per baris; bit i aktif bila RULES[i] terpicu."""
+    hit = evaluate(X)
+    return np.bitwise_or.reduce(np.where(hit, _BITS, np.uint32(0)), axis=1)
+
+
+def messages(mask):
+    """Daftar pesan rekomendasi untuk satu bitmask, dalam urutan RULES."""
+    mask = int(mask)
+    return [m for i, m in enumerate(MESSAGES) if mask >> i & 1]
+
+
+def recommend(record):
+    """Pesan rekomendasi untuk satu responden (dict fitur → kode, atau urutan FEATURES)."""
+    if isinstance(record, dict):
+        record = [record[c] for c in FEATURES]
+    return messages(bitmask(record)[0])
@@ -0,0 +1,122 @@
+# =============================================================
+# Garis regresi & pita kepercayaan bentuk tertutup (tab "Fitur vs Target")
+# =============================================================
+# sns.regplot mem-bootstrap interval kepercayaan (1000 resample) atas semua
+# baris setiap kali fitur diganti. Untuk regresi linear sederhana garis dan
+# pitanya cukup dihitung dari statistik cukup per fitur:
+#   n, Σx, Σy, Σxy, Σx², Σy²
+# yang dihitung sekali per versi dataset (dan bisa dijumlahkan antar chunk).
+import math
+import threading
+
+import numpy as np
+
+import cleaning
+import datastore
+
+SCATTER_MAX = 50_000  # titik scatter maksimum yang digambar (sampel deterministik)
+
+_lock = threading.Lock()
+_cache = {}
+
+
+def sufficient_stats(df, target="WORK_LIFE_BALANCE_SCORE", columns=None):
+    """{fitur: {n, sx, sy, sxy, sxx, syy}} untuk semua fitur numerik terhadap target."""
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != target]
+    y = df[target].to_numpy(dtype=np.float64)
+    X = df[columns].to_numpy(dtype=np.float64)
+    ok = np.isfinite(X) & np.isfinite(y)[:, None]
+    Xz = np.where(ok, X, 0.0)
+    Yz = np.where(ok, y[:, None], 0.0)
+    n = ok.sum(axis=0)
+    sx, sy = Xz.sum(axis=0), Yz.sum(axis=0)
+    sxy = (Xz * Yz).sum(axis=0)
+    sxx = (Xz * Xz).sum(axis=0)
+    syy = (Yz * Yz).sum(axis=0)
+    return {
+        c: {"n": int(n[j]), "sx": sx[j], "sy": sy[j], "sxy": sxy[j], "sxx": sxx[j], "syy": syy[j]}
+        for j, c in enumerate(columns)
+    }
+
+
+def merge(a, b):
+    """Gabungkan dua set statistik cukup (mis. dari dua chunk data)."""
+    return {k: a[k] + b[k] for k in ("n", "sx", "sy", "sxy", "sxx", "syy")}
+
+
+def _t_quantile(p, df):
+    try:
+        from scipy.stats import t
+        return float(t.ppf(p, df))
+    except ImportError:
+        # Ekspansi Cornish-Fisher dari kuantil normal; cukup akurat untuk df > 10
+        z = {0.975: 1.959963984540054, 0.995: 2.5758293035489}[p]
+        return z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+
+
+def fit(s, level=0.95):
+    """Koefisien OLS + komponen pita kepercayaan dari statistik cukup."""
+    n = s["n"]
+    xbar, ybar = s["sx"] / n, s["sy"] / n
+    Sxx = s["sxx"] - n * xbar * xbar
+    Sxy = s["sxy"] - n * xbar * ybar
+    Syy = s["syy"] - n * ybar * ybar
+    slope = Sxy / Sxx if Sxx > 0 else 0.0
+    intercept = ybar - slope * xbar
+    sse = max(Syy - slope * Sxy, 0.0)
+    sigma = math.sqrt(sse / (n - 2)) if n > 2 else 0.0
+    return {
+        "n": n, "slope": slope, "intercept": intercept, "xbar": xbar, "Sxx": Sxx,
+        "sigma": sigma, "t": _t_quantile(0.5 + level / 2, max(n - 2, 1)),
+        "r": Sxy / math.sqrt(Sxx * Syy) if Sxx > 0 and Syy > 0 else 0.0,
+    }
+
+
+def band(model, grid):
+    """Garis prediksi dan pita kepercayaan rata-rata respons di titik `grid`."""
+    grid = np.asarray(grid, dtype=np.float64)
+    yhat = model["intercept"] + model["slope"] * grid
+    if model["Sxx"] > 0:
+        se = model["sigma"] * np.sqrt(1 / model["n"] + (grid - model["xbar"]) ** 2 / model["Sxx"])
+    else:
+        se = np.zeros_like(grid)
+    return yhat, yhat - model["t"] * se, yhat + model["t"] * se
+
+
+def cleaned_regression_stats(csv_path="datasets_wellbeing.csv"):
+    """Statistik cukup per fitur untuk data hasil cleaning; sekali per versi dataset."""
+    key = (csv_path, datastore.dataset_version(csv_path))
+    stats = _cache.get(key)
+    if stats is None:
+        with _lock:
+            stats = _cache.get(key)
+            if stats is None:
+                df, _ = cleaning.cleaned_dataset(csv_path)
+                for old in [k for k in _cache if k[0] == csv_path]:
+                    del _cache[old]
+                stats = _cache[key] = sufficient_stats(df)
+    return stats
+
+
+def draw(ax, x, y, stats, scatter_kws=None, line_kws=None, ci_alpha=0.15, xlabel=None, ylabel=None):
+    """Pengganti sns.regplot: scatter + garis OLS + pita kepercayaan 95% analitik."""
+    scatter_kws = dict(scatter_kws or {})
+    line_kws = dict(line_kws or {})
+    x = np.asarray(x)
+    y = np.asarray(y)
+    grid = np.linspace(np.min(x), np.max(x), 100)
+    if len(x) > SCATTER_MAX:
+        pick = np.random.default_rng(0).choice(len(x), SCATTER_MAX, replace=False)
+        x, y = x[pick], y[pick]
+    ax.scatter(x, y, **scatter_kws)
+    model = fit(stats)
+    yhat, lo, hi = band(model, grid)
+    color = line_kws.pop("color", "C0")
+    ax.plot(grid, yhat, color=color, **line_kws)
+    ax.fill_between(grid, lo, hi, color=color, alpha=ci_alpha, linewidth=0)
+    if xlabel is not None:
+        ax.set_xlabel(xlabel)
+    if ylabel is not None:
+        ax.set_ylabel(ylabel)
+    return model
@@ -0,0 +1,221 @@
+# =============================================================
+# Layanan prediksi HTTP (asyncio) dengan micro-batching
+# =============================================================
+# Contoh:
+#   python service.py --port 8502
+#   curl -X POST localhost:8502/predict -d '{"FRUITS_VEGGIES": 3, ..., "AGE": "36 to 50", "GENDER": "Female"}'
+#
+# Endpoint:
+#   POST /predict  satu objek jawaban, atau list objek → skor
+#   GET  /metrics  counter latensi & throughput (JSON)
+#   GET  /health
+#
+# Permintaan yang datang bersamaan dikumpulkan ke satu batch (maks
+# `max_batch` baris atau `max_wait_ms` milidetik), lalu diskor dengan satu
+# panggilan vektor ke scorer yang sama dengan show_prediction().
+# Hanya memakai stdlib + numpy; berjalan sepenuhnya offline.
+import argparse
+import asyncio
+import collections
+import json
+import time
+
+import numpy as np
+
+import inference
+from features import encode_record, scale_value
+
+
+class MicroBatcher:
+    def __init__(self, scorer, max_batch=256, max_wait_ms=2.0):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, rows):
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, fut))
+        return await fut
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            n = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            while n < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n += len(item[0])
+            self._score(items)
+
+    def _score(self, items):
+        X = np.array([row for rows, _ in items for row in rows], dtype=np.float64)
+        try:
+            prediction = self.scorer.predict(X)
+        except Exception as exc:  # gagal satu batch → semua pemanggil menerima error
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        self.batches += 1
+        self.rows += len(X)
+        start = 0
+        for rows, fut in items:
+            if not fut.done():
+                fut.set_result(prediction[start:start + len(rows)])
+            start += len(rows)
+
+
+class Metrics:
+    def __init__(self, window=10_000):
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = collections.deque(maxlen=window)
+
+    def observe(self, seconds, ok=True):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def snapshot(self, batcher):
+        lat = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        uptime = time.time() - self.started
+        return {
+            "uptime_s": round(uptime, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+            "rows_scored": batcher.rows,
+            "batches": batcher.batches,
+            "mean_batch_size": round(batcher.rows / batcher.batches, 2) if batcher.batches else 0.0,
+            "throughput_rps": round(self.requests / uptime, 2) if uptime else 0.0,
+            "latency_ms_p50": round(float(np.percentile(lat, 50)), 3),
+            "latency_ms_p95": round(float(np.percentile(lat, 95)), 3),
+            "latency_ms_p99": round(float(np.percentile(lat, 99)), 3),
+        }
+
+
+class PredictionService:
+    def __init__(self, scorer=None, max_batch=256, max_wait_ms=2.0, max_body=1 << 20):
+        self.scorer = scorer or inference.lookup()
+        self.batcher = MicroBatcher(self.scorer, max_batch, max_wait_ms)
+        self.metrics = Metrics()
+        self.max_body = max_body
+
+    async def predict(self, payload):
+        records = payload if isinstance(payload, list) else [payload]
+        rows = [encode_record(r) for r in records]
+        if not rows:
+            return []
+        prediction = await self.batcher.submit(rows)
+        if not np.isfinite(prediction).all():
+            # JSON tidak punya NaN/Infinity: lebih baik 400 daripada body tidak valid
+            raise ValueError("Prediksi tidak berhingga untuk input ini")
+        results = [{"prediction": float(p), "score": float(scale_value(p))} for p in prediction]
+        return results if isinstance(payload, list) else results[0]
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = line.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length", 0))
+                if length > self.max_body:
+                    await self._send(writer, 413, {"error": "body terlalu besar"})
+                    break
+                body = await reader.readexactly(length) if length else b""
+                status, result = await self._route(method, path.split("?", 1)[0], body)
+                await self._send(writer, status, result, keep_alive=headers.get("connection", "").lower() != "close")
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return 200, self.metrics.snapshot(self.batcher)
+        if method == "POST" and path == "/predict":
+            t0 = time.perf_counter()
+            try:
+                result = await self.predict(json.loads(body))
+            except (KeyError, ValueError, TypeError, OverflowError, RecursionError) as exc:
+                # RecursionError: JSON bersarang sangat dalam; OverflowError: angka di luar float
+                self.metrics.observe(time.perf_counter() - t0, ok=False)
+                return 400, {"error": str(exc.args[0]) if exc.args else type(exc).__name__}
+            self.metrics.observe(time.perf_counter() - t0)
+            return 200, result
+        return 404, {"error": f"{method} {path} tidak ditemukan"}
+
+    async def _send(self, writer, status, result, keep_alive=False):
+        body = json.dumps(result).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large"}[status]
+        head = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8502):
+        worker = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Layanan prediksi berjalan di http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP prediksi well-being dengan micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--max-batch", type=int, default=256, help="baris maksimum per batch")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="waktu tunggu maksimum pengumpulan batch")
+    parser.add_argument("--model", default="linear_regression.pkl")
+    parser.add_argument("--pt", default="power_transfromer.pkl")
+    parser.add_argument("--scaler", default="scaler.pkl")
+    parser.add_argument("--bundle", help="bundle model .wlb (bundle.py); menggantikan --model/--pt/--scaler")
+    args = parser.parse_args(argv)
+
+    if args.bundle:
+        import bundle
+        scorer = bundle.load(args.bundle)
+    else:
+        scorer = inference.lookup(args.model, args.pt, args.scaler)
+    service = PredictionService(scorer, args.max_batch, args.max_wait_ms)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# =============================================================
+# Sketch kuantil yang bisa digabung (KLL) untuk batas IQR streaming
+# =============================================================
+# QuantileSketch menerima data per chunk, bisa digabung (merge) dengan sketch
+# dari chunk/proses lain, dan disimpan sebagai dict JSON (state/from_state).
+#
+# Dua mode:
+#   - exact : selama nilai unik ≤ max_exact, sketch menyimpan pasangan
+#             (nilai, jumlah). Kuantil identik dengan np.quantile (linear).
+#             Kolom survei 0–10 dan skor WLB (satu desimal) selalu di mode ini.
+#   - KLL   : bila nilai unik melebihi max_exact, sketch beralih ke compactor
+#             KLL (Karnin–Lang–Liberty). Level h berisi item berbobot 2^h;
+#             level penuh diurutkan lalu setiap item kedua (offset acak)
+#             dinaikkan ke level berikutnya. Galat rank ±eps·n (peluang tinggi)
+#             dengan memori O(k), k ditentukan dari eps.
+# Peralihan exact → KLL tanpa kehilangan bobot: jumlah c suatu nilai diurai
+# menjadi bit-bitnya, nilai ditempatkan di setiap level h dengan bit h = 1.
+import math
+
+import numpy as np
+
+EPS = 0.01           # galat rank default (fraksi n)
+MAX_EXACT = 4096     # nilai unik maksimum sebelum beralih ke KLL
+_C = 2 / 3           # rasio kapasitas antar level KLL
+
+
+def k_for_eps(eps):
+    # Galat rank KLL ≈ 2.296 / k^0.9723 (kalibrasi empiris Apache DataSketches)
+    return max(8, math.ceil((2.296 / eps) ** (1 / 0.9723)))
+
+
+class QuantileSketch:
+    def __init__(self, eps=EPS, max_exact=MAX_EXACT, seed=0):
+        self.eps = eps
+        self.k = k_for_eps(eps)
+        self.max_exact = max_exact
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.values = np.empty(0)                   # mode exact: nilai unik terurut
+        self.counts = np.empty(0, dtype=np.int64)   #             jumlah per nilai
+        self.levels = None                          # mode KLL: list array per level
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        return self.levels is None
+
+    def update(self, values):
+        """Tambahkan array nilai (NaN diabaikan)."""
+        x = np.asarray(values, dtype=np.float64).ravel()
+        x = x[~np.isnan(x)]
+        if not len(x):
+            return self
+        self.n += len(x)
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        if self.exact:
+            u, c = np.unique(x, return_counts=True)
+            self._add_counts(u, c)
+        else:
+            self.levels[0] = np.concatenate([self.levels[0], x])
+            self._compress()
+        return self
+
+    def _add_counts(self, u, c):
+        values = np.concatenate([self.values, u])
+        counts = np.concatenate([self.counts, c])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=counts, minlength=len(self.values)).astype(np.int64)
+        if len(self.values) > self.max_exact:
+            self._to_kll()
+
+    def _to_kll(self):
+        levels = []
+        counts = self.counts.copy()
+        h = 0
+        while counts.any():
+            levels.append(self.values[(counts & 1).astype(bool)])
+            counts >>= 1
+            h += 1
+        self.levels = levels or [np.empty(0)]
+        self.values, self.counts = np.empty(0), np.empty(0, dtype=np.int64)
+        self._compress()
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, math.ceil(self.k * _C ** depth))
+
+    def _compress(self):
+        while sum(len(lv) for lv in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h in range(len(self.levels)) if len(self.levels[h]) >= self._capacity(h))
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            level = np.sort(self.levels[h])
+            keep = level[:len(level) % 2]         # item ganjil tetap di level h
+            pairs = level[len(level) % 2:]
+            promoted = pairs[int(self._rng.integers(2))::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def merge(self, other):
+        """Gabungkan `other` ke sketch ini (hasil = sketch atas gabungan kedua data)."""
+        if not other.n:
+            return self
+        self.k = min(self.k, other.k)
+        self.eps = max(self.eps, other.eps)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if self.exact and other.exact:
+            self._add_counts(other.values, other.counts)
+            return self
+        if self.exact:
+            self._to_kll()
+        if other.exact:
+            other = QuantileSketch.from_state(other.state())
+            other.k = self.k
+            other._to_kll()
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self._compress()
+        return self
+
+    def items(self):
+        """(nilai terurut, bobot): pasangan (nilai, jumlah) di mode exact, item berbobot 2^h di mode KLL."""
+        if self.exact:
+            return self.values, self.counts
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lv), 1 << h, dtype=np.int64) for h, lv in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def _weighted(self):
+        # (nilai terurut, bobot kumulatif)
+        values, weights = self.items()
+        return values, np.cumsum(weights)
+
+    def quantile(self, q):
+        """Kuantil (interpolasi linear, seperti np.quantile) untuk q skalar atau array."""
+        if not self.n:
+            raise ValueError("Sketch kosong")
+        values, cum = self._weighted()
+        h = (self.n - 1) * np.asarray(q, dtype=np.float64)
+        lo, hi = np.floor(h), np.ceil(h)
+        v_lo = values[np.searchsorted(cum, lo, side="right")]
+        v_hi = values[np.searchsorted(cum, hi, side="right")]
+        out = v_lo + (h - lo) * (v_hi - v_lo)
+        return np.clip(out, self.min, self.max) if np.ndim(out) else float(min(max(out, self.min), self.max))
+
+    def bracket(self, q):
+        """(nilai bawah, nilai atas, pecahan) yang mengapit kuantil skalar q.
+
+        np.quantile(np.array([bawah, atas], dtype), pecahan) mengulang aritmetika
+        np.quantile atas kolom ber-dtype tersebut (mis. float32) secara persis.
+        """
+        if not self.n:
+            raise ValueError("Sketch kosong")
+        values, cum = self._weighted()
+        h = (self.n - 1) * float(q)
+        lo, hi = math.floor(h), math.ceil(h)
+        v_lo = values[np.searchsorted(cum, lo, side="right")]
+        v_hi = values[np.searchsorted(cum, hi, side="right")]
+        return float(v_lo), float(v_hi), h - lo
+
+    def rank(self, x):
+        """Perkiraan jumlah item ≤ x."""
+        values, cum = self._weighted()
+        i = np.searchsorted(values, x, side="right")
+        return int(cum[i - 1]) if i else 0
+
+    def state(self):
+        """Dict JSON-able untuk disimpan / dikirim antar proses."""
+        out = {"eps": self.eps, "k": self.k, "max_exact": self.max_exact, "n": self.n,
+               "min": self.min, "max": self.max}
+        if self.exact:
+            out.update(values=self.values.tolist(), counts=self.counts.tolist())
+        else:
+            out["levels"] = [lv.tolist() for lv in self.levels]
+        return out
+
+    @classmethod
+    def from_state(cls, state, seed=0):
+        self = cls(state["eps"], state["max_exact"], seed)
+        self.k, self.n = state["k"], state["n"]
+        self.min, self.max = state["min"], state["max"]
+        if "levels" in state:
+            self.levels = [np.array(lv, dtype=np.float64) for lv in state["levels"]]
+        else:
+            self.values = np.array(state["values"], dtype=np.float64)
+            self.counts = np.array(state["counts"], dtype=np.int64)
+        return self
+
+    def __len__(self):
+        # Jumlah item yang disimpan (ukuran memori sketch)
+        return len(self.values) if self.exact else sum(len(lv) for lv in self.levels)
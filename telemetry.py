@@ -0,0 +1,233 @@
+# =============================================================
+# Telemetri rerun Streamlit ─ span waktu per bagian halaman
+# =============================================================
+# Aktif bila environment WLB_TELEMETRY=1 (default mati). Saat mati, span()
+# dan rerun() mengembalikan satu objek no-op bersama: biayanya hanya satu
+# pemanggilan fungsi per bagian.
+#
+# Saat aktif:
+#   - rerun(page) membungkus router halaman; setiap rerun dicatat bersama
+#     session id Streamlit, halaman, total waktu dan span di dalamnya
+#   - span(name) mengukur satu bagian (boleh bersarang); setiap durasi masuk
+#     histogram per nama span (bucket tetap, ala Prometheus) di memori proses
+#   - histogram ditulis ke file teks format Prometheus (WLB_TELEMETRY_FILE,
+#     default .cache/telemetry.prom) paling sering sekali per EXPORT_INTERVAL
+#     detik, siap dibaca textfile collector node_exporter
+# Rerun yang sedang berjalan disimpan per thread (satu thread script per sesi).
+# Modul ini hanya memakai stdlib supaya aman diimport dari mana saja.
+import collections
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("WLB_TELEMETRY", "") not in ("", "0")
+EXPORT_PATH = os.environ.get("WLB_TELEMETRY_FILE", os.path.join(".cache", "telemetry.prom"))
+EXPORT_INTERVAL = 10.0
+RECENT = 200
+# Batas atas bucket histogram (detik)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_local = threading.local()
+_histograms = {}                               # (family, label) → Histogram
+_recent = collections.deque(maxlen=RECENT)     # rerun terakhir (semua sesi)
+_last_export = 0.0
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)   # bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        """Batas atas bucket yang memuat kuantil q (perkiraan kasar, dalam detik)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class _Null:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _Null()
+
+
+def _observe(family, label, seconds):
+    with _lock:
+        hist = _histograms.get((family, label))
+        if hist is None:
+            hist = _histograms[(family, label)] = Histogram()
+        hist.observe(seconds)
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.record = getattr(_local, "rerun", None)
+        self.depth = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.t0
+        _local.depth = self.depth
+        _observe("span", self.name, seconds)
+        if self.record is not None:
+            offset = (self.t0 - self.record["t0"]) * 1000
+            self.record["spans"].append((self.name, self.depth, offset, seconds * 1000))
+        return False
+
+
+class _Rerun:
+    def __init__(self, page, session):
+        self.page = page
+        self.session = session
+
+    def __enter__(self):
+        self.record = {
+            "session": self.session,
+            "page": self.page,
+            "started": time.time(),
+            "spans": [],                     # (nama, kedalaman, mulai ms, durasi ms)
+            "t0": time.perf_counter(),
+        }
+        _local.rerun, _local.depth = self.record, 0
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.record["t0"]
+        _local.rerun = None
+        # Rerun yang dihentikan st.rerun()/st.stop() tetap dicatat
+        self.record["total_ms"] = seconds * 1000
+        self.record["status"] = "ok" if exc_type is None else exc_type.__name__
+        self.record["spans"].sort(key=lambda sp: sp[2])
+        _observe("rerun", self.page, seconds)
+        with _lock:
+            _recent.append(self.record)
+        _maybe_export()
+        return False
+
+
+def span(name):
+    """Context manager pengukur satu bagian halaman; no-op bila telemetri mati."""
+    return _Span(name) if ENABLED else _NULL
+
+
+def rerun(page, session=None):
+    """Context manager satu rerun script (router halaman); no-op bila telemetri mati."""
+    if not ENABLED:
+        return _NULL
+    return _Rerun(page, session_id() if session is None else session)
+
+
+def session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else "-"
+
+
+def recent(session=None):
+    """Rerun terakhir (terbaru dulu), opsional hanya untuk satu sesi."""
+    with _lock:
+        rows = list(_recent)
+    return [r for r in reversed(rows) if session is None or r["session"] == session]
+
+
+def summary():
+    """Ringkasan histogram: family, label, count, mean/p50/p95 (ms; p50/p95 = batas bucket)."""
+    with _lock:
+        items = sorted(_histograms.items())
+        rows = []
+        for (family, label), h in items:
+            p50, p95 = h.quantile(0.5), h.quantile(0.95)
+            rows.append({
+                "family": family,
+                "label": label,
+                "count": h.count,
+                "mean_ms": round(h.sum / h.count * 1000, 3),
+                "p50_ms_le": p50 * 1000,
+                "p95_ms_le": p95 * 1000,
+            })
+    return rows
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus():
+    """Semua histogram dalam format teks eksposisi Prometheus."""
+    families = {
+        "rerun": ("wlb_rerun_seconds", "page", "Durasi satu rerun script Streamlit per halaman."),
+        "span": ("wlb_span_seconds", "span", "Durasi bagian halaman yang diinstrumentasi."),
+    }
+    with _lock:
+        snapshot = {k: (list(h.counts), h.sum, h.count) for k, h in _histograms.items()}
+    lines = []
+    for family, (metric, label_name, help_text) in families.items():
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} histogram")
+        for (fam, label), (counts, total, count) in sorted(snapshot.items()):
+            if fam != family:
+                continue
+            labels = f'{label_name}="{_escape(label)}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{labels}}} {total!r}")
+            lines.append(f"{metric}_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    """Tulis prometheus() ke `path` secara atomik (tulis file sementara lalu rename)."""
+    global _last_export
+    path = path or EXPORT_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus())
+    os.replace(tmp, path)
+    _last_export = time.monotonic()
+    return path
+
+
+def _maybe_export():
+    if time.monotonic() - _last_export >= EXPORT_INTERVAL:
+        try:
+            export()
+        except OSError:
+            pass  # telemetri tidak boleh menggagalkan halaman
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _recent.clear()
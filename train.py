@@ -0,0 +1,280 @@
+# =============================================================
+# Training pipeline ─ membangun ulang semua artifact model dari CSV
+# =============================================================
+# Contoh:
+#   python train.py                         # tulis artifact ke .cache/build/
+#   python train.py --out build/ --jobs 16 --folds 5
+#   python train.py --replace-shipped       # timpa artifact yang dipakai app
+#
+# Artifact yang dipakai app (.pkl di direktori repo) hanya ditimpa dengan
+# --replace-shipped; laporannya tetap ditulis ke .cache/build/.
+#
+# Tahap (waktu tiap tahap dicatat di train_report.json):
+#   1. prepare : hapus Timestamp → dropna → drop_duplicates → encode 22 fitur
+#                (sama dengan form prediksi) → split train/holdout 70/30
+#   2. folds   : per fold CV, PowerTransformer (COL_TO_NORMALIZE) + StandardScaler
+#                di-fit pada bagian train fold lalu kedua matriks hasil transform
+#                disimpan di .cache/train/ (dipakai ulang lintas run & learner)
+#   3. base    : semua fit base learner (learner × fold, plus fit penuh) dalam
+#                satu pool joblib di semua core
+#   4. meta    : meta-learner di-fit pada prediksi out-of-fold base learner
+#   5. save    : PowerTransformer, StandardScaler, LinearRegression dan
+#                StackingRegressor ditulis atomik sebagai .pkl
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor, StackingRegressor
+from sklearn.linear_model import LinearRegression, Ridge, RidgeCV
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import KFold, train_test_split
+from sklearn.preprocessing import PowerTransformer, StandardScaler
+from sklearn.utils import Bunch
+
+import datastore
+from features import FEATURES, COL_TO_NORMALIZE, TARGET, encode_frame
+
+FORMAT_VERSION = 1
+OUTPUTS = {
+    "pt": "power_transfromer.pkl",
+    "scaler": "scaler.pkl",
+    "linear": "linear_regression.pkl",
+    "stacking": "stacking_model.pkl",
+}
+_NORMALIZE = [FEATURES.index(c) for c in COL_TO_NORMALIZE]
+SHIPPED_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(".cache", "build")
+
+
+def base_learners(random_state=42):
+    """Base learner stacking (nama → estimator belum di-fit)."""
+    return {
+        "ridge": Ridge(alpha=1.0),
+        "forest": RandomForestRegressor(
+            n_estimators=100, min_samples_leaf=10, max_features=0.5, random_state=random_state, n_jobs=1,
+        ),
+        "gbr": GradientBoostingRegressor(n_estimators=300, max_depth=3, learning_rate=0.05, random_state=random_state),
+    }
+
+
+def meta_learner():
+    return RidgeCV()
+
+
+class StageTimer:
+    def __init__(self, log=sys.stderr):
+        self.times = {}
+        self.log = log
+        self._stage = self._t0 = None
+
+    def start(self, stage):
+        self.stop()
+        self._stage, self._t0 = stage, time.perf_counter()
+        if self.log is not None:
+            print(f"[{stage}] ...", file=self.log, flush=True)
+
+    def stop(self):
+        if self._stage is not None:
+            self.times[self._stage] = round(time.perf_counter() - self._t0, 3)
+            if self.log is not None:
+                print(f"[{self._stage}] {self.times[self._stage]:.2f} s", file=self.log, flush=True)
+            self._stage = None
+
+
+def prepare(csv_path, test_size=0.3, random_state=42):
+    """(X_train, X_test, y_train, y_test) kode fitur mentah, belum di-transform."""
+    df = datastore.load_dataset(csv_path)
+    df = df.drop(columns=[c for c in ("Timestamp",) if c in df.columns]).dropna().drop_duplicates()
+    X = encode_frame(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(X).any(axis=1) & np.isfinite(y)
+    return train_test_split(X[valid], y[valid], test_size=test_size, random_state=random_state)
+
+
+def fit_transform(X):
+    """Fit PowerTransformer + StandardScaler seperti di show_prediction(); kembalikan (pt, scaler, Z)."""
+    pt = PowerTransformer(method="yeo-johnson", standardize=True)
+    Z = np.array(X, dtype=np.float64)
+    Z[:, _NORMALIZE] = pt.fit_transform(Z[:, _NORMALIZE])
+    scaler = StandardScaler()
+    Z = scaler.fit_transform(Z)
+    return pt, scaler, Z
+
+
+def transform(pt, scaler, X):
+    Z = np.array(X, dtype=np.float64)
+    Z[:, _NORMALIZE] = pt.transform(Z[:, _NORMALIZE])
+    return scaler.transform(Z)
+
+
+def fold_matrices(X, y, folds, random_state, cache_dir):
+    """Matriks transform per fold (mmap); dibangun sekali per (data train, konfigurasi fold)."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(X).tobytes())
+    h.update(np.ascontiguousarray(y).tobytes())
+    h.update(f"{FORMAT_VERSION}:{folds}:{random_state}".encode())
+    out_dir = os.path.join(cache_dir, h.hexdigest()[:16])
+    # Pembagian fold deterministik, jadi cukup matriksnya yang di-cache
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=random_state).split(X))
+    names = [f"{part}_{k}.npy" for k in range(folds) for part in ("train", "valid")]
+    if not all(os.path.exists(os.path.join(out_dir, n)) for n in names):
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+        try:
+            for k, (tr, va) in enumerate(splits):
+                pt, scaler, Z = fit_transform(X[tr])
+                np.save(os.path.join(tmp, f"train_{k}.npy"), Z)
+                np.save(os.path.join(tmp, f"valid_{k}.npy"), transform(pt, scaler, X[va]))
+            shutil.rmtree(out_dir, ignore_errors=True)
+            os.replace(tmp, out_dir)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        # Run paralel dengan dataset/fold lain bisa masih membaca matriksnya
+        datastore.prune_versions(cache_dir, out_dir)
+    return [
+        {
+            "train": np.load(os.path.join(out_dir, f"train_{k}.npy"), mmap_mode="r"),
+            "valid": np.load(os.path.join(out_dir, f"valid_{k}.npy"), mmap_mode="r"),
+            "train_idx": tr,
+            "valid_idx": va,
+        }
+        for k, (tr, va) in enumerate(splits)
+    ]
+
+
+def _fit_task(name, estimator, Z, y, Z_pred):
+    t0 = time.perf_counter()
+    est = clone(estimator).fit(Z, y)
+    pred = est.predict(Z_pred) if Z_pred is not None else None
+    return name, est, pred, time.perf_counter() - t0
+
+
+def assemble_stacking(names, fitted, meta, random_state=42):
+    """StackingRegressor sklearn dari base learner & meta-learner yang sudah di-fit."""
+    learners = base_learners(random_state)
+    model = StackingRegressor(estimators=[(n, learners[n]) for n in names], final_estimator=meta_learner())
+    model.estimators_ = [fitted[n] for n in names]
+    model.named_estimators_ = Bunch(**{n: fitted[n] for n in names})
+    model.final_estimator_ = meta
+    model.stack_method_ = ["predict"] * len(names)
+    return model
+
+
+def _metrics(y, pred):
+    return {"r2": round(float(r2_score(y, pred)), 5), "mae": round(float(mean_absolute_error(y, pred)), 4)}
+
+
+def _dump(obj, path):
+    # Tulis ke file sementara lalu rename: artifacts.load tidak pernah melihat file setengah jadi
+    tmp = f"{path}.tmp"
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def train(csv_path="datasets_wellbeing.csv", out_dir=DEFAULT_OUT, folds=5, jobs=-1, random_state=42,
+          log=sys.stderr, replace_shipped=False):
+    shipped = os.path.abspath(out_dir) == SHIPPED_DIR
+    if shipped and not replace_shipped:
+        raise ValueError(f"{out_dir} berisi artifact yang dipakai app; pakai replace_shipped=True (--replace-shipped)")
+    timer = StageTimer(log)
+    learners = base_learners(random_state)
+    names = list(learners)
+
+    timer.start("prepare")
+    X_train, X_test, y_train, y_test = prepare(csv_path, random_state=random_state)
+
+    timer.start("folds")
+    cache_dir = os.path.join(os.path.dirname(datastore.cache_path(csv_path)), "train")
+    fold_data = fold_matrices(X_train, y_train, folds, random_state, cache_dir)
+    pt, scaler, Z_train = fit_transform(X_train)
+    Z_test = transform(pt, scaler, X_test)
+
+    timer.start("base")
+    tasks = [(n, k) for n in names for k in range(folds)] + [(n, None) for n in names]
+    results = joblib.Parallel(n_jobs=jobs)(
+        joblib.delayed(_fit_task)(
+            n, learners[n],
+            fold_data[k]["train"] if k is not None else Z_train,
+            y_train[fold_data[k]["train_idx"]] if k is not None else y_train,
+            fold_data[k]["valid"] if k is not None else None,
+        )
+        for n, k in tasks
+    )
+    oof = np.empty((len(y_train), len(names)))
+    fitted, fit_seconds = {}, {n: 0.0 for n in names}
+    for (n, k), (_, est, pred, seconds) in zip(tasks, results):
+        fit_seconds[n] += seconds
+        if k is None:
+            fitted[n] = est
+        else:
+            oof[fold_data[k]["valid_idx"], names.index(n)] = pred
+
+    timer.start("meta")
+    meta = meta_learner().fit(oof, y_train)
+    stacking = assemble_stacking(names, fitted, meta, random_state)
+    linear = LinearRegression().fit(Z_train, y_train)
+
+    timer.start("evaluate")
+    metrics = {n: _metrics(y_test, fitted[n].predict(Z_test)) for n in names}
+    metrics["oof_stacking"] = _metrics(y_train, meta.predict(oof))
+    metrics["linear"] = _metrics(y_test, linear.predict(Z_test))
+    metrics["stacking"] = _metrics(y_test, stacking.predict(Z_test))
+
+    timer.start("save")
+    os.makedirs(out_dir, exist_ok=True)
+    for key, obj in (("pt", pt), ("scaler", scaler), ("linear", linear), ("stacking", stacking)):
+        _dump(obj, os.path.join(out_dir, OUTPUTS[key]))
+    timer.stop()
+
+    report = {
+        "dataset": datastore.dataset_version(csv_path),
+        "rows": {"train": len(y_train), "holdout": len(y_test)},
+        "folds": folds,
+        "jobs": joblib.effective_n_jobs(jobs),
+        "stage_seconds": timer.times,
+        "fit_seconds": {n: round(s, 3) for n, s in fit_seconds.items()},
+        "metrics": metrics,
+        "outputs": OUTPUTS,
+    }
+    report_dir = os.path.join(SHIPPED_DIR, DEFAULT_OUT) if shipped else out_dir
+    os.makedirs(report_dir, exist_ok=True)
+    with open(os.path.join(report_dir, "train_report.json"), "w") as f:
+        json.dump(report, f, indent=1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latih ulang semua artifact model dari datasets_wellbeing.csv.")
+    parser.add_argument("--csv", default="datasets_wellbeing.csv")
+    parser.add_argument("--out", default=DEFAULT_OUT, help=f"direktori output artifact (default: {DEFAULT_OUT})")
+    parser.add_argument("--replace-shipped", action="store_true",
+                        help="timpa artifact .pkl yang dipakai app (sama dengan --out <direktori repo>)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="jumlah proses paralel (-1 = semua core)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+    if args.replace_shipped:
+        args.out = SHIPPED_DIR
+    elif os.path.abspath(args.out) == SHIPPED_DIR:
+        parser.error(f"--out {args.out} menimpa artifact yang dipakai app; tambahkan --replace-shipped")
+
+    report = train(args.csv, args.out, args.folds, args.jobs, args.seed, None if args.quiet else sys.stderr,
+                   replace_shipped=args.replace_shipped)
+    print(json.dumps({"stage_seconds": report["stage_seconds"], "metrics": report["metrics"]}, indent=1))
+    if not args.replace_shipped:
+        print(f"Artifact ditulis ke {os.path.abspath(args.out)}; app tetap memuat .pkl di {SHIPPED_DIR}. "
+              "Jalankan ulang dengan --replace-shipped untuk memakainya di app.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# =============================================================
+# What-if sweep ─ perubahan kebiasaan terkecil menuju kategori berikutnya
+# =============================================================
+# Dari satu vektor `input_data` dibangun seluruh tetangganya sekaligus:
+#   - perubahan satu fitur   : setiap fitur form × setiap level lain
+#   - perubahan dua fitur    : setiap pasangan perubahan satu fitur
+# sebagai satu matriks batch (±12 ribu baris), diskor dengan satu panggilan
+# vektor ke scorer yang sama dengan show_prediction(). Level yang dicoba
+# adalah opsi widget di QUESTIONS; AGE dan GENDER tidak ikut diubah.
+# Kandidat yang melewati batas kategori diurutkan menurut jumlah fitur
+# yang diubah, lalu total langkah level, lalu skor tertinggi.
+import numpy as np
+
+from features import FEATURES, QUESTIONS, scale_value
+
+# Batas kategori banner hasil prediksi (Good: 50–80, Excellent: > 80)
+TARGETS = [
+    ("Good", 50, np.greater_equal),
+    ("Excellent", 80, np.greater),
+]
+
+LEVELS = {q.feature: sorted(set(q.options.values())) for q in QUESTIONS}
+LABELS = {q.feature: {code: label for label, code in q.options.items()} for q in QUESTIONS}
+
+
+def single_changes(x, features=None):
+    """(fitur, level) untuk setiap perubahan satu fitur dari `x`, urut menurut fitur."""
+    features = list(LEVELS) if features is None else features
+    feat, level = [], []
+    for f in features:
+        j = FEATURES.index(f)
+        for lv in LEVELS[f]:
+            if lv != x[j]:
+                feat.append(j)
+                level.append(lv)
+    return np.array(feat, dtype=np.intp), np.array(level, dtype=np.intp)
+
+
+def neighbourhood(x, features=None, pairs=True):
+    """Matriks kandidat (m, 22) + indeks fitur/level yang diubah (kolom kedua −1 bila satu fitur)."""
+    x = np.asarray(x, dtype=np.intp)
+    feat, level = single_changes(x, features)
+    i = np.arange(len(feat))
+    j = np.full(len(feat), -1)
+    if pairs:
+        a, b = np.triu_indices(len(feat), 1)
+        other = feat[a] != feat[b]
+        i = np.concatenate([i, a[other]])
+        j = np.concatenate([j, b[other]])
+    X = np.repeat(x[None, :], len(i), axis=0)
+    rows = np.arange(len(i))
+    X[rows, feat[i]] = level[i]
+    two = j >= 0
+    X[rows[two], feat[j[two]]] = level[j[two]]
+    changed_feat = np.column_stack([feat[i], np.where(two, feat[j], -1)])
+    changed_level = np.column_stack([level[i], np.where(two, level[j], -1)])
+    return X, changed_feat, changed_level
+
+
+def _describe(x, feats, levels, score):
+    changes = [(FEATURES[f], int(x[f]), int(lv)) for f, lv in zip(feats, levels) if f >= 0]
+    return {
+        "changes": changes,
+        "steps": sum(abs(new - old) for _, old, new in changes),
+        "score": float(score),
+    }
+
+
+def sweep(x, scorer, top=3, features=None, pairs=True):
+    """Skor dasar, gain terbaik per fitur, dan `top` perubahan terkecil per kategori target.
+
+    `x` berurutan FEATURES (kode numerik); `scorer` punya predict(X) seperti
+    inference.LookupScorer. Kategori yang sudah tercapai dilewati.
+    """
+    x = np.asarray(x, dtype=np.intp)
+    base = float(scale_value(scorer.predict(x[None, :])[0]))
+    X, feats, levels = neighbourhood(x, features, pairs)
+    scores = scale_value(scorer.predict(X))
+    n_changed = (feats >= 0).sum(axis=1)
+    steps = np.where(feats >= 0, np.abs(levels - x[np.maximum(feats, 0)]), 0).sum(axis=1)
+
+    # Gain terbaik per fitur dari perubahan satu fitur saja
+    single = n_changed == 1
+    gains = []
+    for f in np.unique(feats[single, 0]):
+        rows = np.flatnonzero(single & (feats[:, 0] == f))
+        best = rows[np.argmax(scores[rows])]
+        gains.append({"feature": FEATURES[f], "from": int(x[f]), "to": int(levels[best, 0]), "gain": float(scores[best] - base)})
+    gains.sort(key=lambda g: -g["gain"])
+
+    targets = {}
+    for name, threshold, reaches in TARGETS:
+        if reaches(base, threshold):
+            continue
+        hit = np.flatnonzero(reaches(scores, threshold))
+        order = hit[np.lexsort((-scores[hit], steps[hit], n_changed[hit]))][:top]
+        targets[name] = [_describe(x, feats[r], levels[r], scores[r]) for r in order]
+    return {"base": base, "candidates": len(X), "gains": gains, "targets": targets}
+
+
+def format_change(feature, old, new):
+    """Teks satu perubahan memakai label jawaban form, mis. "SLEEP_HOURS: 5 hours → 8 hours"."""
+    labels = LABELS.get(feature, {})
+    return f"{feature}: {labels.get(old, old)} → {labels.get(new, new)}"